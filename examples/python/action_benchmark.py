@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+#####################################################################
+# This script measures the overhead of passing actions to the game
+# for different numbers of available buttons. Actions are passed
+# as Python lists, as NumPy arrays of different dtypes and as indices
+# into the action table.
+# set_action only converts the action and writes it to the memory
+# shared with the engine, so it shows the cost of the binding alone,
+# make_action also includes processing of the tic by the engine.
+#####################################################################
+
+from __future__ import print_function
+
+from time import time
+import numpy as np
+import vizdoom as vzd
+from argparse import ArgumentParser
+
+# Options:
+buttons_counts = [1, 10, 43]
+action_types = ["list", "float64", "float32", "int32"]
+
+#####################################################################
+DEFAULT_CONFIG = "../../scenarios/basic.cfg"
+DEFAULT_ITERATIONS = 10000
+
+
+def make_actions(buttons, action_type):
+    actions = np.eye(buttons)
+    if action_type == "list":
+        return [list(a) for a in actions]
+    return [a.astype(action_type) for a in actions]
+
+
+def measure(game, function, actions, iterations):
+    start = time()
+    for i in range(iterations):
+        if game.is_episode_finished():
+            game.new_episode()
+        function(actions[i % len(actions)])
+    return iterations / (time() - start)
+
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser("ViZDoom example measuring the overhead of actions passed as lists and NumPy arrays.")
+    parser.add_argument(dest="config",
+                        default=DEFAULT_CONFIG,
+                        nargs="?",
+                        help="Path to the configuration file of the scenario."
+                             " Please see "
+                             "../../scenarios/*cfg for more scenarios.")
+    parser.add_argument("-i", "--iterations",
+                        default=DEFAULT_ITERATIONS,
+                        type=int,
+                        help="Number of iterations(actions) to run for each setting")
+    args = parser.parse_args()
+
+    all_buttons = [vzd.Button(i) for i in range(43)]
+
+    print("Results:")
+    for buttons in buttons_counts:
+        game = vzd.DoomGame()
+        game.load_config(args.config)
+        game.set_window_visible(False)
+        game.set_available_buttons(all_buttons[:buttons])
+        game.init()
+
+        print("Buttons:", buttons)
+        for action_type in action_types:
+            actions = make_actions(buttons, action_type)
+            set_fps = measure(game, game.set_action, actions, args.iterations)
+            make_fps = measure(game, game.make_action, actions, args.iterations)
+            print("  {:8}".format(action_type + ":"),
+                  "set_action:", round(set_fps, 2), "calls/s,",
+                  "make_action:", round(make_fps, 2), "steps/s")
+
+        game.set_action_table(np.eye(buttons))
+        indices = list(range(buttons))
+        set_fps = measure(game, game.set_action_index, indices, args.iterations)
+        make_fps = measure(game, game.make_action_index, indices, args.iterations)
+        print("  {:8}".format("index:"),
+              "set_action:", round(set_fps, 2), "calls/s,",
+              "make_action:", round(make_fps, 2), "steps/s")
+
+        game.close()
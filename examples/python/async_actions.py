@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+#####################################################################
+# This script shows how to drive many instances of the game from
+# a single thread. Actions are started with make_action_async and
+# completed with asyncio using make_action_awaitable, which waits
+# for the notification file descriptor of each game.
+# The agent for one game can run while other games are simulating.
+#####################################################################
+
+from __future__ import print_function
+
+import asyncio
+from random import choice
+from time import time
+import vizdoom as vzd
+from argparse import ArgumentParser
+
+DEFAULT_CONFIG = "../../scenarios/basic.cfg"
+DEFAULT_INSTANCES = 8
+DEFAULT_ITERATIONS = 1000
+
+
+async def play(game, iterations):
+    actions = [[True, False, False], [False, True, False], [False, False, True]]
+    for i in range(iterations):
+        if game.is_episode_finished():
+            game.new_episode()
+
+        # Agent would choose action based on the state here
+        state = game.get_state()
+        await vzd.make_action_awaitable(game, choice(actions))
+
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser("ViZDoom example showing how to run many games from a single asyncio event loop.")
+    parser.add_argument(dest="config",
+                        default=DEFAULT_CONFIG,
+                        nargs="?",
+                        help="Path to the configuration file of the scenario."
+                             " Please see "
+                             "../../scenarios/*cfg for more scenarios.")
+    parser.add_argument("-n", "--instances",
+                        default=DEFAULT_INSTANCES,
+                        type=int,
+                        help="Number of instances of the game")
+    parser.add_argument("-i", "--iterations",
+                        default=DEFAULT_ITERATIONS,
+                        type=int,
+                        help="Number of actions to make in each instance")
+    args = parser.parse_args()
+
+    games = []
+    for i in range(args.instances):
+        game = vzd.DoomGame()
+        game.load_config(args.config)
+        game.set_window_visible(False)
+        game.set_action_notification_enabled(True)
+        game.init()
+        games.append(game)
+
+    start = time()
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(asyncio.gather(*[play(game, args.iterations) for game in games]))
+    t = time() - start
+
+    print("Results:")
+    print("Instances:", args.instances)
+    print("Actions per second (all instances):", round(args.iterations * args.instances / t, 2))
+
+    for game in games:
+        game.close()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+
+#####################################################################
+# This script shows how to start many instances with the fork server.
+# The first init() launches a server engine that loads WADs and
+# resources once, every game gets a fork of it that only loads
+# the map. Time of init() and memory of the engines are compared
+# with and without the fork server (Linux only, memory needs psutil).
+#####################################################################
+
+from __future__ import print_function
+
+from time import time
+import vizdoom as vzd
+from argparse import ArgumentParser
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+DEFAULT_CONFIG = "../../scenarios/basic.cfg"
+DEFAULT_INSTANCES = 16
+
+
+def engines_memory():
+    # Proportional set size counts pages shared by forks only partially
+    if psutil is None:
+        return None
+    total = 0
+    for p in psutil.Process().children(recursive=True):
+        try:
+            info = p.memory_full_info()
+            total += getattr(info, "pss", info.rss)
+        except psutil.Error:
+            pass
+    return round(total / (1024.0 * 1024.0), 1)
+
+
+def run(config, instances, fork_server):
+    games = []
+    start = time()
+    for i in range(instances):
+        game = vzd.DoomGame()
+        game.load_config(config)
+        # Forks are used only with hidden window and disabled sound in synchronous modes
+        game.set_window_visible(False)
+        game.set_sound_enabled(False)
+        game.set_fork_server_enabled(fork_server)
+        game.init()
+        games.append(game)
+    init_time = time() - start
+
+    memory = engines_memory()
+    for game in games:
+        game.close()
+
+    return init_time / instances, memory
+
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser("ViZDoom example showing how to start many instances with the fork server.")
+    parser.add_argument(dest="config",
+                        default=DEFAULT_CONFIG,
+                        nargs="?",
+                        help="Path to the configuration file of the scenario."
+                             " Please see "
+                             "../../scenarios/*cfg for more scenarios.")
+    parser.add_argument("-n", "--instances",
+                        default=DEFAULT_INSTANCES,
+                        type=int,
+                        help="Number of instances of the game")
+    args = parser.parse_args()
+
+    launch_time, launch_memory = run(args.config, args.instances, False)
+    fork_time, fork_memory = run(args.config, args.instances, True)
+
+    print("Results:")
+    print("Instances:", args.instances)
+    print("Average init time without the fork server:", round(launch_time * 1000, 2), "ms")
+    print("Average init time with the fork server (including the server):", round(fork_time * 1000, 2), "ms")
+    if launch_memory is not None:
+        print("Memory of the engines without the fork server:", launch_memory, "MB")
+        print("Memory of the engines with the fork server:", fork_memory, "MB")
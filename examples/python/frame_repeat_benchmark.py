@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+#####################################################################
+# This script measures the number of actions per second made with
+# frame repeat (tics argument of make_action) from 4 to 12 with
+# rendering of intermediate tics disabled (default) and enabled
+# (set_render_all_frames). Without it, intermediate tics run only
+# the game logic and only the last tic of the action is rendered.
+#
+# The engine keeps time spent in each stage (game logic, rendering,
+# copying of buffers, state update). With --stats the engine prints
+# them after every run (console has to be enabled to see them).
+#####################################################################
+
+from __future__ import print_function
+
+from random import choice
+from time import time
+import vizdoom as vzd
+from argparse import ArgumentParser
+
+# Options:
+frame_repeats = [4, 6, 8, 10, 12]
+
+#####################################################################
+DEFAULT_CONFIG = "../../scenarios/basic.cfg"
+DEFAULT_ITERATIONS = 1000
+
+
+def run(config, frame_repeat, render_all, iterations, stats):
+    game = vzd.DoomGame()
+    game.load_config(config)
+    game.set_window_visible(False)
+    game.set_render_all_frames(render_all)
+    game.set_console_enabled(stats)
+    game.init()
+
+    actions = [[True, False, False], [False, True, False], [False, False, True]]
+
+    start = time()
+    for i in range(iterations):
+        if game.is_episode_finished():
+            game.new_episode()
+
+        game.get_state()
+        game.make_action(choice(actions), frame_repeat)
+
+    t = time() - start
+    if stats:
+        game.send_game_command("viz_stats")
+    game.close()
+    return iterations / t
+
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser("ViZDoom example measuring the speed of actions with frame repeat.")
+    parser.add_argument(dest="config",
+                        default=DEFAULT_CONFIG,
+                        nargs="?",
+                        help="Path to the configuration file of the scenario."
+                             " Please see "
+                             "../../scenarios/*cfg for more scenarios.")
+    parser.add_argument("-i", "--iterations",
+                        default=DEFAULT_ITERATIONS,
+                        type=int,
+                        help="Number of iterations(actions) to run for each setting")
+    parser.add_argument("-s", "--stats",
+                        action="store_true",
+                        help="Print time spent in each stage by the engine")
+    args = parser.parse_args()
+
+    print("Results:")
+    for frame_repeat in frame_repeats:
+        skip_fps = run(args.config, frame_repeat, False, args.iterations, args.stats)
+        all_fps = run(args.config, frame_repeat, True, args.iterations, args.stats)
+        print("Frame repeat:", frame_repeat)
+        print("  last tic rendered:", round(skip_fps, 2), "actions/s")
+        print("  all tics rendered:", round(all_fps, 2), "actions/s")
+        print("  speedup:          ", round(skip_fps / all_fps, 2), "x")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+#####################################################################
+# This script shows Atari-style frame stacking with frame skip.
+# The engine resamples frames into a small grayscale observation,
+# max-pools the last two tics of every action and the Python module
+# keeps the last frames in a ring buffer, so make_action_stacked
+# returns the stacked frames without copying them in Python.
+# Its speed is compared with stacking observations in Python.
+#####################################################################
+
+from __future__ import print_function
+
+from collections import deque
+from random import choice
+from time import time
+import numpy as np
+import vizdoom as vzd
+from argparse import ArgumentParser
+
+# Options:
+resolution = (84, 84)
+stack_size = 4
+frame_skip = 4
+
+#####################################################################
+DEFAULT_CONFIG = "../../scenarios/basic.cfg"
+DEFAULT_ITERATIONS = 2000
+
+
+def create_game(config):
+    game = vzd.DoomGame()
+    game.load_config(config)
+    game.set_window_visible(False)
+    game.set_screen_buffer_enabled(False)
+    game.set_observation_shape(resolution[0], resolution[1], grayscale=True)
+    game.init()
+    return game
+
+
+def run_python_stack(config, iterations):
+    game = create_game(config)
+    game.set_observation_max_pool_enabled(True)
+    actions = [[True, False, False], [False, True, False], [False, False, True]]
+    frames = deque(maxlen=stack_size)
+
+    start = time()
+    for i in range(iterations):
+        if i == 0 or game.is_episode_finished():
+            game.new_episode()
+            frames.extend([game.get_state().observation_buffer] * stack_size)
+
+        game.make_action(choice(actions), frame_skip)
+        if not game.is_episode_finished():
+            frames.append(game.get_state().observation_buffer)
+        stack = np.stack(frames)
+
+    t = time() - start
+    game.close()
+    return iterations / t, stack.shape
+
+
+def run_native_stack(config, iterations):
+    game = create_game(config)
+    game.set_frame_stack(stack_size, max_pool=True)
+    actions = [[True, False, False], [False, True, False], [False, False, True]]
+
+    start = time()
+    for i in range(iterations):
+        if i == 0 or game.is_episode_finished():
+            game.new_episode()
+
+        # The stack is a view, it has to be copied to be stored, e.g. in a replay memory
+        reward, stack = game.make_action_stacked(choice(actions), frame_skip)
+
+    t = time() - start
+    game.close()
+    return iterations / t, stack.shape
+
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser("ViZDoom example comparing native frame stacking with stacking frames in Python.")
+    parser.add_argument(dest="config",
+                        default=DEFAULT_CONFIG,
+                        nargs="?",
+                        help="Path to the configuration file of the scenario."
+                             " Please see "
+                             "../../scenarios/*cfg for more scenarios.")
+    parser.add_argument("-i", "--iterations",
+                        default=DEFAULT_ITERATIONS,
+                        type=int,
+                        help="Number of iterations(actions) to run for each setting")
+    args = parser.parse_args()
+
+    python_fps, python_shape = run_python_stack(args.config, args.iterations)
+    native_fps, native_shape = run_native_stack(args.config, args.iterations)
+
+    print("Results:")
+    print("Stack shape:", native_shape)
+    print("  stacking in Python:", round(python_fps, 2), "steps/s")
+    print("  native stacking:   ", round(native_fps, 2), "steps/s")
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+#####################################################################
+# This script shows how to reuse engines with DoomGamePool.
+# Engines are launched in advance, init() takes an idle engine with
+# matching launch settings instead of starting a new process and
+# close() returns the engine to the pool. Time of init() is compared
+# with and without the pool.
+#####################################################################
+
+from __future__ import print_function
+
+from random import choice
+from time import time
+import vizdoom as vzd
+from argparse import ArgumentParser
+
+DEFAULT_CONFIG = "../../scenarios/basic.cfg"
+DEFAULT_INSTANCES = 8
+DEFAULT_CYCLES = 5
+
+
+def create_game(config, pool=None):
+    game = vzd.DoomGame()
+    game.load_config(config)
+    game.set_window_visible(False)
+    game.set_pool(pool)
+    return game
+
+
+def run_cycles(games, cycles):
+    actions = [[True, False, False], [False, True, False], [False, False, True]]
+    init_time = 0
+
+    for _ in range(cycles):
+        start = time()
+        for game in games:
+            game.init()
+        init_time += time() - start
+
+        for game in games:
+            for _ in range(10):
+                game.make_action(choice(actions))
+
+        # With the pool, engines are returned to it here instead of being closed
+        for game in games:
+            game.close()
+
+    return init_time / (cycles * len(games))
+
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser("ViZDoom example showing how to reuse engines with DoomGamePool.")
+    parser.add_argument(dest="config",
+                        default=DEFAULT_CONFIG,
+                        nargs="?",
+                        help="Path to the configuration file of the scenario."
+                             " Please see "
+                             "../../scenarios/*cfg for more scenarios.")
+    parser.add_argument("-n", "--instances",
+                        default=DEFAULT_INSTANCES,
+                        type=int,
+                        help="Number of instances of the game")
+    parser.add_argument("-c", "--cycles",
+                        default=DEFAULT_CYCLES,
+                        type=int,
+                        help="Number of init/close cycles")
+    args = parser.parse_args()
+
+    games = [create_game(args.config) for _ in range(args.instances)]
+    no_pool_time = run_cycles(games, args.cycles)
+
+    pool = vzd.DoomGamePool()
+    games = [create_game(args.config, pool) for _ in range(args.instances)]
+
+    # Engines can be launched before they are needed, settings of the game are used to launch them
+    start = time()
+    pool.launch(games[0], args.instances)
+    launch_time = time() - start
+
+    pool_time = run_cycles(games, args.cycles)
+
+    # Settings that can be changed at runtime don't prevent reuse, they are sent to the engine on init
+    games[0].set_depth_buffer_enabled(True)
+    games[0].init()
+    print("Depth buffer enabled on reused engine:", games[0].get_state().depth_buffer is not None)
+    games[0].close()
+
+    print("Results:")
+    print("Instances:", args.instances)
+    print("Idle engines in the pool:", pool.get_size())
+    print("Pool launch time:", round(launch_time, 3), "s")
+    print("Average init time without the pool:", round(no_pool_time * 1000, 2), "ms")
+    print("Average init time with the pool:", round(pool_time * 1000, 2), "ms")
+
+    pool.clear()
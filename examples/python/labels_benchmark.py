@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+
+#####################################################################
+# This script measures how the number of sprites in view affects
+# the speed of the game with and without the labels buffer.
+# Sprites are added by summoning barrels in front of the player
+# at the beginning of every episode. The average number of labels
+# per state is printed next to the speed.
+#####################################################################
+
+from __future__ import print_function
+
+from random import choice
+from time import time
+import vizdoom as vzd
+from argparse import ArgumentParser
+
+# Options:
+sprite_counts = [0, 8, 32, 64, 128]
+
+#####################################################################
+DEFAULT_CONFIG = "../../scenarios/basic.cfg"
+DEFAULT_ITERATIONS = 2000
+
+
+def run(config, sprites, labels, iterations):
+    game = vzd.DoomGame()
+    game.load_config(config)
+    game.set_window_visible(False)
+    game.set_labels_buffer_enabled(labels)
+    game.add_game_args("+sv_cheats 1")
+    game.init()
+
+    actions = [[True, False, False], [False, True, False], [False, False, True]]
+
+    labels_count = 0
+    states = 0
+
+    start = time()
+    for i in range(iterations):
+        if i == 0 or game.is_episode_finished():
+            game.new_episode()
+            for _ in range(sprites):
+                game.send_game_command("summon ExplosiveBarrel")
+
+        state = game.get_state()
+        if labels and state is not None:
+            labels_count += len(state.labels)
+            states += 1
+
+        game.make_action(choice(actions))
+
+    t = time() - start
+    game.close()
+    return iterations / t, labels_count / max(states, 1)
+
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser("ViZDoom example measuring the speed of the labels buffer for different numbers of sprites.")
+    parser.add_argument(dest="config",
+                        default=DEFAULT_CONFIG,
+                        nargs="?",
+                        help="Path to the configuration file of the scenario."
+                             " Please see "
+                             "../../scenarios/*cfg for more scenarios.")
+    parser.add_argument("-i", "--iterations",
+                        default=DEFAULT_ITERATIONS,
+                        type=int,
+                        help="Number of iterations(actions) to run for each setting")
+    args = parser.parse_args()
+
+    print("Results:")
+    for sprites in sprite_counts:
+        off_fps, _ = run(args.config, sprites, False, args.iterations)
+        on_fps, labels_count = run(args.config, sprites, True, args.iterations)
+        print("Summoned sprites:", sprites)
+        print("  average labels:", round(labels_count, 2))
+        print("  labels off:    ", round(off_fps, 2), "steps/s")
+        print("  labels on:     ", round(on_fps, 2), "steps/s")
+        print("  labels cost:   ", round(100 * (1 - on_fps / off_fps), 2), "%")
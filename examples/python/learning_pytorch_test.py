@@ -11,7 +11,6 @@ import itertools as it
 from random import sample, randint, random
 from time import time, sleep
 import numpy as np
-import skimage.color, skimage.transform
 import torch
 import torch.nn as nn
 import torch.nn.functional as F
@@ -41,13 +40,6 @@ config_file_path = "../../scenarios/simpler_basic.cfg"
 # config_file_path = "../../scenarios/rocket_basic.cfg"
 # config_file_path = "../../scenarios/basic.cfg"
 
-# Converts and down-samples the input image
-def preprocess(img):
-    img = skimage.transform.resize(img, resolution)
-    img = img.astype(np.float32)
-    return img
-
-
 class Net(nn.Module):
     def __init__(self, available_actions_count):
         super(Net, self).__init__()
@@ -85,6 +77,9 @@ def initialize_vizdoom(config_file_path):
     game.set_mode(Mode.PLAYER)
     game.set_screen_format(ScreenFormat.GRAY8)
     game.set_screen_resolution(ScreenResolution.RES_640X480)
+    # Down-sampling to the resolution of the network input is done by the engine
+    game.set_observation_shape(resolution[0], resolution[1], grayscale=True, float_values=True)
+    game.set_screen_buffer_enabled(False)
     game.init()
     print("Doom initialized.")
     return game
@@ -97,6 +92,8 @@ if __name__ == '__main__':
     # Action = which buttons are pressed
     n = game.get_available_buttons_size()
     actions = [list(a) for a in it.product([0, 1], repeat=n)]
+    # The table is registered once, then only indices of actions are passed to the game
+    game.set_action_table(actions)
 
     print("Loading model from: ", model_savefile)
     model = torch.load(model_savefile)
@@ -112,12 +109,12 @@ if __name__ == '__main__':
     for _ in range(episodes_to_watch):
         game.new_episode()
         while not game.is_episode_finished():
-            state = preprocess(game.get_state().screen_buffer)
+            state = game.get_state().observation_buffer
             state = state.reshape([1, 1, resolution[0], resolution[1]])
             best_action_index = get_best_action(state)
 
             # Instead of make_action(a, frame_repeat) in order to make the animation smooth
-            game.set_action(actions[best_action_index])
+            game.set_action_index(int(best_action_index))
             for _ in range(frame_repeat):
                 game.advance_action()
                 sleep(0.03)
@@ -6,7 +6,6 @@ import itertools as it
 from random import sample, randint, random
 from time import time, sleep
 import numpy as np
-import skimage.color, skimage.transform
 import tensorflow as tf
 from tqdm import trange
 import vizdoom as vzd
@@ -45,13 +44,6 @@ DEFAULT_CONFIG = "../../scenarios/simpler_basic.cfg"
 # config_file_path = "../../scenarios/rocket_basic.cfg"
 # config_file_path = "../../scenarios/basic.cfg"
 
-# Converts and down-samples the input image
-def preprocess(img):
-    img = skimage.transform.resize(img, resolution)
-    img = img.astype(np.float32)
-    return img
-
-
 class ReplayMemory:
     def __init__(self, capacity):
         channels = 1
@@ -166,7 +158,7 @@ def perform_learning_step(epoch):
         else:
             return end_eps
 
-    s1 = preprocess(game.get_state().screen_buffer)
+    s1 = game.get_state().observation_buffer
 
     # With probability eps make a random action.
     eps = exploration_rate(epoch)
@@ -175,10 +167,10 @@ def perform_learning_step(epoch):
     else:
         # Choose the best action according to the network.
         a = get_best_action(s1)
-    reward = game.make_action(actions[a], frame_repeat)
+    reward = game.make_action_index(int(a), frame_repeat)
 
     isterminal = game.is_episode_finished()
-    s2 = preprocess(game.get_state().screen_buffer) if not isterminal else None
+    s2 = game.get_state().observation_buffer if not isterminal else None
 
     # Remember the transition that was just experienced.
     memory.add_transition(s1, a, s2, isterminal, reward)
@@ -195,6 +187,9 @@ def initialize_vizdoom(config_file_path):
     game.set_mode(vzd.Mode.PLAYER)
     game.set_screen_format(vzd.ScreenFormat.GRAY8)
     game.set_screen_resolution(vzd.ScreenResolution.RES_640X480)
+    # Down-sampling to the resolution of the network input is done by the engine
+    game.set_observation_shape(resolution[0], resolution[1], grayscale=True, float_values=True)
+    game.set_screen_buffer_enabled(False)
     game.init()
     print("Doom initialized.")
     return game
@@ -217,6 +212,8 @@ if __name__ == '__main__':
     # Action = which buttons are pressed
     n = game.get_available_buttons_size()
     actions = [list(a) for a in it.product([0, 1], repeat=n)]
+    # The table is registered once, then only indices of actions are passed to the game
+    game.set_action_table(actions)
 
     # Create replay memory which will store the transitions
     memory = ReplayMemory(capacity=replay_memory_size)
@@ -262,10 +259,10 @@ if __name__ == '__main__':
             for test_episode in trange(test_episodes_per_epoch, leave=False):
                 game.new_episode()
                 while not game.is_episode_finished():
-                    state = preprocess(game.get_state().screen_buffer)
+                    state = game.get_state().observation_buffer
                     best_action_index = get_best_action(state)
 
-                    game.make_action(actions[best_action_index], frame_repeat)
+                    game.make_action_index(int(best_action_index), frame_repeat)
                 r = game.get_total_reward()
                 test_scores.append(r)
 
@@ -291,11 +288,11 @@ if __name__ == '__main__':
     for _ in range(episodes_to_watch):
         game.new_episode()
         while not game.is_episode_finished():
-            state = preprocess(game.get_state().screen_buffer)
+            state = game.get_state().observation_buffer
             best_action_index = get_best_action(state)
 
             # Instead of make_action(a, frame_repeat) in order to make the animation smooth
-            game.set_action(actions[best_action_index])
+            game.set_action_index(int(best_action_index))
             for _ in range(frame_repeat):
                 game.advance_action()
 
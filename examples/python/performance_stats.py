@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+
+#####################################################################
+# This script shows where time of a step is spent. Performance
+# stats are enabled, random actions are made and the cumulative
+# time of every stage measured by the engine and the library is
+# printed together with its share of the time of whole actions.
+#####################################################################
+
+from __future__ import print_function
+
+from random import choice
+import vizdoom as vzd
+from argparse import ArgumentParser
+
+DEFAULT_CONFIG = "../../scenarios/basic.cfg"
+DEFAULT_ITERATIONS = 2000
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser("ViZDoom example showing how to measure time spent in the stages of steps.")
+    parser.add_argument(dest="config",
+                        default=DEFAULT_CONFIG,
+                        nargs="?",
+                        help="Path to the configuration file of the scenario."
+                             " Please see "
+                             "../../scenarios/*cfg for more scenarios.")
+    parser.add_argument("-i", "--iterations",
+                        default=DEFAULT_ITERATIONS,
+                        type=int,
+                        help="Number of iterations(actions) to run")
+    args = parser.parse_args()
+
+    game = vzd.DoomGame()
+    game.load_config(args.config)
+    game.set_window_visible(False)
+    game.set_performance_stats_enabled(True)
+    game.init()
+
+    actions = [[True, False, False], [False, True, False], [False, False, True]]
+
+    # Skip the first episode start
+    game.reset_performance_stats()
+
+    for i in range(args.iterations):
+        if game.is_episode_finished():
+            game.new_episode()
+
+        state = game.get_state()
+        game.make_action(choice(actions))
+
+    stats = game.get_performance_stats()
+    game.close()
+
+    action_total = max(stats["action"].total, 1e-9)
+    print("Results:")
+    for stage, stat in stats.items():
+        print("{:>12}: {:8} calls, {:10.2f} ms total, {:8.4f} ms avg, {:6.2f} % of action".format(
+            stage, stat.count, stat.total, stat.total / max(stat.count, 1), 100 * stat.total / action_total))
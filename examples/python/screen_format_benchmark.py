@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+
+#####################################################################
+# This script compares the number of steps per second for every
+# screen format and a few screen resolutions with the engine copying
+# the screen buffer pixel by pixel (the old conversion, selected with
+# the +viz_screen_lut 0 game argument) and with the conversion through
+# palette lookup tables done row by row (default).
+#####################################################################
+
+from __future__ import print_function
+
+from random import choice
+from time import time
+import vizdoom as vzd
+from argparse import ArgumentParser
+
+# Options:
+formats = [vzd.ScreenFormat.CRCGCB,
+           vzd.ScreenFormat.RGB24,
+           vzd.ScreenFormat.RGBA32,
+           vzd.ScreenFormat.ARGB32,
+           vzd.ScreenFormat.CBCGCR,
+           vzd.ScreenFormat.BGR24,
+           vzd.ScreenFormat.BGRA32,
+           vzd.ScreenFormat.ABGR32,
+           vzd.ScreenFormat.GRAY8,
+           vzd.ScreenFormat.DOOM_256_COLORS8]
+
+resolutions = [vzd.ScreenResolution.RES_160X120,
+               vzd.ScreenResolution.RES_320X240,
+               vzd.ScreenResolution.RES_640X480,
+               vzd.ScreenResolution.RES_1280X720,
+               vzd.ScreenResolution.RES_1920X1080]
+
+#####################################################################
+DEFAULT_CONFIG = "../../scenarios/basic.cfg"
+DEFAULT_ITERATIONS = 1000
+
+
+def run(config, format, resolution, lut, iterations):
+    game = vzd.DoomGame()
+    game.load_config(config)
+    game.set_screen_format(format)
+    game.set_screen_resolution(resolution)
+    game.set_window_visible(False)
+    game.add_game_args("+viz_screen_lut " + str(int(lut)))
+    game.init()
+
+    actions = [[True, False, False], [False, True, False], [False, False, True]]
+
+    start = time()
+    for i in range(iterations):
+        if game.is_episode_finished():
+            game.new_episode()
+
+        game.get_state()
+        game.make_action(choice(actions))
+
+    t = time() - start
+    game.close()
+    return iterations / t
+
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser("ViZDoom example comparing screen buffer conversions for all screen formats.")
+    parser.add_argument(dest="config",
+                        default=DEFAULT_CONFIG,
+                        nargs="?",
+                        help="Path to the configuration file of the scenario."
+                             " Please see "
+                             "../../scenarios/*cfg for more scenarios.")
+    parser.add_argument("-i", "--iterations",
+                        default=DEFAULT_ITERATIONS,
+                        type=int,
+                        help="Number of iterations(actions) to run for each setting")
+    args = parser.parse_args()
+
+    print("Results:")
+    for resolution in resolutions:
+        for format in formats:
+            old_fps = run(args.config, format, resolution, False, args.iterations)
+            new_fps = run(args.config, format, resolution, True, args.iterations)
+            print(resolution, format)
+            print("  per pixel:    ", round(old_fps, 2), "steps/s")
+            print("  lookup tables:", round(new_fps, 2), "steps/s")
+            print("  speedup:      ", round(new_fps / old_fps, 2), "x")
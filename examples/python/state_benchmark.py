@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+#####################################################################
+# This script measures the latency of in-memory state snapshots
+# made with save_state and restored with load_state. Snapshots are
+# made without touching the disk, which makes them usable for
+# planning (e.g. MCTS) that restores the game thousands of times.
+# It also checks that the same actions after the restore lead to
+# the same rewards.
+#####################################################################
+
+from __future__ import print_function
+
+from random import choice
+from time import time
+import vizdoom as vzd
+from argparse import ArgumentParser
+
+DEFAULT_CONFIG = "../../scenarios/deadly_corridor.cfg"
+DEFAULT_ITERATIONS = 2000
+ROLLOUT_LENGTH = 10
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser("ViZDoom example measuring the latency of in-memory state snapshots.")
+    parser.add_argument(dest="config",
+                        default=DEFAULT_CONFIG,
+                        nargs="?",
+                        help="Path to the configuration file of the scenario."
+                             " Please see "
+                             "../../scenarios/*cfg for more scenarios.")
+    parser.add_argument("-i", "--iterations",
+                        default=DEFAULT_ITERATIONS,
+                        type=int,
+                        help="Number of snapshots to save and restore")
+    args = parser.parse_args()
+
+    game = vzd.DoomGame()
+    game.load_config(args.config)
+    game.set_window_visible(False)
+    game.set_mode(vzd.Mode.PLAYER)
+    game.init()
+
+    buttons = game.get_available_buttons_size()
+    actions = [[int(i == j) for j in range(buttons)] for i in range(buttons)]
+
+    # Move a bit into the episode, so there is something to snapshot
+    for _ in range(20):
+        game.make_action(choice(actions))
+
+    save_time = 0
+    load_time = 0
+    size = 0
+    for _ in range(args.iterations):
+        start = time()
+        state = game.save_state()
+        save_time += time() - start
+        size = len(state)
+
+        game.make_action(choice(actions))
+
+        start = time()
+        game.load_state(state)
+        load_time += time() - start
+
+    # Same actions after restoring the snapshot should give the same rewards
+    state = game.save_state()
+    rollout = [choice(actions) for _ in range(ROLLOUT_LENGTH)]
+    rewards = [game.make_action(a) for a in rollout]
+    game.load_state(state)
+    replayed_rewards = [game.make_action(a) for a in rollout]
+
+    print("Results:")
+    print("Snapshot size:", size, "bytes")
+    print("save_state:", round(save_time / args.iterations * 1000000, 2), "us")
+    print("load_state:", round(load_time / args.iterations * 1000000, 2), "us")
+    print("Snapshots + restores per second:", round(args.iterations / (save_time + load_time), 2))
+    print("Rollout after restore is the same:", rewards == replayed_rewards)
+
+    game.close()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+#####################################################################
+# This script compares the number of steps per second that can be made
+# with the default message queue synchronization and the shared memory
+# synchronization (set_shared_memory_sync_enabled) for a few screen
+# resolutions. The smaller the resolution, the bigger the part of
+# the step time spent on synchronization between the library and
+# the engine.
+#####################################################################
+
+from __future__ import print_function
+
+from random import choice
+from time import time
+import vizdoom as vzd
+from argparse import ArgumentParser
+
+# Options:
+resolutions = [vzd.ScreenResolution.RES_160X120,
+               vzd.ScreenResolution.RES_320X240,
+               vzd.ScreenResolution.RES_640X480]
+
+#####################################################################
+DEFAULT_CONFIG = "../../scenarios/basic.cfg"
+DEFAULT_ITERATIONS = 5000
+
+
+def run(config, resolution, sm_sync, iterations):
+    game = vzd.DoomGame()
+    game.load_config(config)
+    game.set_screen_resolution(resolution)
+    game.set_window_visible(False)
+    game.set_shared_memory_sync_enabled(sm_sync)
+    game.init()
+
+    actions = [[True, False, False], [False, True, False], [False, False, True]]
+
+    start = time()
+    for i in range(iterations):
+        if game.is_episode_finished():
+            game.new_episode()
+
+        game.get_state()
+        game.make_action(choice(actions))
+
+    t = time() - start
+    game.close()
+    return iterations / t
+
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser("ViZDoom example comparing message queue and shared memory synchronization.")
+    parser.add_argument(dest="config",
+                        default=DEFAULT_CONFIG,
+                        nargs="?",
+                        help="Path to the configuration file of the scenario."
+                             " Please see "
+                             "../../scenarios/*cfg for more scenarios.")
+    parser.add_argument("-i", "--iterations",
+                        default=DEFAULT_ITERATIONS,
+                        type=int,
+                        help="Number of iterations(actions) to run for each setting")
+    args = parser.parse_args()
+
+    print("Results:")
+    for resolution in resolutions:
+        mq_fps = run(args.config, resolution, False, args.iterations)
+        sm_fps = run(args.config, resolution, True, args.iterations)
+        print(resolution)
+        print("  message queue:", round(mq_fps, 2), "steps/s")
+        print("  shared memory:", round(sm_fps, 2), "steps/s")
+        print("  speedup:      ", round(sm_fps / mq_fps, 2), "x")
@@ -6,17 +6,36 @@ from random import choice
 import vizdoom as vzd
 from argparse import ArgumentParser
 
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
 
 DEFAULT_CONFIG = "../../scenarios/basic.cfg"
 
 
-def play(process, instances, config_file):
+def engines_pss():
+    # Proportional set size divides shared pages between the processes sharing them
+    total = 0
+    for p in psutil.Process().children(recursive=True):
+        try:
+            info = p.memory_full_info()
+            total += getattr(info, "pss", info.rss)
+        except psutil.Error:
+            pass
+    return total / (1024.0 * 1024.0)
+
+
+def play(process, instances, config_file, shared_resources, fork_server):
     games = []
     for i in range(instances):
         game = vzd.DoomGame()
         game.load_config(config_file)
         game.set_mode(vzd.Mode.PLAYER)
         game.set_window_visible(False)
+        game.set_shared_resources_enabled(shared_resources)
+        game.set_fork_server_enabled(fork_server)
         game.init()
         games.append(game)
         print("Process {}: Game {} started...".format(process, i))
@@ -30,6 +49,9 @@ def play(process, instances, config_file):
         while not g.is_episode_finished():
             g.make_action(choice(actions))
 
+    if psutil is not None:
+        print("Process {}: PSS of the engines: {:.1f} MB".format(process, engines_pss()))
+
     for g in games:
         g.close()
 
@@ -42,13 +64,20 @@ if __name__ == '__main__':
                         help="Path to the configuration file of the scenario."
                              " Please see "
                              "../../scenarios/*cfg for more scenarios.")
-    parser.add_argument("-i", "--instances", default=128, help="Number of instances per process.")
-    parser.add_argument("-p", "--processes", default=4, help="Number of processes.")
+    parser.add_argument("-i", "--instances", default=128, type=int, help="Number of instances per process.")
+    parser.add_argument("-p", "--processes", default=4, type=int, help="Number of processes.")
+    parser.add_argument("-s", "--shared-resources", action="store_true",
+                        help="Share WAD lumps and decoded textures between the engines.")
+    parser.add_argument("-f", "--fork-server", action="store_true",
+                        help="Fork the engines from a fork server (Linux only).")
     args = parser.parse_args()
 
+    if psutil is None:
+        print("psutil is not installed, PSS of the engines won't be reported.")
+
     processes= []
     for p in range(args.processes):
-        p = Process(target=play, args=[p, args.instances, args.config])
+        p = Process(target=play, args=[p, args.instances, args.config, args.shared_resources, args.fork_server])
         p.start()
         processes.append(p)
 
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+#####################################################################
+# This script shows how to run many instances of the game with
+# VectorDoomGame. All instances are stepped with a single call,
+# engines work concurrently and finished episodes are restarted
+# automatically. Screen buffers, rewards and game variables of all
+# instances are returned as stacked NumPy arrays.
+#####################################################################
+
+from __future__ import print_function
+
+from time import time
+import numpy as np
+import vizdoom as vzd
+from argparse import ArgumentParser
+
+DEFAULT_CONFIG = "../../scenarios/basic.cfg"
+DEFAULT_INSTANCES = 4
+DEFAULT_ITERATIONS = 2000
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser("ViZDoom example showing how to step many instances of the game at once.")
+    parser.add_argument(dest="config",
+                        default=DEFAULT_CONFIG,
+                        nargs="?",
+                        help="Path to the configuration file of the scenario."
+                             " Please see "
+                             "../../scenarios/*cfg for more scenarios.")
+    parser.add_argument("-n", "--instances",
+                        default=DEFAULT_INSTANCES,
+                        type=int,
+                        help="Number of instances of the game")
+    parser.add_argument("-i", "--iterations",
+                        default=DEFAULT_ITERATIONS,
+                        type=int,
+                        help="Number of steps to run")
+    args = parser.parse_args()
+
+    games = vzd.VectorDoomGame(args.instances)
+    games.load_config(args.config)
+
+    # Every game can still be configured separately.
+    for i in range(games.get_size()):
+        games.get_game(i).set_window_visible(False)
+        games.get_game(i).set_seed(i)
+
+    games.init()
+
+    buttons = games.get_game(0).get_available_buttons_size()
+    finished_episodes = 0
+
+    start = time()
+    for _ in range(args.iterations):
+        # One random one-hot action per instance
+        actions = np.eye(buttons)[np.random.randint(buttons, size=args.instances)]
+
+        screens, rewards, dones, game_variables = games.step(actions)
+
+        for total_reward in games.get_finished_total_rewards()[dones]:
+            finished_episodes += 1
+            print("Episode finished, total reward:", total_reward)
+
+    t = time() - start
+    print("Results:")
+    print("Instances:", args.instances)
+    print("Screens shape:", screens.shape)
+    print("Finished episodes:", finished_episodes)
+    print("Steps per second (all instances):", round(args.iterations * args.instances / t, 2))
+
+    games.close()
@@ -26,7 +26,9 @@
 #include "ViZDoomConsts.h"
 #include "ViZDoomExceptions.h"
 #include "ViZDoomGame.h"
+#include "ViZDoomGamePool.h"
 #include "ViZDoomTypes.h"
 #include "ViZDoomUtilities.h"
+#include "ViZDoomVectorGame.h"
 
 #endif
\ No newline at end of file
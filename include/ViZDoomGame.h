@@ -33,6 +33,7 @@
 namespace vizdoom {
 
     class DoomController;
+    class DoomGamePool;
 
     class DoomGame {
 
@@ -57,6 +58,12 @@ namespace vizdoom {
         void setAction(std::vector<double> const &actions);
         void advanceAction(unsigned int tics = 1, bool updateState = true);
         double makeAction(std::vector<double> const &actions, unsigned int tics = 1);
+        void setActionIndex(unsigned int index);
+        double makeActionIndex(unsigned int index, unsigned int tics = 1);
+
+        void makeActionAsync(std::vector<double> const &actions, unsigned int tics = 1);
+        bool poll();
+        double wait();
 
         bool isNewEpisode();
         bool isEpisodeFinished();
@@ -71,6 +78,8 @@ namespace vizdoom {
 
         void saveState(std::string filePath);
         void loadState(std::string filePath);
+        std::vector<uint8_t> saveState();
+        void loadState(std::vector<uint8_t> const &state);
 
 
         /* Buttons settings */
@@ -87,6 +96,10 @@ namespace vizdoom {
         double getButtonMaxValue(Button button);
         double getButton(Button button);
 
+        std::vector<std::vector<double>> getActionTable();
+        void setActionTable(std::vector<std::vector<double>> const &actions);
+        size_t getActionTableSize();
+
 
         /* GameVariables getters and setters */
         /*------------------------------------------------------------------------------------------------------------*/
@@ -128,6 +141,27 @@ namespace vizdoom {
         unsigned int getTicrate();
         void setTicrate(unsigned int ticrate);
 
+        bool isSharedMemorySyncEnabled();
+        void setSharedMemorySyncEnabled(bool smSync);
+
+        bool isActionNotificationEnabled();
+        void setActionNotificationEnabled(bool actionNotification);
+        int getActionNotificationFd();
+
+        bool isForkServerEnabled();
+        void setForkServerEnabled(bool forkServer);
+
+        bool isSharedResourcesEnabled();
+        void setSharedResourcesEnabled(bool sharedResources);
+
+        bool isPerformanceStatsEnabled();
+        void setPerformanceStatsEnabled(bool perfStats);
+        std::vector<PerformanceStat> getPerformanceStats(bool reset = false);
+        void resetPerformanceStats();
+
+        DoomGamePool *getPool();
+        void setPool(DoomGamePool *pool);
+
         void setViZDoomPath(std::string filePath);
         void setDoomGamePath(std::string filePath);
         void setDoomScenarioPath(std::string filePath);
@@ -142,6 +176,8 @@ namespace vizdoom {
         void setEpisodeStartTime(unsigned int tics);
         unsigned int getEpisodeTimeout();
         void setEpisodeTimeout(unsigned int tics);
+        bool isFastResetEnabled();
+        void setFastResetEnabled(bool fastReset);
         unsigned int getEpisodeTime();
 
 
@@ -152,6 +188,20 @@ namespace vizdoom {
         ScreenFormat getScreenFormat();
         void setScreenFormat(ScreenFormat format);
 
+        /* Screen buffer */
+        bool isScreenBufferEnabled();
+        void setScreenBufferEnabled(bool screenBuffer);
+
+        /* Observation buffer */
+        bool isObservationEnabled();
+        void setObservationShape(unsigned int height, unsigned int width, bool grayscale = false,
+                                 bool nearestResampling = false, bool floatValues = false);
+        unsigned int getObservationWidth();
+        unsigned int getObservationHeight();
+        unsigned int getObservationChannels();
+        bool isObservationMaxPoolEnabled();
+        void setObservationMaxPoolEnabled(bool maxPool);
+
         /* Depth buffer */
         bool isDepthBufferEnabled();
         void setDepthBufferEnabled(bool depthBuffer);
@@ -172,6 +222,9 @@ namespace vizdoom {
         void setObjectsInfoEnabled(bool objectsInfo);
         bool isSectorsInfoEnabled();
         void setSectorsInfoEnabled(bool sectorsInfo);
+        void setObjectsFilter(double radius, unsigned int maxCount = 0,
+                              std::vector<std::string> const &names = {}, bool excludeNames = false);
+        std::vector<Object> getNearestObjects(std::string const &name, unsigned int count = 1);
 
         /* Render options */
         void setRenderHud(bool hud);
@@ -201,6 +254,12 @@ namespace vizdoom {
 
         DoomController *doomController;
 
+        // Engines are taken from the pool on init and returned to it on close
+        DoomGamePool *pool;
+
+        // Creates a controller with settings of this game, which is not running yet
+        DoomController *createController();
+
         /* Game state and actions */
         /*------------------------------------------------------------------------------------------------------------*/
 
@@ -211,16 +270,40 @@ namespace vizdoom {
         GameStatePtr state;
 
         void resetState();
-        void updateState();
+        virtual void updateState();
 
         std::vector<GameVariable> availableGameVariables;
         std::vector<Button> availableButtons;
         std::vector<double> lastAction;
         std::vector<double> nextAction;
 
+        // Discrete actions registered once and selected by their index
+        std::vector<std::vector<double>> actionTable;
+
         unsigned int nextStateNumber;
         unsigned int lastMapTic;
 
+        // Sectors with their lines, rebuilt only when the geometry of the map changes
+        std::vector<Sector> mapSectors;
+        unsigned int mapGeometryVersion;
+
+        // If false, buffers are not copied from SM to the state (used by wrappers exposing SM directly)
+        bool copyBuffers;
+
+        // If false, labels, objects and sectors are not copied from SM to the state (used by wrappers reading SM directly)
+        bool copyInfo;
+
+        // Action split into sending it to the engine and waiting for the result
+        bool actionPending;
+        bool actionUpdateState;
+
+        void startAdvanceAction(unsigned int tics = 1, bool updateState = true);
+        bool isAdvanceActionDone();
+        void finishAdvanceAction();
+
+        friend class VectorDoomGame;
+        friend class DoomGamePool;
+
         /* Rewards */
         /*------------------------------------------------------------------------------------------------------------*/
 
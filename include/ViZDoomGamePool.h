@@ -0,0 +1,71 @@
+/*
+ Copyright (C) 2016 by Wojciech Jaśkowski, Michał Kempka, Grzegorz Runc, Jakub Toczek, Marek Wydmuch
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ THE SOFTWARE.
+*/
+
+
+#ifndef __VIZDOOM_GAME_POOL_H__
+#define __VIZDOOM_GAME_POOL_H__
+
+#include "ViZDoomGame.h"
+
+#include <mutex>
+#include <string>
+#include <vector>
+
+namespace vizdoom {
+
+    class DoomController;
+
+    class DoomGamePool {
+
+    public:
+
+        DoomGamePool(unsigned int maxSize = 0);
+        virtual ~DoomGamePool();
+
+        unsigned int launch(DoomGame &game, unsigned int count = 1);
+        void clear();
+
+        size_t getSize();
+        unsigned int getMaxSize();
+        void setMaxSize(unsigned int maxSize);
+
+
+    protected:
+
+        // Takes an idle engine launched with the given settings or returns nullptr
+        DoomController *acquire(std::string const &launchKey);
+
+        // Keeps a running engine for later use, returns false if the engine can't be kept
+        bool release(DoomController *controller);
+
+        void trim();
+
+        std::vector<DoomController *> engines;
+        unsigned int maxSize;
+        std::mutex mutex;
+
+        friend class DoomGame;
+
+    };
+}
+
+#endif
@@ -92,10 +92,13 @@ namespace vizdoom{
         bool isBlocking;
     };
 
+    // Lines are shared by all states until the geometry of the map changes
+    typedef std::shared_ptr<const std::vector<Line>> LinesPtr;
+
     struct Sector{
         double floorHeight;
         double ceilingHeight;
-        std::vector<Line> lines;
+        LinesPtr lines;
     };
 
     struct GameState {
@@ -108,6 +111,7 @@ namespace vizdoom{
         BufferPtr depthBuffer;
         BufferPtr labelsBuffer;
         BufferPtr automapBuffer;
+        BufferPtr observationBuffer;
 
         std::vector<Label> labels;
 
@@ -131,6 +135,13 @@ namespace vizdoom{
 
     typedef std::shared_ptr<ServerState> ServerStatePtr;
 
+    struct PerformanceStat {
+        std::string stage;
+        unsigned int count;
+        double total;       // In milliseconds, since the last reset
+        double last;        // In milliseconds, the last step
+    };
+
     enum Mode {
         PLAYER,             // synchronous player mode
         SPECTATOR,          // synchronous spectator mode
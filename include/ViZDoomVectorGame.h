@@ -0,0 +1,99 @@
+/*
+ Copyright (C) 2016 by Wojciech Jaśkowski, Michał Kempka, Grzegorz Runc, Jakub Toczek, Marek Wydmuch
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ THE SOFTWARE.
+*/
+
+#ifndef __VIZDOOM_VECTOR_GAME_H__
+#define __VIZDOOM_VECTOR_GAME_H__
+
+#include "ViZDoomGame.h"
+
+#include <memory>
+#include <string>
+#include <vector>
+
+namespace vizdoom {
+
+    class VectorDoomGame {
+
+    public:
+
+        VectorDoomGame(unsigned int size);
+        virtual ~VectorDoomGame();
+
+
+        /* Flow Control */
+        /*------------------------------------------------------------------------------------------------------------*/
+
+        bool loadConfig(std::string filePath);
+        bool init();
+        void close();
+        void newEpisodes();
+        bool isRunning();
+
+        std::vector<double> makeActions(std::vector<std::vector<double>> const &actions, unsigned int tics = 1);
+        std::vector<double> makeActionsIndex(std::vector<unsigned int> const &indices, unsigned int tics = 1);
+
+        std::vector<bool> getEpisodesFinished();
+        std::vector<double> getLastRewards();
+        std::vector<double> getFinishedTotalRewards();
+
+
+        /* Settings */
+        /*------------------------------------------------------------------------------------------------------------*/
+
+        size_t getSize();
+        DoomGame *getGame(unsigned int index);
+
+        void setActionTable(std::vector<std::vector<double>> const &actions);
+        void setPool(DoomGamePool *pool);
+
+        bool isAutoResetEnabled();
+        void setAutoResetEnabled(bool autoReset);
+
+
+    protected:
+
+        // Used by wrappers that fill games with their own DoomGame subclasses
+        VectorDoomGame();
+
+        std::vector<std::shared_ptr<DoomGame>> games;
+
+        void resizeResults();
+
+        // Starts new episodes in the games with the given indices concurrently
+        void restartGames(std::vector<size_t> const &indices);
+
+        // Waits for actions started in all games and collects their results
+        std::vector<double> finishActions();
+
+        /* Results of the last step */
+        /*------------------------------------------------------------------------------------------------------------*/
+
+        std::vector<double> lastRewards;
+        std::vector<bool> episodesFinished;
+        std::vector<double> finishedTotalRewards;
+
+        bool autoReset;
+
+    };
+}
+
+#endif
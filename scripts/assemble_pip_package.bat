@@ -8,6 +8,7 @@ set SRC_PATH=%3
 set PACKAGE_DEST_DIRECTORY=%BIN_PATH%\python%PYTHON_VERSION%
 set PACKAGE_DEST_PATH=%PACKAGE_DEST_DIRECTORY%\pip_package
 set PACAKGE_INIT_FILE_SRC=%SRC_PATH%\src\lib_python\__init__.py
+set PACKAGE_BENCH_FILE_SRC=%SRC_PATH%\src\lib_python\bench.py
 
 set VIZDOOM_EXEC_PATH=%BIN_PATH%\vizdoom.exe
 set VIZDOOM_PK3_PATH=%BIN_PATH%\vizdoom.pk3
@@ -41,6 +42,7 @@ del %PACKAGE_DEST_PATH%
 md %PACKAGE_DEST_PATH%
 
 copy "%PACAKGE_INIT_FILE_SRC%" "%PACKAGE_DEST_PATH%"
+copy "%PACKAGE_BENCH_FILE_SRC%" "%PACKAGE_DEST_PATH%"
 copy "%PYTHON_BIN_PATH%" "%PYTHON_BIN_DEST_PATH%"
 copy "%VIZDOOM_EXEC_PATH%" "%PACKAGE_DEST_PATH%"
 copy "%VIZDOOM_PK3_PATH%" "%PACKAGE_DEST_PATH%"
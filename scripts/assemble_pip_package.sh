@@ -12,6 +12,7 @@ fi
 PACKAGE_DEST_DIRECTORY="${BIN_PATH}/python${PYTHON_VERSION}"
 PACKAGE_DEST_PATH="${PACKAGE_DEST_DIRECTORY}/pip_package"
 PACKAGE_INIT_FILE_SRC="${SRC_PATH}/src/lib_python/__init__.py"
+PACKAGE_BENCH_FILE_SRC="${SRC_PATH}/src/lib_python/bench.py"
 
 if [ "$(uname)" == "Darwin" ]; then
     VIZDOOM_EXEC_PATH="${BIN_PATH}/vizdoom.app/Contents/MacOS/vizdoom"
@@ -42,6 +43,7 @@ rm -rf ${PACKAGE_DEST_PATH}
 mkdir -p ${PACKAGE_DEST_PATH}
 
 cp ${PACKAGE_INIT_FILE_SRC} ${PACKAGE_DEST_PATH}
+cp ${PACKAGE_BENCH_FILE_SRC} ${PACKAGE_DEST_PATH}
 cp ${PYTHON_BIN_PATH} ${PYTHON_BIN_DEST_PATH}
 cp ${VIZDOOM_EXEC_PATH} ${PACKAGE_DEST_PATH}
 cp ${VIZDOOM_PK3_PATH} ${PACKAGE_DEST_PATH}
@@ -96,7 +96,7 @@ setup(
     setup_requires=['cython', 'numpy'],
     packages=['vizdoom'],
     package_dir={'vizdoom': package_path},
-    package_data={'vizdoom': ['__init__.py', 'bots.cfg', 'freedoom2.wad', 'vizdoom', 'vizdoom.pk3', 'vizdoom.so', 'scenarios/*']},
+    package_data={'vizdoom': ['__init__.py', 'bench.py', 'bots.cfg', 'freedoom2.wad', 'vizdoom', 'vizdoom.pk3', 'vizdoom.so', 'scenarios/*']},
     include_package_data=True,
     cmdclass={'build': BuildCommand},
     platforms=supported_platforms,
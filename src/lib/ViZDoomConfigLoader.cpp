@@ -549,6 +549,10 @@ namespace vizdoom {
                     this->game->setEpisodeTimeout(stringToUint(val));
                     continue;
                 }
+                if (key == "fast_reset_enabled" || key == "fastresetenabled") {
+                    this->game->setFastResetEnabled(stringToBool(val));
+                    continue;
+                }
                 if (key == "episode_start_time" || key == "episodestarttime") {
                     this->game->setEpisodeStartTime(stringToUint(val));
                     continue;
@@ -614,6 +618,18 @@ namespace vizdoom {
 
             /* Parse bool properties */
             try {
+                if (key == "screen_buffer_enabled" || key == "screenbufferenabled") {
+                    this->game->setScreenBufferEnabled(stringToBool(val));
+                    continue;
+                }
+                if (key == "performance_stats_enabled" || key == "performancestatsenabled") {
+                    this->game->setPerformanceStatsEnabled(stringToBool(val));
+                    continue;
+                }
+                if (key == "observation_max_pool_enabled" || key == "observationmaxpoolenabled") {
+                    this->game->setObservationMaxPoolEnabled(stringToBool(val));
+                    continue;
+                }
                 if (key == "depth_buffer_enabled" || key == "depthbufferenabled") {
                     this->game->setDepthBufferEnabled(stringToBool(val));
                     continue;
@@ -642,6 +658,22 @@ namespace vizdoom {
                     this->game->setSectorsInfoEnabled(stringToBool(val));
                     continue;
                 }
+                if (key == "shared_memory_sync_enabled" || key == "sharedmemorysyncenabled") {
+                    this->game->setSharedMemorySyncEnabled(stringToBool(val));
+                    continue;
+                }
+                if (key == "action_notification_enabled" || key == "actionnotificationenabled") {
+                    this->game->setActionNotificationEnabled(stringToBool(val));
+                    continue;
+                }
+                if (key == "fork_server_enabled" || key == "forkserverenabled") {
+                    this->game->setForkServerEnabled(stringToBool(val));
+                    continue;
+                }
+                if (key == "shared_resources_enabled" || key == "sharedresourcesenabled") {
+                    this->game->setSharedResourcesEnabled(stringToBool(val));
+                    continue;
+                }
                 if (key == "render_hud" || key == "renderhud") {
                     this->game->setRenderHud(stringToBool(val));
                     continue;
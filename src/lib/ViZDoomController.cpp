@@ -22,14 +22,25 @@
 
 #include "ViZDoomController.h"
 #include "ViZDoomExceptions.h"
+#include "ViZDoomForkServer.h"
 #include "ViZDoomPathHelpers.h"
 #include "ViZDoomUtilities.h"
 #include "ViZDoomVersion.h"
 
 #include <boost/algorithm/string.hpp>
 #include <boost/chrono.hpp>
+#include <boost/filesystem.hpp>
 #include <boost/lexical_cast.hpp>
 
+#include <algorithm>
+#include <cstring>
+
+#if defined(OS_LINUX) || defined(OS_OSX)
+    #include <fcntl.h>
+    #include <sys/stat.h>
+    #include <unistd.h>
+#endif
+
 
 namespace vizdoom {
 
@@ -54,6 +65,7 @@ namespace vizdoom {
         this->depthBuffer = nullptr;
         this->labelsBuffer = nullptr;
         this->automapBuffer = nullptr;
+        this->observationBuffer = nullptr;
 
         /* Threads */
         this->signalThread = nullptr;
@@ -88,6 +100,16 @@ namespace vizdoom {
         this->screenSize = this->screenWidth * this->screenHeight;
         this->screenDepth = 8;
         this->screenFormat = CRCGCB;
+        this->screenBufferEnabled = true;
+
+        this->observationWidth = 0;
+        this->observationHeight = 0;
+        this->observationGrayscale = false;
+        this->observationNearest = false;
+        this->observationFloat = false;
+        this->observationMaxPool = false;
+        this->perfStats = false;
+        this->resetPerformanceStats();
 
         this->depth = false;
 
@@ -100,6 +122,10 @@ namespace vizdoom {
 
         this->objects = false;
         this->sectors = false;
+        this->objectsFilterRadius = 0;
+        this->objectsFilterMaxCount = 0;
+        this->objectsFilterNames = "";
+        this->objectsFilterExcludeNames = false;
 
         this->hud = false;
         this->minHud = false;
@@ -119,6 +145,14 @@ namespace vizdoom {
 
         this->allowDoomInput = false;
         this->runDoomAsync = false;
+        this->smSync = false;
+        this->smSyncSeq = 0;
+        this->ticsPending = false;
+        this->actionNotification = false;
+        this->forkServer = false;
+        this->sharedResources = false;
+        this->notificationFd = -1;
+        this->fastReset = false;
 
         this->doomStaticSeed = true;
         this->doomSeed = 0;
@@ -142,8 +176,12 @@ namespace vizdoom {
         if (!this->doomRunning) {
 
             try {
+                this->launchKey = this->getLaunchKey();
                 this->generateInstanceId();
 
+                // Create FIFO notifying about messages sent by Doom
+                if (this->actionNotification) this->openNotificationFifo();
+
                 // Generate Doom process's arguments
                 this->createDoomArgs();
 
@@ -155,14 +193,19 @@ namespace vizdoom {
                 this->signalThread = new b::thread(b::bind(&DoomController::handleSignals, this));
 
                 // Doom thread
-                this->doomThread = new b::thread(b::bind(&DoomController::launchDoom, this));
+                if (this->isForkServerUsed()) {
+                    this->forkDoom();
+                    this->doomThread = new b::thread(b::bind(&DoomController::watchForkedDoom, this));
+                }
+                else this->doomThread = new b::thread(b::bind(&DoomController::launchDoom, this));
                 this->doomRunning = true;
 
                 // Wait for first message from Doom
                 this->waitForDoomStart();
 
                 // Open shared memory
-                this->SM = new SharedMemory(SM_NAME_BASE + this->instanceId);
+                this->SM = new SharedMemory(SM_NAME_BASE + this->instanceId, SM_SNAPSHOT_NAME_BASE + this->instanceId);
+                this->smSyncSeq = 0;
 
                 this->gameState = this->SM->getGameState();
                 this->input = this->SM->getInputState();
@@ -170,6 +213,11 @@ namespace vizdoom {
                 this->depthBuffer = this->SM->getDepthBuffer();
                 this->labelsBuffer = this->SM->getLabelsBuffer();
                 this->automapBuffer = this->SM->getAutomapBuffer();
+                this->observationBuffer = this->SM->getObservationBuffer();
+
+                // Counters of a new engine start from 0
+                std::fill_n(this->engineStatsCountBase, SM_STATS_STAGE_COUNT, 0);
+                std::fill_n(this->engineStatsTotalBase, SM_STATS_STAGE_COUNT, 0.0);
 
                 // Check version
                 if (this->gameState->VERSION != VIZDOOM_LIB_VERSION)
@@ -180,10 +228,13 @@ namespace vizdoom {
                 this->waitForDoomMapStartTime();
 
                 // Update state
-                this->MQDoom->send(MSG_CODE_UPDATE);
+                this->sendDoomWork(MSG_CODE_UPDATE);
                 this->waitForDoomWork();
 
-                *this->input = *this->_input;
+                std::memcpy(this->input->BT, this->_input->BT, sizeof(this->input->BT));
+                std::memcpy(this->input->BT_AVAILABLE, this->_input->BT_AVAILABLE, sizeof(this->input->BT_AVAILABLE));
+                std::memcpy(this->input->BT_MAX_VALUE, this->_input->BT_MAX_VALUE, sizeof(this->input->BT_MAX_VALUE));
+                std::memcpy(this->input->CMD_BT, this->_input->CMD_BT, sizeof(this->input->CMD_BT));
 
                 this->mapLastTic = this->gameState->MAP_TIC;
 
@@ -202,6 +253,8 @@ namespace vizdoom {
             if (this->doomRunning) {
                 this->doomRunning = false;
                 this->doomWorking = false;
+                this->ticsPending = false;
+                this->resetSnapshot.clear();
 
                 this->MQDoom->send(MSG_CODE_CLOSE);
 
@@ -245,6 +298,8 @@ namespace vizdoom {
                 delete this->MQController;
                 this->MQController = nullptr;
             }
+
+            this->closeNotificationFifo();
         }
         catch (...) { throw; }
 
@@ -254,6 +309,7 @@ namespace vizdoom {
         this->depthBuffer = nullptr;
         this->labelsBuffer = nullptr;
         this->automapBuffer = nullptr;
+        this->observationBuffer = nullptr;
 
     }
 
@@ -275,37 +331,89 @@ namespace vizdoom {
 
             if (this->isTicPossible()) {
                 this->mapLastTic = this->gameState->MAP_TIC + 1;
-                if (update) this->MQDoom->send(MSG_CODE_TIC_AND_UPDATE);
-                else this->MQDoom->send(MSG_CODE_TIC);
+                if (update) this->sendDoomWork(MSG_CODE_TIC_AND_UPDATE);
+                else this->sendDoomWork(MSG_CODE_TIC);
                 this->waitForDoomWork();
             }
         } else throw ViZDoomIsNotRunningException();
     }
 
     void DoomController::tics(unsigned int tics, bool update) {
+        this->startTics(tics, update);
+        this->finishTics();
+    }
+
+    void DoomController::startTics(unsigned int tics, bool update) {
+
+        if (!this->doomRunning) throw ViZDoomIsNotRunningException();
+        if (this->ticsPending) this->finishTics();
+
+        this->ticsStartTime = this->statsClock();
+
+        if (this->runDoomAsync) {
+            // In asynchronous modes engine runs on its own, so tics are made one by one right away
+            for (unsigned int i = 0; i < tics; ++i) {
+                if (i == tics - 1) this->tic(update);
+                else this->tic(false);
+
+                if (!this->isTicPossible() && i != tics - 1) {
+                    this->sendDoomWork(MSG_CODE_UPDATE);
+                    this->waitForDoomWork();
+                    break;
+                }
+            }
+            this->statsUnclock(STATS_ACTION, this->ticsStartTime);
+            return;
+        }
 
-        if (this->allowDoomInput && !this->runDoomAsync) {
+        if (this->allowDoomInput) {
             for (int i = 0; i < DELTA_BUTTON_COUNT; ++i) {
                 this->input->BT_MAX_VALUE[i] = tics * this->_input->BT_MAX_VALUE[i];
             }
         }
 
-        int ticsMade = 0;
+        this->ticsPending = true;
+        this->ticsStartGameTic = this->gameState->GAME_TIC;
+        this->ticsStartMapTic = this->gameState->MAP_TIC;
+        if (!this->isTicPossible()) return;
+
+        if (tics == 1) {
+            if (update) this->sendDoomWork(MSG_CODE_TIC_AND_UPDATE);
+            else this->sendDoomWork(MSG_CODE_TIC);
+            return;
+        }
+
+        // Engine doesn't know about episode timeout, so the number of tics is limited here
+        unsigned int ticsLimit = tics;
+        if (this->mapTimeout > 0) ticsLimit = std::min(tics, this->mapTimeout + this->mapStartTime - this->gameState->MAP_TIC);
 
-        for (unsigned int i = 0; i < tics; ++i) {
-            if (i == tics - 1) this->tic(update);
-            else this->tic(false);
+        // State is always updated if the episode ends before making all tics (engine does it on its own)
+        if (update || ticsLimit < tics) this->sendDoomWork(MSG_CODE_TICS_AND_UPDATE, ticsLimit);
+        else this->sendDoomWork(MSG_CODE_TICS, ticsLimit);
+    }
 
-            ++ticsMade;
+    bool DoomController::isTicsDone() {
+        // Notifications are consumed before checking, so FIFO becomes readable again only after the next message
+        this->drainNotificationFifo();
+        if (!this->ticsPending) return true;
+        return this->isDoomWorkDone();
+    }
 
-            if (!this->isTicPossible() && i != tics - 1) {
-                this->MQDoom->send(MSG_CODE_UPDATE);
-                this->waitForDoomWork();
-                break;
-            }
+    void DoomController::finishTics() {
+
+        if (!this->ticsPending) return;
+
+        int ticsMade = 1;
+        if (this->doomWorking) {
+            this->waitForDoomWork();
+            ticsMade = std::max(static_cast<int>(this->gameState->GAME_TIC - this->ticsStartGameTic), 1);
+            this->mapLastTic = this->ticsStartMapTic + ticsMade;
         }
+        this->ticsPending = false;
+        this->drainNotificationFifo();
+        this->statsUnclock(STATS_ACTION, this->ticsStartTime);
 
-        if (this->allowDoomInput && !this->runDoomAsync) {
+        if (this->allowDoomInput) {
             for (int i = BINARY_BUTTON_COUNT; i < BUTTON_COUNT; ++i) {
                 this->input->BT_MAX_VALUE[i - BINARY_BUTTON_COUNT] = this->_input->BT_MAX_VALUE[i -
                                                                                                 BINARY_BUTTON_COUNT];
@@ -315,7 +423,8 @@ namespace vizdoom {
     }
 
     void DoomController::restartMap(std::string demoPath) {
-        this->setMap(this->map, demoPath);
+        if (this->isFastResetPossible(demoPath)) this->fastResetMap();
+        else this->setMap(this->map, demoPath);
     }
 
     void DoomController::respawnPlayer() {
@@ -329,14 +438,14 @@ namespace vizdoom {
                 do {
                     this->sendCommand(std::string("+use"));
 
-                    this->MQDoom->send(MSG_CODE_TIC);
+                    this->sendDoomWork(MSG_CODE_TIC);
                     this->waitForDoomWork();
 
                     if(!isTicPossible()) return;
                 } while (this->gameState->PLAYER_DEAD);
 
                 this->sendCommand(std::string("-use"));
-                this->MQDoom->send(MSG_CODE_UPDATE);
+                this->sendDoomWork(MSG_CODE_UPDATE);
                 this->waitForDoomWork();
 
                 this->input->BT_AVAILABLE[USE] = useAvailable;
@@ -359,6 +468,109 @@ namespace vizdoom {
         this->customArgs.clear();
     }
 
+    std::string DoomController::getLaunchKey() {
+        if (this->doomRunning) return this->launchKey;
+
+        std::vector<std::string> key = {
+            this->exePath, this->iwadPath, this->filePath, this->configPath,
+            b::lexical_cast<std::string>(this->screenWidth), b::lexical_cast<std::string>(this->screenHeight),
+            b::lexical_cast<std::string>(this->screenFormat), b::lexical_cast<std::string>(this->screenBufferEnabled),
+            b::lexical_cast<std::string>(this->observationWidth), b::lexical_cast<std::string>(this->observationHeight),
+            b::lexical_cast<std::string>(this->observationGrayscale),
+            b::lexical_cast<std::string>(this->observationNearest),
+            b::lexical_cast<std::string>(this->observationFloat),
+            b::lexical_cast<std::string>(this->windowHidden), b::lexical_cast<std::string>(this->noXServer),
+            b::lexical_cast<std::string>(this->renderAll), b::lexical_cast<std::string>(this->noConsole),
+            b::lexical_cast<std::string>(this->noSound), b::lexical_cast<std::string>(this->allowDoomInput),
+            b::lexical_cast<std::string>(this->runDoomAsync), b::lexical_cast<std::string>(this->smSync),
+            b::lexical_cast<std::string>(this->actionNotification), b::lexical_cast<std::string>(this->ticrate),
+            b::lexical_cast<std::string>(this->sharedResources)
+        };
+        key.insert(key.end(), this->customArgs.begin(), this->customArgs.end());
+
+        return bal::join(key, "\n");
+    }
+
+    void DoomController::copySettings(DoomController const &other) {
+        if (!this->doomRunning) {
+            this->exePath = other.exePath;
+            this->iwadPath = other.iwadPath;
+            this->filePath = other.filePath;
+            this->configPath = other.configPath;
+            this->screenWidth = other.screenWidth;
+            this->screenHeight = other.screenHeight;
+            this->screenChannels = other.screenChannels;
+            this->screenDepth = other.screenDepth;
+            this->screenFormat = other.screenFormat;
+            this->screenBufferEnabled = other.screenBufferEnabled;
+            this->observationWidth = other.observationWidth;
+            this->observationHeight = other.observationHeight;
+            this->observationGrayscale = other.observationGrayscale;
+            this->observationNearest = other.observationNearest;
+            this->observationFloat = other.observationFloat;
+            this->windowHidden = other.windowHidden;
+            this->noXServer = other.noXServer;
+            this->renderAll = other.renderAll;
+            this->noConsole = other.noConsole;
+            this->noSound = other.noSound;
+            this->allowDoomInput = other.allowDoomInput;
+            this->runDoomAsync = other.runDoomAsync;
+            this->smSync = other.smSync;
+            this->actionNotification = other.actionNotification;
+            this->forkServer = other.forkServer;
+            this->sharedResources = other.sharedResources;
+            this->ticrate = other.ticrate;
+            this->customArgs = other.customArgs;
+        }
+
+        this->map = other.map;
+        this->demoPath = other.demoPath;
+        this->skill = other.skill;
+        this->doomStaticSeed = other.doomStaticSeed;
+        this->doomSeed = other.doomSeed;
+        this->instanceSeed = other.instanceSeed;
+        this->instanceRng = other.instanceRng;
+        this->mapStartTime = other.mapStartTime;
+        this->mapTimeout = other.mapTimeout;
+        this->fastReset = other.fastReset;
+        this->resetSnapshot.clear();
+
+        this->observationMaxPool = other.observationMaxPool;
+        this->perfStats = other.perfStats;
+        this->depth = other.depth;
+        this->labels = other.labels;
+        this->automap = other.automap;
+        this->amMode = other.amMode;
+        this->amRotate = other.amRotate;
+        this->amTextures = other.amTextures;
+        this->objects = other.objects;
+        this->sectors = other.sectors;
+        this->objectsFilterRadius = other.objectsFilterRadius;
+        this->objectsFilterMaxCount = other.objectsFilterMaxCount;
+        this->objectsFilterNames = other.objectsFilterNames;
+        this->objectsFilterExcludeNames = other.objectsFilterExcludeNames;
+        this->hud = other.hud;
+        this->minHud = other.minHud;
+        this->weapon = other.weapon;
+        this->crosshair = other.crosshair;
+        this->decals = other.decals;
+        this->particles = other.particles;
+        this->sprites = other.sprites;
+        this->messages = other.messages;
+        this->corpses = other.corpses;
+        this->flashes = other.flashes;
+
+        std::memcpy(this->_input->BT_AVAILABLE, other._input->BT_AVAILABLE, sizeof(this->_input->BT_AVAILABLE));
+        std::memcpy(this->_input->BT_MAX_VALUE, other._input->BT_MAX_VALUE, sizeof(this->_input->BT_MAX_VALUE));
+
+        if (this->doomRunning) {
+            std::memcpy(this->input->BT_AVAILABLE, this->_input->BT_AVAILABLE, sizeof(this->input->BT_AVAILABLE));
+            std::memcpy(this->input->BT_MAX_VALUE, this->_input->BT_MAX_VALUE, sizeof(this->input->BT_MAX_VALUE));
+            this->sendSettings();
+            this->resetPerformanceStats();
+        }
+    }
+
     bool DoomController::isDoomRunning() { return this->doomRunning; }
 
     std::string DoomController::getMap() { return this->map; }
@@ -407,7 +619,7 @@ namespace vizdoom {
                     else this->sendCommand(std::string("-use"));
                 }
 
-                this->MQDoom->send(MSG_CODE_TIC);
+                this->sendDoomWork(MSG_CODE_TIC);
                 this->waitForDoomWork();
 
                 if (restartTics > 3 && !this->gameState->GAME_MULTIPLAYER) {
@@ -428,11 +640,20 @@ namespace vizdoom {
 
             this->sendCommand("viz_override_player 0");
 
-            this->MQDoom->send(MSG_CODE_UPDATE);
+            this->sendDoomWork(MSG_CODE_UPDATE);
             this->waitForDoomWork();
 
             this->mapLastTic = this->gameState->MAP_TIC;
             this->mapChanging = false;
+
+            // Cache the map after the start time, so next restarts can skip the reload
+            if (this->fastReset && !this->gameState->GAME_MULTIPLAYER && !this->demoPath.length()) {
+                size_t size = this->saveSnapshot();
+                this->resetSnapshot.assign(this->getSnapshotBuffer(), this->getSnapshotBuffer() + size);
+                this->resetSnapshotMap = this->map;
+                this->resetSnapshotStartTime = this->mapStartTime;
+                this->resetSnapshotSkill = this->skill;
+            }
         }
     }
 
@@ -443,7 +664,7 @@ namespace vizdoom {
 
             // Workaround for some problems
             this->sendCommand(std::string("map ") + this->map);
-            this->MQDoom->send(MSG_CODE_TIC);
+            this->sendDoomWork(MSG_CODE_TIC);
             this->waitForDoomWork();
 
             this->sendCommand(std::string("playdemo ") + prepareLmpFilePath(demoPath));
@@ -456,7 +677,7 @@ namespace vizdoom {
             do {
                 ++restartTics;
 
-                this->MQDoom->send(MSG_CODE_TIC);
+                this->sendDoomWork(MSG_CODE_TIC);
                 this->waitForDoomWork();
 
                 if (restartTics > 3) {
@@ -470,7 +691,7 @@ namespace vizdoom {
 
             this->sendCommand(std::string("viz_override_player ") + b::lexical_cast<std::string>(player));
 
-            this->MQDoom->send(MSG_CODE_UPDATE);
+            this->sendDoomWork(MSG_CODE_UPDATE);
             this->waitForDoomWork();
 
             this->mapLastTic = this->gameState->MAP_TIC;
@@ -490,7 +711,35 @@ namespace vizdoom {
             this->sendCommand(std::string("load ") + filePath);
 
             //this->MQDoom->send(MSG_CODE_LOAD);
-            this->MQDoom->send(MSG_CODE_UPDATE);
+            this->sendDoomWork(MSG_CODE_UPDATE);
+            this->waitForDoomWork();
+
+            this->mapLastTic = this->gameState->MAP_TIC;
+        }
+    }
+
+    size_t DoomController::saveSnapshot() {
+        if (this->doomRunning && !this->mapChanging) {
+            this->sendDoomWork(MSG_CODE_SAVE_SNAPSHOT);
+            this->waitForDoomWork();
+
+            this->SM->updateSnapshot();
+            return this->SM->getSnapshotHeader()->SNAPSHOT_SIZE;
+        }
+        return 0;
+    }
+
+    uint8_t *DoomController::getSnapshotBuffer() {
+        return this->SM->getSnapshotBuffer();
+    }
+
+    void DoomController::loadSnapshot(const uint8_t *snapshot, size_t size) {
+        if (this->doomRunning && !this->mapChanging) {
+            this->SM->reserveSnapshot(size);
+            std::memcpy(this->SM->getSnapshotBuffer(), snapshot, size);
+            this->SM->getSnapshotHeader()->SNAPSHOT_SIZE = size;
+
+            this->sendDoomWork(MSG_CODE_LOAD_SNAPSHOT);
             this->waitForDoomWork();
 
             this->mapLastTic = this->gameState->MAP_TIC;
@@ -574,6 +823,13 @@ namespace vizdoom {
 
     void DoomController::setMapTimeout(unsigned int tics) { this->mapTimeout = tics; }
 
+    bool DoomController::isFastResetEnabled() { return this->fastReset; }
+
+    void DoomController::setFastResetEnabled(bool set) {
+        this->fastReset = set;
+        if (!set) this->resetSnapshot.clear();
+    }
+
     bool DoomController::isMapFirstTic() {
         return this->doomRunning && this->gameState->MAP_TIC <= 1;
     }
@@ -606,6 +862,117 @@ namespace vizdoom {
         }
     }
 
+    /* Screen buffer */
+    bool DoomController::isScreenBufferEnabled() {
+        if (this->doomRunning) return this->gameState->SCREEN_BUFFER;
+        else return screenBufferEnabled;
+    }
+
+    void DoomController::setScreenBufferEnabled(bool screenBuffer) {
+        if (!this->doomRunning) this->screenBufferEnabled = screenBuffer;
+    }
+
+    /* Observation buffer */
+    bool DoomController::isObservationEnabled() {
+        return this->getObservationSize() > 0;
+    }
+
+    void DoomController::setObservationShape(unsigned int height, unsigned int width, bool grayscale, bool nearest,
+                                             bool floatValues) {
+        if (!this->doomRunning) {
+            this->observationWidth = width;
+            this->observationHeight = height;
+            this->observationGrayscale = grayscale;
+            this->observationNearest = nearest;
+            this->observationFloat = floatValues;
+        }
+    }
+
+    unsigned int DoomController::getObservationWidth() {
+        if (this->doomRunning) return this->gameState->OBSERVATION_WIDTH;
+        else return this->observationHeight ? this->observationWidth : 0;
+    }
+
+    unsigned int DoomController::getObservationHeight() {
+        if (this->doomRunning) return this->gameState->OBSERVATION_HEIGHT;
+        else return this->observationWidth ? this->observationHeight : 0;
+    }
+
+    unsigned int DoomController::getObservationChannels() {
+        if (this->doomRunning) return this->gameState->OBSERVATION_CHANNELS;
+        else return this->observationGrayscale ? 1 : this->screenChannels;
+    }
+
+    size_t DoomController::getObservationSize() {
+        if (this->doomRunning) return this->gameState->OBSERVATION_SIZE;
+        else return static_cast<size_t>(this->getObservationWidth()) * this->getObservationHeight()
+                    * this->getObservationChannels() * (this->observationFloat ? sizeof(float) : sizeof(uint8_t));
+    }
+
+    bool DoomController::isObservationFloat() {
+        if (this->doomRunning) return this->gameState->OBSERVATION_FLOAT;
+        else return this->observationFloat;
+    }
+
+    bool DoomController::isObservationMaxPoolEnabled() {
+        return this->observationMaxPool;
+    }
+
+    void DoomController::setObservationMaxPoolEnabled(bool maxPool) {
+        this->observationMaxPool = maxPool;
+        if (this->doomRunning) this->sendCommand(std::string("viz_obs_max_pool ") + (maxPool ? "1" : "0"));
+    }
+
+    /* Performance stats */
+    bool DoomController::isPerformanceStatsEnabled() {
+        return this->perfStats;
+    }
+
+    void DoomController::setPerformanceStatsEnabled(bool perfStats) {
+        this->perfStats = perfStats;
+        if (this->doomRunning) this->sendCommand(std::string("viz_perf_stats ") + (perfStats ? "1" : "0"));
+    }
+
+    std::vector<PerformanceStat> DoomController::getPerformanceStats() {
+        std::vector<PerformanceStat> stats;
+
+        if (this->doomRunning && this->perfStats) {
+            const char *names[SM_STATS_STAGE_COUNT] = {"tic", "render", "copy", "state", "info"};
+            for (int i = 0; i < SM_STATS_STAGE_COUNT; ++i) {
+                stats.push_back({names[i], this->gameState->STATS_COUNT[i] - this->engineStatsCountBase[i],
+                                 this->gameState->STATS_TOTAL[i] - this->engineStatsTotalBase[i],
+                                 this->gameState->STATS_LAST[i]});
+            }
+        }
+
+        stats.insert(stats.end(), this->stats, this->stats + STATS_STAGE_COUNT);
+        return stats;
+    }
+
+    void DoomController::resetPerformanceStats() {
+        const char *names[STATS_STAGE_COUNT] = {"action", "update_state", "get_state"};
+        for (int i = 0; i < STATS_STAGE_COUNT; ++i) this->stats[i] = {names[i], 0, 0, 0};
+
+        for (int i = 0; i < SM_STATS_STAGE_COUNT; ++i) {
+            this->engineStatsCountBase[i] = this->doomRunning ? this->gameState->STATS_COUNT[i] : 0;
+            this->engineStatsTotalBase[i] = this->doomRunning ? this->gameState->STATS_TOTAL[i] : 0;
+        }
+    }
+
+    DoomController::StatsTimePoint DoomController::statsClock() {
+        // Clock is not read at all if stats are disabled
+        if (!this->perfStats) return StatsTimePoint();
+        return bc::steady_clock::now();
+    }
+
+    void DoomController::statsUnclock(StatsStage stage, StatsTimePoint start) {
+        if (!this->perfStats || start == StatsTimePoint()) return;
+        double time = bc::duration<double, boost::milli>(bc::steady_clock::now() - start).count();
+        ++this->stats[stage].count;
+        this->stats[stage].total += time;
+        this->stats[stage].last = time;
+    }
+
     /* Depth buffer */
     bool DoomController::isDepthBufferEnabled() {
         if (this->doomRunning) return this->gameState->DEPTH_BUFFER;
@@ -615,7 +982,7 @@ namespace vizdoom {
     void DoomController::setDepthBufferEnabled(bool depthBuffer) {
         this->depth = depthBuffer;
         if (this->doomRunning) {
-            if (this->automap) this->sendCommand("viz_depth 1");
+            if (this->depth) this->sendCommand("viz_depth 1");
             else this->sendCommand("viz_depth 0");
         }
         this->updateSettings = true;
@@ -630,7 +997,7 @@ namespace vizdoom {
     void DoomController::setLabelsEnabled(bool labels) {
         this->labels = labels;
         if (this->doomRunning) {
-            if (this->automap) this->sendCommand("viz_labels 1");
+            if (this->labels) this->sendCommand("viz_labels 1");
             else this->sendCommand("viz_labels 0");
         }
     }
@@ -691,6 +1058,22 @@ namespace vizdoom {
         }
     }
 
+    void DoomController::setObjectsFilter(double radius, unsigned int maxCount, std::vector<std::string> const &names,
+                                          bool excludeNames) {
+        this->objectsFilterRadius = radius > 0 ? radius : 0;
+        this->objectsFilterMaxCount = maxCount;
+        this->objectsFilterNames = bal::join(names, ",");
+        this->objectsFilterExcludeNames = excludeNames;
+
+        if (this->doomRunning) {
+            this->sendCommand(std::string("viz_objects_radius ") + b::lexical_cast<std::string>(this->objectsFilterRadius));
+            this->sendCommand(std::string("viz_objects_max ") + b::lexical_cast<std::string>(this->objectsFilterMaxCount));
+            this->sendCommand(std::string("viz_objects_names \"") + this->objectsFilterNames + "\"");
+            if (this->objectsFilterExcludeNames) this->sendCommand("viz_objects_exclude 1");
+            else this->sendCommand("viz_objects_exclude 0");
+        }
+    }
+
     void DoomController::setScreenWidth(unsigned int width) {
         if (!this->doomRunning) this->screenWidth = width;
     }
@@ -875,6 +1258,13 @@ namespace vizdoom {
 
     uint8_t *const DoomController::getAutomapBuffer() { return this->automapBuffer; }
 
+    uint8_t *const DoomController::getObservationBuffer() { return this->observationBuffer; }
+
+    SMRegion *const DoomController::getSMRegion(unsigned int number) {
+        if (this->SM == nullptr) return nullptr;
+        return this->SM->getRegion(number);
+    }
+
     SMInputState *const DoomController::getInput() { return this->input; }
 
     SMGameState *const DoomController::getGameState() { return this->gameState; }
@@ -951,6 +1341,26 @@ namespace vizdoom {
 
     void DoomController::setRunDoomAsync(bool set) { if (!this->doomRunning) this->runDoomAsync = set; }
 
+    bool DoomController::isSMSyncEnabled() { return this->smSync; }
+
+    void DoomController::setSMSyncEnabled(bool set) { if (!this->doomRunning) this->smSync = set; }
+
+    bool DoomController::isActionNotificationEnabled() { return this->actionNotification; }
+
+    void DoomController::setActionNotificationEnabled(bool set) {
+        if (!this->doomRunning) this->actionNotification = set;
+    }
+
+    int DoomController::getActionNotificationFd() { return this->notificationFd; }
+
+    bool DoomController::isForkServerEnabled() { return this->forkServer; }
+
+    void DoomController::setForkServerEnabled(bool set) { if (!this->doomRunning) this->forkServer = set; }
+
+    bool DoomController::isSharedResourcesEnabled() { return this->sharedResources; }
+
+    void DoomController::setSharedResourcesEnabled(bool set) { if (!this->doomRunning) this->sharedResources = set; }
+
 
     /* GameVariables getters */
     /*----------------------------------------------------------------------------------------------------------------*/
@@ -1113,9 +1523,13 @@ namespace vizdoom {
     /*----------------------------------------------------------------------------------------------------------------*/
 
     bool DoomController::receiveMQMsg() {
+        Message msg = this->MQController->receive();
+        return this->handleMQMsg(msg);
+    }
+
+    bool DoomController::handleMQMsg(Message &msg) {
         bool done = false;
 
-        Message msg = this->MQController->receive();
         switch (msg.code) {
             case MSG_CODE_DOOM_DONE :
                 done = true;
@@ -1150,6 +1564,25 @@ namespace vizdoom {
         return done;
     }
 
+    bool DoomController::isSMSyncActive() {
+        // Engine's start is always signaled through message queue
+        return this->smSync && !this->runDoomAsync && this->SM != nullptr;
+    }
+
+    void DoomController::sendDoomWork(uint8_t code, unsigned int tics) {
+        this->doomWorking = true;
+
+        if (this->isSMSyncActive()) {
+            this->input->SYNC_REQUEST_CODE = code;
+            this->input->SYNC_REQUEST_TICS = tics;
+            this->input->SYNC_REQUEST_SEQ.store(++this->smSyncSeq, std::memory_order_release);
+            smSyncWake(&this->input->SYNC_REQUEST_SEQ);
+        }
+        else if (code == MSG_CODE_TICS || code == MSG_CODE_TICS_AND_UPDATE)
+            this->MQDoom->send(code, b::lexical_cast<std::string>(tics).c_str());
+        else this->MQDoom->send(code);
+    }
+
     void DoomController::waitForDoomStart() {
         this->doomWorking = true;
         this->doomRunning = this->receiveMQMsg();
@@ -1158,24 +1591,111 @@ namespace vizdoom {
 
     void DoomController::waitForDoomWork() {
         if (doomRunning) {
-            this->doomWorking = true;
-
-            bool done;
-            do {
-                done = this->receiveMQMsg();
-            } while (!done);
+            // Work might have been already reported as done to isDoomWorkDone
+            if (!this->doomWorking) return;
+
+            if (this->isSMSyncActive()) {
+                uint32_t doneSeq;
+                while ((doneSeq = this->input->SYNC_DONE_SEQ.load(std::memory_order_acquire)) != this->smSyncSeq) {
+                    smSyncWait(&this->input->SYNC_DONE_SEQ, doneSeq, SM_SYNC_TIMEOUT);
+
+                    // Errors, signals and process exit are still reported through message queue
+                    Message msg;
+                    if (this->input->SYNC_DONE_SEQ.load(std::memory_order_acquire) != this->smSyncSeq
+                        && this->MQController->tryReceive(&msg) && this->handleMQMsg(msg)) break;
+                }
+            }
+            else {
+                bool done;
+                do {
+                    done = this->receiveMQMsg();
+                } while (!done);
+            }
 
             this->doomWorking = false;
         } else throw ViZDoomIsNotRunningException();
     }
 
+    bool DoomController::isDoomWorkDone() {
+        if (!this->doomWorking) return true;
+
+        if (this->isSMSyncActive() && this->input->SYNC_DONE_SEQ.load(std::memory_order_acquire) == this->smSyncSeq) {
+            this->doomWorking = false;
+            return true;
+        }
+
+        Message msg;
+        while (this->MQController->tryReceive(&msg)) {
+            if (this->handleMQMsg(msg)) {
+                this->doomWorking = false;
+                return true;
+            }
+        }
+
+        return false;
+    }
+
+    void DoomController::openNotificationFifo() {
+        #if defined(OS_LINUX) || defined(OS_OSX)
+            this->notificationFifoPath = (bfs::temp_directory_path() / (NOTIFY_FIFO_NAME_BASE + this->instanceId)).string();
+
+            if (mkfifo(this->notificationFifoPath.c_str(), 0600) != 0)
+                throw ViZDoomErrorException("Failed to create notification FIFO: " + this->notificationFifoPath);
+
+            // Read end is opened first and in non-blocking mode, so it doesn't wait for Doom to open write end
+            this->notificationFd = open(this->notificationFifoPath.c_str(), O_RDONLY | O_NONBLOCK);
+            if (this->notificationFd < 0) {
+                unlink(this->notificationFifoPath.c_str());
+                throw ViZDoomErrorException("Failed to open notification FIFO: " + this->notificationFifoPath);
+            }
+        #endif
+    }
+
+    void DoomController::closeNotificationFifo() {
+        #if defined(OS_LINUX) || defined(OS_OSX)
+            if (this->notificationFd >= 0) {
+                ::close(this->notificationFd);
+                unlink(this->notificationFifoPath.c_str());
+                this->notificationFd = -1;
+            }
+        #endif
+    }
+
+    void DoomController::drainNotificationFifo() {
+        #if defined(OS_LINUX) || defined(OS_OSX)
+            if (this->notificationFd >= 0) {
+                char buffer[64];
+                while (read(this->notificationFd, buffer, sizeof(buffer)) > 0);
+            }
+        #endif
+    }
+
     void DoomController::waitForDoomMapStartTime() {
         while (this->gameState->MAP_TIC < this->mapStartTime) {
-            this->MQDoom->send(MSG_CODE_TIC);
+            this->sendDoomWork(MSG_CODE_TIC);
             this->waitForDoomWork();
         }
     }
 
+    bool DoomController::isFastResetPossible(std::string demoPath) {
+        return this->fastReset && this->doomRunning && !this->mapChanging && !this->resetSnapshot.empty()
+               && !demoPath.length() && !this->gameState->GAME_MULTIPLAYER && !this->gameState->DEMO_RECORDING
+               && this->resetSnapshotMap == this->map && this->resetSnapshotStartTime == this->mapStartTime
+               && this->resetSnapshotSkill == this->skill;
+    }
+
+    void DoomController::fastResetMap() {
+        this->demoPath = "";
+        ++this->mapRestartCount;
+
+        this->resetButtons();
+        this->loadSnapshot(this->resetSnapshot.data(), this->resetSnapshot.size());
+
+        // Snapshot restores the RNGs too, new seed makes the episode differ from the start time on
+        this->doomSeed = this->getNextDoomSeed();
+        this->sendCommand(std::string("viz_reseed ") + b::lexical_cast<std::string>(this->doomSeed));
+    }
+
     /* Init */
     /*----------------------------------------------------------------------------------------------------------------*/
 
@@ -1293,6 +1813,16 @@ namespace vizdoom {
             this->doomArgs.push_back("1");
         }
 
+        if (this->smSync) {
+            this->doomArgs.push_back("+viz_sm_sync");
+            this->doomArgs.push_back("1");
+        }
+
+        if (this->notificationFd >= 0) {
+            this->doomArgs.push_back("+viz_notify_fifo");
+            this->doomArgs.push_back(this->notificationFifoPath);
+        }
+
         if (this->allowDoomInput) {
             this->doomArgs.push_back("+viz_allow_input");
             this->doomArgs.push_back("1");
@@ -1352,6 +1882,24 @@ namespace vizdoom {
             this->doomArgs.push_back("1");
         }
 
+        if (this->objectsFilterRadius > 0) {
+            this->doomArgs.push_back("+viz_objects_radius");
+            this->doomArgs.push_back(b::lexical_cast<std::string>(this->objectsFilterRadius));
+        }
+
+        if (this->objectsFilterMaxCount > 0) {
+            this->doomArgs.push_back("+viz_objects_max");
+            this->doomArgs.push_back(b::lexical_cast<std::string>(this->objectsFilterMaxCount));
+        }
+
+        if (!this->objectsFilterNames.empty()) {
+            this->doomArgs.push_back("+viz_objects_names");
+            this->doomArgs.push_back(this->objectsFilterNames);
+
+            this->doomArgs.push_back("+viz_objects_exclude");
+            this->doomArgs.push_back(this->objectsFilterExcludeNames ? "1" : "0");
+        }
+
         // render mode
         this->doomArgs.push_back("+viz_render_mode");
         this->doomArgs.push_back(b::lexical_cast<std::string>(this->getRenderModeValue()));
@@ -1364,6 +1912,35 @@ namespace vizdoom {
         this->doomArgs.push_back("+viz_screen_format");
         this->doomArgs.push_back(b::lexical_cast<std::string>(this->screenFormat));
 
+        if (!this->screenBufferEnabled) {
+            this->doomArgs.push_back("+viz_screen");
+            this->doomArgs.push_back("0");
+        }
+
+        // observation buffer
+        if (this->observationWidth && this->observationHeight) {
+            this->doomArgs.push_back("+viz_obs_width");
+            this->doomArgs.push_back(b::lexical_cast<std::string>(this->observationWidth));
+            this->doomArgs.push_back("+viz_obs_height");
+            this->doomArgs.push_back(b::lexical_cast<std::string>(this->observationHeight));
+            this->doomArgs.push_back("+viz_obs_gray");
+            this->doomArgs.push_back(this->observationGrayscale ? "1" : "0");
+            this->doomArgs.push_back("+viz_obs_nearest");
+            this->doomArgs.push_back(this->observationNearest ? "1" : "0");
+            this->doomArgs.push_back("+viz_obs_float");
+            this->doomArgs.push_back(this->observationFloat ? "1" : "0");
+        }
+
+        if (this->observationMaxPool) {
+            this->doomArgs.push_back("+viz_obs_max_pool");
+            this->doomArgs.push_back("1");
+        }
+
+        if (this->perfStats) {
+            this->doomArgs.push_back("+viz_perf_stats");
+            this->doomArgs.push_back("1");
+        }
+
 
         if (this->windowHidden){
             this->doomArgs.push_back("+viz_window_hidden");
@@ -1394,6 +1971,11 @@ namespace vizdoom {
             this->doomArgs.push_back("1");
         }
 
+        if (this->sharedResources) {
+            this->doomArgs.push_back("+viz_shared_resources");
+            this->doomArgs.push_back("1");
+        }
+
         if (this->ticrate != DEFAULT_TICRATE) {
             this->doomArgs.push_back("-ticrate");
             this->doomArgs.push_back(b::lexical_cast<std::string>(this->ticrate));
@@ -1405,6 +1987,24 @@ namespace vizdoom {
         }
     }
 
+    void DoomController::sendSettings() {
+        // Settings that can be changed at runtime, take effect with the next tic or map restart (skill)
+        this->sendCommand(std::string("viz_depth ") + (this->depth ? "1" : "0"));
+        this->sendCommand(std::string("viz_labels ") + (this->labels ? "1" : "0"));
+        this->sendCommand(std::string("viz_automap ") + (this->automap ? "1" : "0"));
+        this->sendCommand("viz_automap_mode " + b::lexical_cast<std::string>(this->amMode));
+        this->sendCommand(std::string("viz_objects ") + (this->objects ? "1" : "0"));
+        this->sendCommand(std::string("viz_sectors ") + (this->sectors ? "1" : "0"));
+        this->sendCommand(std::string("viz_objects_radius ") + b::lexical_cast<std::string>(this->objectsFilterRadius));
+        this->sendCommand(std::string("viz_objects_max ") + b::lexical_cast<std::string>(this->objectsFilterMaxCount));
+        this->sendCommand(std::string("viz_objects_names \"") + this->objectsFilterNames + "\"");
+        this->sendCommand(std::string("viz_objects_exclude ") + (this->objectsFilterExcludeNames ? "1" : "0"));
+        this->sendCommand(std::string("viz_obs_max_pool ") + (this->observationMaxPool ? "1" : "0"));
+        this->sendCommand(std::string("viz_perf_stats ") + (this->perfStats ? "1" : "0"));
+        this->setRenderMode(this->getRenderModeValue());
+        this->sendCommand(std::string("skill set ") + b::lexical_cast<std::string>(this->skill - 1));
+    }
+
     void DoomController::launchDoom() {
         try {
             bpr::child doomProcess = bpr::execute(bpri::set_args(this->doomArgs), bpri::inherit_env());
@@ -1418,4 +2018,51 @@ namespace vizdoom {
         }
         this->MQController->send(MSG_CODE_DOOM_PROCESS_EXIT);
     }
+
+    bool DoomController::isForkServerUsed() {
+        // Engine can be forked only without a window, sound, timer signals (async mode) and network connections
+        #ifdef OS_LINUX
+            if (!this->forkServer || this->runDoomAsync || !this->windowHidden || !this->noXServer || !this->noSound)
+                return false;
+
+            for (auto const &arg : this->customArgs) {
+                if (arg == "-host" || arg == "-join") return false;
+            }
+            return true;
+        #else
+            return false;
+        #endif
+    }
+
+    void DoomController::forkDoom() {
+        #ifdef OS_LINUX
+            // Server is shared by all instances with the same arguments except for the instance's own ones
+            std::vector<std::string> serverArgs;
+            std::vector<std::string> cvars;
+            std::string seed;
+
+            for (size_t i = 0; i < this->doomArgs.size(); ++i) {
+                std::string const &arg = this->doomArgs[i];
+                if ((arg == "+viz_instance_id" || arg == "+viz_notify_fifo") && i + 1 < this->doomArgs.size())
+                    cvars.push_back(arg.substr(1) + " " + this->doomArgs[++i]);
+                else if (arg == "-rngseed" && i + 1 < this->doomArgs.size()) seed = this->doomArgs[++i];
+                else serverArgs.push_back(arg);
+            }
+
+            this->doomProcessPid = ForkServer::get(serverArgs, this->instanceId)->fork(cvars, seed);
+        #endif
+    }
+
+    void DoomController::watchForkedDoom() {
+        #ifdef OS_LINUX
+            // Forked engine is not a child of this process, so it can't be waited for
+            try {
+                while (0 == kill(this->doomProcessPid, 0)) b::this_thread::sleep_for(bc::milliseconds(50));
+            }
+            catch (b::thread_interrupted &) {
+                return;
+            }
+            this->MQController->send(MSG_CODE_DOOM_PROCESS_EXIT);
+        #endif
+    }
 }
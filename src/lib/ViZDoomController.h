@@ -33,6 +33,7 @@
 #include "boost/process.hpp"
 
 #include <boost/asio.hpp>
+#include <boost/chrono.hpp>
 #include <boost/random.hpp>
 #include <boost/thread.hpp>
 #include <string>
@@ -53,22 +54,36 @@ namespace vizdoom {
 
 /* Shared memory's settings */
 #define SM_NAME_BASE        "ViZDoomSM"
+#define SM_SNAPSHOT_NAME_BASE "ViZDoomSMSnapshot"
+
+/* Action notification FIFO's settings */
+#define NOTIFY_FIFO_NAME_BASE "ViZDoomFifo"
 
 /* Message queues' settings */
 #define MQ_CTR_NAME_BASE    "ViZDoomMQCtr"
 #define MQ_DOOM_NAME_BASE   "ViZDoomMQDoom"
+#define MQ_FORK_REQ_NAME_BASE "ViZDoomMQForkReq"
+#define MQ_FORK_REP_NAME_BASE "ViZDoomMQForkRep"
 
 /* Messages' codes */
 #define MSG_CODE_DOOM_DONE              11
 #define MSG_CODE_DOOM_CLOSE             12
 #define MSG_CODE_DOOM_ERROR             13
 #define MSG_CODE_DOOM_PROCESS_EXIT      14
+#define MSG_CODE_DOOM_FORKED            15
+
+#define MSG_CODE_FORK_CVAR              17
+#define MSG_CODE_FORK                   18
 
 #define MSG_CODE_TIC                    21
 #define MSG_CODE_UPDATE                 22
 #define MSG_CODE_TIC_AND_UPDATE         23
 #define MSG_CODE_COMMAND                24
 #define MSG_CODE_CLOSE                  25
+#define MSG_CODE_TICS                   27
+#define MSG_CODE_TICS_AND_UPDATE        28
+#define MSG_CODE_SAVE_SNAPSHOT          29
+#define MSG_CODE_LOAD_SNAPSHOT          20
 
 #define MSG_CODE_SIG                    30
 #define MSG_CODE_SIGINT                 30 + SIGINT
@@ -103,6 +118,9 @@ namespace vizdoom {
         bool isTicPossible();
         void tic(bool update = true);
         void tics(unsigned int tics, bool update = true);
+        void startTics(unsigned int tics, bool update = true);
+        bool isTicsDone();
+        void finishTics();
         void restartMap(std::string demoPath = "");
         void respawnPlayer();
         bool isDoomRunning();
@@ -125,6 +143,10 @@ namespace vizdoom {
         void saveGame(std::string filePath);
         void loadGame(std::string filePath);
 
+        size_t saveSnapshot();
+        uint8_t *getSnapshotBuffer();
+        void loadSnapshot(const uint8_t *snapshot, size_t size);
+
 
         /* General game settings */
         /*------------------------------------------------------------------------------------------------------------*/
@@ -148,6 +170,8 @@ namespace vizdoom {
         void setMapStartTime(unsigned int tics);
         unsigned int getMapTimeout();
         void setMapTimeout(unsigned int tics);
+        bool isFastResetEnabled();
+        void setFastResetEnabled(bool set);
         bool isMapLastTic();
         bool isMapFirstTic();
         bool isMapEnded();
@@ -159,6 +183,10 @@ namespace vizdoom {
         void addCustomArg(std::string arg);
         void clearCustomArgs();
 
+        /* Engines reused by DoomGamePool */
+        std::string getLaunchKey();
+        void copySettings(DoomController const &other);
+
 
         /* Rendering getters and setters */
         /*------------------------------------------------------------------------------------------------------------*/
@@ -190,6 +218,21 @@ namespace vizdoom {
         size_t getScreenPitch();
         size_t getScreenSize();
 
+        /* Screen buffer */
+        bool isScreenBufferEnabled();
+        void setScreenBufferEnabled(bool screenBuffer);
+
+        /* Observation buffer */
+        bool isObservationEnabled();
+        void setObservationShape(unsigned int height, unsigned int width, bool grayscale, bool nearest, bool floatValues);
+        unsigned int getObservationWidth();
+        unsigned int getObservationHeight();
+        unsigned int getObservationChannels();
+        size_t getObservationSize();
+        bool isObservationFloat();
+        bool isObservationMaxPoolEnabled();
+        void setObservationMaxPoolEnabled(bool maxPool);
+
         /* Depth buffer */
         bool isDepthBufferEnabled();
         void setDepthBufferEnabled(bool depthBuffer);
@@ -210,12 +253,31 @@ namespace vizdoom {
         void setObjectsEnabled(bool objects);
         bool isSectorsEnabled();
         void setSectorsEnabled(bool sectors);
+        void setObjectsFilter(double radius, unsigned int maxCount, std::vector<std::string> const &names, bool excludeNames);
 
         /* Buffers in SM */
         uint8_t *const getScreenBuffer();
         uint8_t *const getDepthBuffer();
         uint8_t *const getLabelsBuffer();
         uint8_t *const getAutomapBuffer();
+        uint8_t *const getObservationBuffer();
+        SMRegion *const getSMRegion(unsigned int number);
+
+        /* Performance stats */
+        enum StatsStage {
+            STATS_ACTION,       // from sending the action to the engine until it is done
+            STATS_UPDATE_STATE, // copying of the state in DoomGame
+            STATS_GET_STATE,    // conversion of the state by wrappers
+            STATS_STAGE_COUNT
+        };
+        typedef boost::chrono::steady_clock::time_point StatsTimePoint;
+
+        bool isPerformanceStatsEnabled();
+        void setPerformanceStatsEnabled(bool perfStats);
+        std::vector<PerformanceStat> getPerformanceStats();
+        void resetPerformanceStats();
+        StatsTimePoint statsClock();
+        void statsUnclock(StatsStage stage, StatsTimePoint start);
 
         /* Buttons getters and setters */
         /*------------------------------------------------------------------------------------------------------------*/
@@ -242,6 +304,15 @@ namespace vizdoom {
         void setAllowDoomInput(bool set);
         bool isRunDoomAsync();
         void setRunDoomAsync(bool set);
+        bool isSMSyncEnabled();
+        void setSMSyncEnabled(bool set);
+        bool isActionNotificationEnabled();
+        void setActionNotificationEnabled(bool set);
+        int getActionNotificationFd();
+        bool isForkServerEnabled();
+        void setForkServerEnabled(bool set);
+        bool isSharedResourcesEnabled();
+        void setSharedResourcesEnabled(bool set);
 
 
         /* GameState getters */
@@ -273,12 +344,35 @@ namespace vizdoom {
         bool doomRunning;
         bool doomWorking;
 
+        bool ticsPending;
+        unsigned int ticsStartGameTic;
+        unsigned int ticsStartMapTic;
+        StatsTimePoint ticsStartTime;
+
+        /* Performance stats, engine counters are read from SM relative to their values at the last reset */
+        PerformanceStat stats[STATS_STAGE_COUNT];
+        unsigned int engineStatsCountBase[SM_STATS_STAGE_COUNT];
+        double engineStatsTotalBase[SM_STATS_STAGE_COUNT];
+
         bool receiveMQMsg();
+        bool handleMQMsg(Message &msg);
+        bool isSMSyncActive();
+        void sendDoomWork(uint8_t code, unsigned int tics = 1);
         void waitForDoomStart();
         void waitForDoomWork();
+        bool isDoomWorkDone();
         void waitForDoomMapStartTime();
+        bool isFastResetPossible(std::string demoPath);
+        void fastResetMap();
         void createDoomArgs();
         void launchDoom();
+        bool isForkServerUsed();
+        void forkDoom();
+        void watchForkedDoom();
+        void sendSettings();
+
+        // Settings that can be only passed at launch, engines with equal keys are interchangeable
+        std::string launchKey;
 
         /* Seed */
         /*------------------------------------------------------------------------------------------------------------*/
@@ -337,6 +431,7 @@ namespace vizdoom {
         uint8_t *depthBuffer;
         uint8_t *automapBuffer;
         uint8_t *labelsBuffer;
+        uint8_t *observationBuffer;
 
 
         /* Settings */
@@ -345,12 +440,22 @@ namespace vizdoom {
         unsigned int screenWidth, screenHeight, screenChannels, screenDepth;
         size_t screenPitch, screenSize;
         ScreenFormat screenFormat;
+        bool screenBufferEnabled;
+        unsigned int observationWidth, observationHeight;
+        bool observationGrayscale, observationNearest, observationFloat;
+        bool observationMaxPool;
+        bool perfStats;
         bool depth;
         bool automap;
         bool labels;
         bool objects;
         bool sectors;
 
+        double objectsFilterRadius;
+        unsigned int objectsFilterMaxCount;
+        std::string objectsFilterNames;
+        bool objectsFilterExcludeNames;
+
         bool hud, minHud, weapon, crosshair, decals, particles, sprites, messages, corpses, flashes, renderAll;
         AutomapMode amMode;
         bool amRotate, amTextures;
@@ -376,6 +481,18 @@ namespace vizdoom {
 
         bool allowDoomInput;
         bool runDoomAsync;
+        bool smSync;
+        uint32_t smSyncSeq;
+
+        bool actionNotification;
+        bool forkServer;
+        bool sharedResources;
+        int notificationFd;
+        std::string notificationFifoPath;
+
+        void openNotificationFifo();
+        void closeNotificationFifo();
+        void drainNotificationFifo();
 
         unsigned int ticrate;
         unsigned int mapStartTime;
@@ -384,6 +501,13 @@ namespace vizdoom {
         bool mapChanging;
         unsigned int mapLastTic;
 
+        // Snapshot of the map after the start time used by the fast reset
+        bool fastReset;
+        std::vector<uint8_t> resetSnapshot;
+        std::string resetSnapshotMap;
+        unsigned int resetSnapshotStartTime;
+        int resetSnapshotSkill;
+
         std::vector<std::string> customArgs;
         std::vector<std::string> doomArgs;
 
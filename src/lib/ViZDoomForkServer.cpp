@@ -0,0 +1,141 @@
+/*
+ Copyright (C) 2016 by Wojciech Jaśkowski, Michał Kempka, Grzegorz Runc, Jakub Toczek, Marek Wydmuch
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ THE SOFTWARE.
+*/
+
+#include "ViZDoomForkServer.h"
+#include "ViZDoomExceptions.h"
+
+#include <boost/lexical_cast.hpp>
+
+#ifdef OS_LINUX
+    #include <sys/wait.h>
+#endif
+
+namespace vizdoom {
+
+#ifdef OS_LINUX
+
+    namespace bc        = boost::chrono;
+
+    std::map<std::string, std::shared_ptr<ForkServer>> ForkServer::servers;
+    b::mutex ForkServer::serversMutex;
+
+    ForkServer::ForkServer(std::vector<std::string> const &args, std::string const &id) : pid(0) {
+        this->MQRequest = new MessageQueue(MQ_FORK_REQ_NAME_BASE + id);
+        this->MQReply = new MessageQueue(MQ_FORK_REP_NAME_BASE + id);
+
+        std::vector<std::string> serverArgs = args;
+        serverArgs.push_back("+viz_fork_server");
+        serverArgs.push_back(id);
+
+        try {
+            bpr::child server = bpr::execute(bpri::set_args(serverArgs), bpri::inherit_env());
+            this->pid = server.pid;
+
+            Message msg = this->receive();
+            if (msg.code == MSG_CODE_DOOM_ERROR) throw ViZDoomErrorException(std::string(msg.command));
+            if (msg.code != MSG_CODE_DOOM_DONE)
+                throw MessageQueueException("Unknown message code. Possible ViZDoom version mismatch.");
+        }
+        catch (...) {
+            this->close();
+            throw;
+        }
+    }
+
+    ForkServer::~ForkServer() {
+        this->close();
+    }
+
+    std::shared_ptr<ForkServer> ForkServer::get(std::vector<std::string> const &args, std::string const &id) {
+        b::lock_guard<b::mutex> lock(ForkServer::serversMutex);
+
+        std::string key;
+        for (auto const &arg : args) key += arg + "\n";
+
+        auto it = ForkServer::servers.find(key);
+        if (it != ForkServer::servers.end() && it->second->isRunning()) return it->second;
+
+        std::shared_ptr<ForkServer> server(new ForkServer(args, id));
+        ForkServer::servers[key] = server;
+        return server;
+    }
+
+    pid_t ForkServer::fork(std::vector<std::string> const &cvars, std::string const &seed) {
+        b::lock_guard<b::mutex> lock(this->mutex);
+
+        for (auto const &cvar : cvars) {
+            if (cvar.length() >= MQ_MAX_CMD_LEN)
+                throw ViZDoomErrorException("Fork server argument is too long: " + cvar);
+        }
+
+        for (auto const &cvar : cvars) this->MQRequest->send(MSG_CODE_FORK_CVAR, cvar.c_str());
+        this->MQRequest->send(MSG_CODE_FORK, seed.c_str());
+
+        Message msg = this->receive();
+        switch (msg.code) {
+            case MSG_CODE_DOOM_FORKED :
+                return b::lexical_cast<pid_t>(msg.command);
+
+            case MSG_CODE_DOOM_ERROR :
+                throw ViZDoomErrorException(std::string(msg.command));
+
+            default:
+                throw MessageQueueException("Unknown message code. Possible ViZDoom version mismatch.");
+        }
+    }
+
+    bool ForkServer::isRunning() {
+        // Server is a child of this process, so it has to be reaped after exit
+        return this->pid > 0 && waitpid(this->pid, nullptr, WNOHANG) == 0;
+    }
+
+    Message ForkServer::receive() {
+        Message msg;
+        while (!this->MQReply->tryReceive(&msg)) {
+            if (!this->isRunning()) throw ViZDoomUnexpectedExitException();
+            b::this_thread::sleep_for(bc::milliseconds(1));
+        }
+        return msg;
+    }
+
+    void ForkServer::close() {
+        if (this->isRunning()) {
+            this->MQRequest->send(MSG_CODE_CLOSE);
+            bpr::child server(this->pid);
+            bpr::terminate(server);
+            waitpid(this->pid, nullptr, 0);
+        }
+        this->pid = 0;
+
+        if (this->MQRequest) {
+            delete this->MQRequest;
+            this->MQRequest = nullptr;
+        }
+        if (this->MQReply) {
+            delete this->MQReply;
+            this->MQReply = nullptr;
+        }
+    }
+
+#endif
+
+}
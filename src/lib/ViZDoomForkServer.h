@@ -0,0 +1,73 @@
+/*
+ Copyright (C) 2016 by Wojciech Jaśkowski, Michał Kempka, Grzegorz Runc, Jakub Toczek, Marek Wydmuch
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ THE SOFTWARE.
+*/
+
+#ifndef __VIZDOOM_FORKSERVER_H__
+#define __VIZDOOM_FORKSERVER_H__
+
+#include "ViZDoomController.h"
+
+#include <map>
+#include <memory>
+#include <string>
+#include <vector>
+
+namespace vizdoom {
+
+#ifdef OS_LINUX
+
+    /*
+     * Engine launched once and initialized up to the point where it connects to the controller,
+     * then forked for every instance with the same launch arguments.
+     */
+    class ForkServer {
+
+    public:
+        ~ForkServer();
+
+        // Returns the running server for the arguments, launches a new one with the given id if there is none
+        static std::shared_ptr<ForkServer> get(std::vector<std::string> const &args, std::string const &id);
+
+        // Forks the engine, cvars ("name value") are set in the forked engine, empty seed means a random one
+        pid_t fork(std::vector<std::string> const &cvars, std::string const &seed);
+
+        bool isRunning();
+
+    private:
+        ForkServer(std::vector<std::string> const &args, std::string const &id);
+
+        Message receive();
+        void close();
+
+        pid_t pid;
+        MessageQueue *MQRequest;
+        MessageQueue *MQReply;
+        b::mutex mutex;
+
+        static std::map<std::string, std::shared_ptr<ForkServer>> servers;
+        static b::mutex serversMutex;
+    };
+
+#endif
+
+}
+
+#endif
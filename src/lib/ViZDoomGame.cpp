@@ -25,18 +25,39 @@
 #include "ViZDoomConfigLoader.h"
 #include "ViZDoomController.h"
 #include "ViZDoomExceptions.h"
+#include "ViZDoomGamePool.h"
 #include "ViZDoomPathHelpers.h"
 #include "ViZDoomUtilities.h"
+#include "ViZDoomVersion.h"
 
 #include <boost/algorithm/string.hpp>
 #include <boost/filesystem.hpp> // for reading the shared object/dll path
 
+#include <algorithm>
 #include <cstddef>
 #include <cstring>
+#include <utility>
 
 
 namespace vizdoom {
 
+    #define STATE_SNAPSHOT_MAGIC 0x5A44495A // "ZIDZ"
+    #define STATE_SNAPSHOT_FORMAT 1
+
+    // Library side of the episode stored in front of the engine's snapshot,
+    // identifies the state so it's never loaded into an engine that can't deserialize it
+    struct StateSnapshotHeader {
+        uint32_t magic;
+        uint32_t format;
+        uint32_t version;
+        char mapName[MAX_NAME_LENGTH];
+        uint64_t size;
+
+        double lastReward;
+        double lastMapReward;
+        double summaryReward;
+        unsigned int lastMapTic;
+    };
 
     DoomGame::DoomGame() {
         this->running = false;
@@ -47,11 +68,17 @@ namespace vizdoom {
         this->summaryReward = 0;
         this->lastMapTic = 0;
         this->nextStateNumber = 1;
+        this->mapGeometryVersion = 0;
         this->mode = PLAYER;
+        this->copyBuffers = true;
+        this->copyInfo = true;
+        this->actionPending = false;
+        this->actionUpdateState = true;
 
         this->state = nullptr;
 
         this->doomController = new DoomController();
+        this->pool = nullptr;
     }
 
     DoomGame::~DoomGame() {
@@ -72,7 +99,22 @@ namespace vizdoom {
             this->doomController->setRunDoomAsync(this->mode == ASYNC_PLAYER || this->mode == ASYNC_SPECTATOR);
 
             try {
-                this->running = this->doomController->init();
+                DoomController *pooled = this->pool ? this->pool->acquire(this->doomController->getLaunchKey()) : nullptr;
+                if (pooled) {
+                    // Engine from the pool takes over settings of this game and starts a new episode
+                    try {
+                        pooled->copySettings(*this->doomController);
+                        pooled->restartMap();
+                        delete this->doomController;
+                        this->doomController = pooled;
+                    }
+                    catch (ViZDoomUnexpectedExitException &) {
+                        // Engine exited while idle, a new one is launched instead
+                        delete pooled;
+                    }
+                }
+                if (!this->doomController->isDoomRunning()) this->running = this->doomController->init();
+                else this->running = true;
 
                 this->doomController->disableAllButtons();
                 for (unsigned int i = 0; i < this->availableButtons.size(); ++i) {
@@ -81,6 +123,8 @@ namespace vizdoom {
 
                 this->lastMapTic = 0;
                 this->nextStateNumber = 1;
+                this->mapSectors.clear();
+                this->mapGeometryVersion = 0;
 
                 this->updateState();
 
@@ -98,7 +142,12 @@ namespace vizdoom {
     void DoomGame::close() {
         if (this->isRunning()) {
             try {
-                this->doomController->close();
+                DoomController *controller = this->pool ? this->createController() : nullptr;
+                if (controller && this->pool->release(this->doomController)) this->doomController = controller;
+                else {
+                    delete controller;
+                    this->doomController->close();
+                }
             }
             catch (...) { throw; }
 
@@ -106,6 +155,7 @@ namespace vizdoom {
             this->nextAction.clear();
 
             this->state = nullptr;
+            this->actionPending = false;
 
             this->running = false;
         }
@@ -130,6 +180,7 @@ namespace vizdoom {
     void DoomGame::newEpisode(std::string filePath) {
 
         if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+        this->finishAdvanceAction();
 
         if (filePath.length()) this->doomController->restartMap(filePath);
         else this->doomController->restartMap();
@@ -140,6 +191,7 @@ namespace vizdoom {
     void DoomGame::replayEpisode(std::string filePath, unsigned int player) {
 
         if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+        this->finishAdvanceAction();
 
         //this->doomController->restartMap(); // Workaround for some problems
         this->doomController->playDemo(filePath, player);
@@ -149,6 +201,7 @@ namespace vizdoom {
     void DoomGame::setAction(std::vector<double> const &actions) {
 
         if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+        this->finishAdvanceAction();
 
         for (unsigned int i = 0; i < this->availableButtons.size(); ++i) {
             if (i < actions.size()) {
@@ -160,15 +213,51 @@ namespace vizdoom {
         }
     }
 
+    void DoomGame::setActionIndex(unsigned int index) {
+        if (index >= this->actionTable.size())
+            throw ViZDoomErrorException(std::string("Action index (") + std::to_string(index) +
+                                        ") is out of range of the action table.");
+        // Available buttons might have changed after the table was set
+        if (this->actionTable[index].size() != this->availableButtons.size())
+            throw ViZDoomErrorException(std::string("Actions of the action table have ") +
+                                        std::to_string(this->actionTable[index].size()) + " values, but there are " +
+                                        std::to_string(this->availableButtons.size()) + " available buttons.");
+        this->setAction(this->actionTable[index]);
+    }
+
+    double DoomGame::makeActionIndex(unsigned int index, unsigned int tics) {
+        this->setActionIndex(index);
+        this->advanceAction(tics);
+        return this->getLastReward();
+    }
+
     void DoomGame::advanceAction(unsigned int tics, bool updateState) {
+        this->startAdvanceAction(tics, updateState);
+        this->finishAdvanceAction();
+    }
+
+    void DoomGame::startAdvanceAction(unsigned int tics, bool updateState) {
         if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+        if (this->actionPending) this->finishAdvanceAction();
         // TODO maybe set lastReward to 0 if finished?
         if (this->doomController->isTicPossible()) {
-            try {
-                this->doomController->tics(tics, updateState);
-                if (updateState) this->updateState();
-            }
-            catch (...) { throw; }
+            this->doomController->startTics(tics, updateState);
+            this->actionPending = true;
+            this->actionUpdateState = updateState;
+        }
+    }
+
+    bool DoomGame::isAdvanceActionDone() {
+        if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+        return !this->actionPending || this->doomController->isTicsDone();
+    }
+
+    void DoomGame::finishAdvanceAction() {
+        if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+        if (this->actionPending) {
+            this->actionPending = false;
+            this->doomController->finishTics();
+            if (this->actionUpdateState) this->updateState();
         }
     }
 
@@ -178,6 +267,20 @@ namespace vizdoom {
         return this->getLastReward();
     }
 
+    void DoomGame::makeActionAsync(std::vector<double> const &actions, unsigned int tics) {
+        this->setAction(actions);
+        this->startAdvanceAction(tics);
+    }
+
+    bool DoomGame::poll() {
+        return this->isAdvanceActionDone();
+    }
+
+    double DoomGame::wait() {
+        this->finishAdvanceAction();
+        return this->getLastReward();
+    }
+
     void DoomGame::resetState() {
         this->lastMapTic = 0;
         this->nextStateNumber = 1;
@@ -190,6 +293,7 @@ namespace vizdoom {
     }
 
     void DoomGame::updateState() {
+        auto statsStart = this->doomController->statsClock();
 
         /* Update last action */
         if(this->doomController->isAllowDoomInput() || this->doomController->isReplaying()) {
@@ -241,10 +345,13 @@ namespace vizdoom {
             size_t graySize = static_cast<size_t>(width * height);
             size_t colorSize = graySize *channels;
 
-            uint8_t *buf = this->doomController->getScreenBuffer();
-            this->state->screenBuffer = std::make_shared<std::vector<uint8_t>>(buf, buf + colorSize);
+            uint8_t *buf = nullptr;
+            if (this->copyBuffers && this->doomController->isScreenBufferEnabled()) {
+                buf = this->doomController->getScreenBuffer();
+                this->state->screenBuffer = std::make_shared<std::vector<uint8_t>>(buf, buf + colorSize);
+            } else this->state->screenBuffer = nullptr;
 
-            if (this->doomController->isDepthBufferEnabled()) {
+            if (this->copyBuffers && this->doomController->isDepthBufferEnabled()) {
                 buf = this->doomController->getDepthBuffer();
                 this->state->depthBuffer = std::make_shared<std::vector<uint8_t>>(buf, buf + graySize);
             } else this->state->depthBuffer = nullptr;
@@ -252,25 +359,35 @@ namespace vizdoom {
             this->state->labels.clear();
             if (this->doomController->isLabelsEnabled()) {
                 buf = this->doomController->getLabelsBuffer();
-                this->state->labelsBuffer = std::make_shared<std::vector<uint8_t>>(buf, buf + graySize);
+                if (this->copyBuffers)
+                    this->state->labelsBuffer = std::make_shared<std::vector<uint8_t>>(buf, buf + graySize);
+                else this->state->labelsBuffer = nullptr;
 
                 /* Update labels */
-                size_t labelPartSize = offsetof(struct Label, objectName) - offsetof(struct Label, value);
-                for (unsigned int i = 0; i < smState->LABEL_COUNT; ++i) {
-                    this->state->labels.emplace_back();
-                    std::memcpy(&this->state->labels.back().value, &smState->LABEL[i].value, labelPartSize);
-                    this->state->labels.back().objectName = std::string(smState->LABEL[i].objectName);
+                if (this->copyInfo) {
+                    size_t labelPartSize = offsetof(struct Label, objectName) - offsetof(struct Label, value);
+                    for (unsigned int i = 0; i < smState->LABEL_COUNT; ++i) {
+                        this->state->labels.emplace_back();
+                        std::memcpy(&this->state->labels.back().value, &smState->LABEL[i].value, labelPartSize);
+                        this->state->labels.back().objectName = std::string(smState->LABEL[i].objectName);
+                    }
                 }
             } else this->state->labelsBuffer = nullptr;
 
-            if (this->doomController->isAutomapEnabled()) {
+            if (this->copyBuffers && this->doomController->isAutomapEnabled()) {
                 buf = this->doomController->getAutomapBuffer();
                 this->state->automapBuffer = std::make_shared<std::vector<uint8_t>>(buf, buf + colorSize);
             } else this->state->automapBuffer = nullptr;
 
+            if (this->copyBuffers && this->doomController->isObservationEnabled()) {
+                buf = this->doomController->getObservationBuffer();
+                this->state->observationBuffer = std::make_shared<std::vector<uint8_t>>(
+                        buf, buf + this->doomController->getObservationSize());
+            } else this->state->observationBuffer = nullptr;
+
             /* Update objects */
             this->state->objects.clear();
-            if (this->doomController->isObjectsEnabled()) {
+            if (this->copyInfo && this->doomController->isObjectsEnabled()) {
                 size_t objectPartSize = offsetof(struct Object, name) - offsetof(struct Object, id);
                 for (unsigned int i = 0; i < smState->OBJECT_COUNT; ++i) {
                     this->state->objects.emplace_back();
@@ -282,24 +399,37 @@ namespace vizdoom {
             /* Update sectors */
             static_assert(sizeof(Line) == sizeof(SMLine), "vizdoom::Line and vizdoom::SMLine have different sizes");
             this->state->sectors.clear();
-            if(this->doomController->isSectorsEnabled()){
-                for (unsigned int i = 0; i < smState->SECTOR_COUNT; ++i) {
-                    this->state->sectors.emplace_back();
-                    this->state->sectors.back().ceilingHeight = smState->SECTOR[i].ceilingHeight;
-                    this->state->sectors.back().floorHeight = smState->SECTOR[i].floorHeight;
-                    for (unsigned int j = 0; j < smState->SECTOR[i].lineCount; ++j) {
-                        unsigned int l = smState->SECTOR[i].lines[j];
-                        this->state->sectors.back().lines.emplace_back();
-                        std::memcpy(&this->state->sectors.back().lines.back().x1, &smState->LINE[l].position[0], sizeof(Line));
+            if(this->copyInfo && this->doomController->isSectorsEnabled()){
+                // Lines are copied from SM only when the engine published new geometry of the map
+                if (smState->MAP_GEOMETRY_VERSION != this->mapGeometryVersion) {
+                    this->mapSectors.resize(smState->SECTOR_COUNT);
+                    for (unsigned int i = 0; i < smState->SECTOR_COUNT; ++i) {
+                        auto lines = std::make_shared<std::vector<Line>>(smState->SECTOR[i].lineCount);
+                        for (unsigned int j = 0; j < smState->SECTOR[i].lineCount; ++j) {
+                            unsigned int l = smState->SECTOR[i].lines[j];
+                            std::memcpy(&(*lines)[j].x1, &smState->LINE[l].position[0], sizeof(Line));
+                        }
+                        this->mapSectors[i].lines = lines;
                     }
+                    this->mapGeometryVersion = smState->MAP_GEOMETRY_VERSION;
+                }
+
+                // Only pointers to the lines are copied, heights are updated for every state
+                this->state->sectors = this->mapSectors;
+                for (unsigned int i = 0; i < this->state->sectors.size(); ++i) {
+                    this->state->sectors[i].ceilingHeight = smState->SECTOR[i].ceilingHeight;
+                    this->state->sectors[i].floorHeight = smState->SECTOR[i].floorHeight;
                 }
             }
 
         } else this->state = nullptr;
+
+        this->doomController->statsUnclock(DoomController::STATS_UPDATE_STATE, statsStart);
     }
 
     GameStatePtr DoomGame::getState() {
         if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+        this->finishAdvanceAction();
         return this->state;
     }
 
@@ -332,16 +462,19 @@ namespace vizdoom {
 
     bool DoomGame::isEpisodeFinished() {
         if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+        this->finishAdvanceAction();
         return !this->doomController->isTicPossible();
     }
 
     bool DoomGame::isPlayerDead() {
         if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+        this->finishAdvanceAction();
         return this->doomController->isPlayerDead();
     }
 
     void DoomGame::respawnPlayer() {
         if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+        this->finishAdvanceAction();
 
         this->doomController->respawnPlayer();
         this->updateState();
@@ -373,6 +506,26 @@ namespace vizdoom {
         return this->availableButtons.size();
     }
 
+    std::vector<std::vector<double>> DoomGame::getActionTable() {
+        return this->actionTable;
+    }
+
+    void DoomGame::setActionTable(std::vector<std::vector<double>> const &actions) {
+        for (auto &action : actions) {
+            if (action.size() != actions[0].size())
+                throw ViZDoomErrorException("All actions of the action table have to have the same length.");
+        }
+        if (!actions.empty() && actions[0].size() != this->availableButtons.size())
+            throw ViZDoomErrorException(std::string("Actions of the action table have ") +
+                                        std::to_string(actions[0].size()) + " values, but there are " +
+                                        std::to_string(this->availableButtons.size()) + " available buttons.");
+        this->actionTable = actions;
+    }
+
+    size_t DoomGame::getActionTableSize() {
+        return this->actionTable.size();
+    }
+
     void DoomGame::setButtonMaxValue(Button button, double maxValue) {
         this->doomController->setButtonMaxValue(button, maxValue);
     }
@@ -438,6 +591,55 @@ namespace vizdoom {
 
     void DoomGame::setTicrate(unsigned int ticrate) { this->doomController->setTicrate(ticrate); }
 
+    bool DoomGame::isSharedMemorySyncEnabled() { return this->doomController->isSMSyncEnabled(); }
+
+    void DoomGame::setSharedMemorySyncEnabled(bool smSync) { this->doomController->setSMSyncEnabled(smSync); }
+
+    bool DoomGame::isActionNotificationEnabled() { return this->doomController->isActionNotificationEnabled(); }
+
+    void DoomGame::setActionNotificationEnabled(bool actionNotification) {
+        this->doomController->setActionNotificationEnabled(actionNotification);
+    }
+
+    int DoomGame::getActionNotificationFd() { return this->doomController->getActionNotificationFd(); }
+
+    bool DoomGame::isForkServerEnabled() { return this->doomController->isForkServerEnabled(); }
+
+    void DoomGame::setForkServerEnabled(bool forkServer) { this->doomController->setForkServerEnabled(forkServer); }
+
+    bool DoomGame::isSharedResourcesEnabled() { return this->doomController->isSharedResourcesEnabled(); }
+
+    void DoomGame::setSharedResourcesEnabled(bool sharedResources) {
+        this->doomController->setSharedResourcesEnabled(sharedResources);
+    }
+
+    bool DoomGame::isPerformanceStatsEnabled() { return this->doomController->isPerformanceStatsEnabled(); }
+
+    void DoomGame::setPerformanceStatsEnabled(bool perfStats) {
+        this->doomController->setPerformanceStatsEnabled(perfStats);
+    }
+
+    std::vector<PerformanceStat> DoomGame::getPerformanceStats(bool reset) {
+        if (this->actionPending) this->finishAdvanceAction();
+        auto stats = this->doomController->getPerformanceStats();
+        if (reset) this->doomController->resetPerformanceStats();
+        return stats;
+    }
+
+    void DoomGame::resetPerformanceStats() { this->doomController->resetPerformanceStats(); }
+
+    DoomGamePool *DoomGame::getPool() { return this->pool; }
+
+    void DoomGame::setPool(DoomGamePool *pool) { this->pool = pool; }
+
+    DoomController *DoomGame::createController() {
+        DoomController *controller = new DoomController();
+        controller->copySettings(*this->doomController);
+        controller->setAllowDoomInput(this->mode == SPECTATOR || this->mode == ASYNC_SPECTATOR);
+        controller->setRunDoomAsync(this->mode == ASYNC_PLAYER || this->mode == ASYNC_SPECTATOR);
+        return controller;
+    }
+
     double DoomGame::getGameVariable(GameVariable variable){
         if(!this->isRunning()) throw ViZDoomIsNotRunningException();
         return this->doomController->getGameVariable(variable);
@@ -470,6 +672,10 @@ namespace vizdoom {
 
     void DoomGame::setEpisodeTimeout(unsigned int tics) { this->doomController->setMapTimeout(tics); }
 
+    bool DoomGame::isFastResetEnabled() { return this->doomController->isFastResetEnabled(); }
+
+    void DoomGame::setFastResetEnabled(bool fastReset) { this->doomController->setFastResetEnabled(fastReset); }
+
     unsigned int DoomGame::getEpisodeTime() { return this->doomController->getMapTic(); }
 
     double DoomGame::getLivingReward() { return this->livingReward; }
@@ -550,6 +756,29 @@ namespace vizdoom {
 
     void DoomGame::setScreenFormat(ScreenFormat format) { this->doomController->setScreenFormat(format); }
 
+    bool DoomGame::isScreenBufferEnabled() { return this->doomController->isScreenBufferEnabled(); }
+
+    void DoomGame::setScreenBufferEnabled(bool screenBuffer) { this->doomController->setScreenBufferEnabled(screenBuffer); }
+
+    bool DoomGame::isObservationEnabled() { return this->doomController->isObservationEnabled(); }
+
+    void DoomGame::setObservationShape(unsigned int height, unsigned int width, bool grayscale, bool nearestResampling,
+                                       bool floatValues) {
+        this->doomController->setObservationShape(height, width, grayscale, nearestResampling, floatValues);
+    }
+
+    unsigned int DoomGame::getObservationWidth() { return this->doomController->getObservationWidth(); }
+
+    unsigned int DoomGame::getObservationHeight() { return this->doomController->getObservationHeight(); }
+
+    unsigned int DoomGame::getObservationChannels() { return this->doomController->getObservationChannels(); }
+
+    bool DoomGame::isObservationMaxPoolEnabled() { return this->doomController->isObservationMaxPoolEnabled(); }
+
+    void DoomGame::setObservationMaxPoolEnabled(bool maxPool) {
+        this->doomController->setObservationMaxPoolEnabled(maxPool);
+    }
+
     bool DoomGame::isDepthBufferEnabled() { return this->doomController->isDepthBufferEnabled(); }
 
     void DoomGame::setDepthBufferEnabled(bool depthBuffer) { this->doomController->setDepthBufferEnabled(depthBuffer); }
@@ -576,6 +805,47 @@ namespace vizdoom {
 
     void DoomGame::setSectorsInfoEnabled(bool sectorsInfo) { return this->doomController->setSectorsEnabled(sectorsInfo); }
 
+    void DoomGame::setObjectsFilter(double radius, unsigned int maxCount, std::vector<std::string> const &names,
+                                    bool excludeNames) {
+        this->doomController->setObjectsFilter(radius, maxCount, names, excludeNames);
+    }
+
+    std::vector<Object> DoomGame::getNearestObjects(std::string const &name, unsigned int count) {
+        if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+        this->finishAdvanceAction();
+
+        std::vector<Object> objects;
+        if (!this->doomController->isObjectsEnabled() || this->isEpisodeFinished()) return objects;
+
+        // Objects are searched in SM, so it works also if they are not copied to the state
+        SMGameState *smState = this->doomController->getGameState();
+        double playerX = smState->PLAYER_MOVEMENT[0];
+        double playerY = smState->PLAYER_MOVEMENT[1];
+
+        std::vector<std::pair<double, unsigned int>> distances;
+        for (unsigned int i = 0; i < smState->OBJECT_COUNT; ++i) {
+            if (name != smState->OBJECT[i].name) continue;
+            double dx = smState->OBJECT[i].position[0] - playerX;
+            double dy = smState->OBJECT[i].position[1] - playerY;
+            distances.push_back({dx * dx + dy * dy, i});
+        }
+
+        if (count < distances.size()) {
+            std::partial_sort(distances.begin(), distances.begin() + count, distances.end());
+            distances.resize(count);
+        }
+        else std::sort(distances.begin(), distances.end());
+
+        size_t objectPartSize = offsetof(struct Object, name) - offsetof(struct Object, id);
+        for (auto &distance : distances) {
+            objects.emplace_back();
+            std::memcpy(&objects.back().id, &smState->OBJECT[distance.second].id, objectPartSize);
+            objects.back().name = std::string(smState->OBJECT[distance.second].name);
+        }
+
+        return objects;
+    }
+
     void DoomGame::setRenderHud(bool hud) { this->doomController->setRenderHud(hud); }
 
     void DoomGame::setRenderMinimalHud(bool minimalHud) { this->doomController->setRenderMinimalHud(minimalHud); }
@@ -625,12 +895,68 @@ namespace vizdoom {
     }
 
     void DoomGame::saveState(std::string filePath){
+        if (this->actionPending) this->finishAdvanceAction();
         this->doomController->saveGame(filePath);
     }
 
     void DoomGame::loadState(std::string filePath){
+        if (this->actionPending) this->finishAdvanceAction();
         this->doomController->loadGame(filePath);
     }
+
+    std::vector<uint8_t> DoomGame::saveState() {
+        if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+        this->finishAdvanceAction();
+
+        size_t size = this->doomController->saveSnapshot();
+        if (!size) throw ViZDoomErrorException("Failed to save the state, the game is not in a level.");
+
+        StateSnapshotHeader header;
+        std::memset(&header, 0, sizeof(StateSnapshotHeader));
+        header.magic = STATE_SNAPSHOT_MAGIC;
+        header.format = STATE_SNAPSHOT_FORMAT;
+        header.version = VIZDOOM_LIB_VERSION;
+        std::strncpy(header.mapName, this->doomController->getGameState()->MAP_NAME, MAX_NAME_LENGTH - 1);
+        header.size = size;
+        header.lastReward = this->lastReward;
+        header.lastMapReward = this->lastMapReward;
+        header.summaryReward = this->summaryReward;
+        header.lastMapTic = this->lastMapTic;
+
+        std::vector<uint8_t> state(sizeof(StateSnapshotHeader) + size);
+        std::memcpy(state.data(), &header, sizeof(StateSnapshotHeader));
+        std::memcpy(state.data() + sizeof(StateSnapshotHeader), this->doomController->getSnapshotBuffer(), size);
+        return state;
+    }
+
+    void DoomGame::loadState(std::vector<uint8_t> const &state) {
+        if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+        if (state.size() <= sizeof(StateSnapshotHeader)) throw ViZDoomErrorException("Invalid state.");
+        this->finishAdvanceAction();
+
+        StateSnapshotHeader header;
+        std::memcpy(&header, state.data(), sizeof(StateSnapshotHeader));
+        header.mapName[MAX_NAME_LENGTH - 1] = '\0';
+
+        if (header.magic != STATE_SNAPSHOT_MAGIC || header.format != STATE_SNAPSHOT_FORMAT)
+            throw ViZDoomErrorException("Invalid state.");
+        if (header.version != VIZDOOM_LIB_VERSION)
+            throw ViZDoomErrorException("State was saved with a different version of ViZDoom.");
+        if (header.size != state.size() - sizeof(StateSnapshotHeader))
+            throw ViZDoomErrorException("Invalid state, its size does not match the size of the saved data.");
+        if (std::strcmp(header.mapName, this->doomController->getGameState()->MAP_NAME))
+            throw ViZDoomErrorException(std::string("State was saved on map ") + header.mapName
+                                        + ", the current map is " + this->doomController->getGameState()->MAP_NAME + ".");
+        this->doomController->loadSnapshot(state.data() + sizeof(StateSnapshotHeader),
+                                           state.size() - sizeof(StateSnapshotHeader));
+
+        // Rewards are restored, not counted again
+        this->lastMapReward = header.lastMapReward;
+        this->lastMapTic = header.lastMapTic;
+        this->updateState();
+        this->lastReward = header.lastReward;
+        this->summaryReward = header.summaryReward;
+    }
 }
 
 
@@ -0,0 +1,122 @@
+/*
+ Copyright (C) 2016 by Wojciech Jaśkowski, Michał Kempka, Grzegorz Runc, Jakub Toczek, Marek Wydmuch
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ THE SOFTWARE.
+*/
+
+
+#include "ViZDoomGamePool.h"
+
+#include "ViZDoomController.h"
+#include "ViZDoomExceptions.h"
+
+#include <string>
+
+
+namespace vizdoom {
+
+    DoomGamePool::DoomGamePool(unsigned int maxSize) {
+        this->maxSize = maxSize;
+    }
+
+    DoomGamePool::~DoomGamePool() {
+        this->clear();
+    }
+
+    unsigned int DoomGamePool::launch(DoomGame &game, unsigned int count) {
+        unsigned int launched = 0;
+
+        // Engines are started one by one, instance ids are generated from the clock
+        for (unsigned int i = 0; i < count; ++i) {
+            DoomController *controller = game.createController();
+            try {
+                controller->init();
+            }
+            catch (...) {
+                delete controller;
+                throw;
+            }
+
+            if (this->release(controller)) ++launched;
+            else {
+                delete controller;
+                break;
+            }
+        }
+
+        return launched;
+    }
+
+    void DoomGamePool::clear() {
+        std::lock_guard<std::mutex> lock(this->mutex);
+        for (auto controller : this->engines) delete controller;
+        this->engines.clear();
+    }
+
+    size_t DoomGamePool::getSize() {
+        std::lock_guard<std::mutex> lock(this->mutex);
+        return this->engines.size();
+    }
+
+    unsigned int DoomGamePool::getMaxSize() { return this->maxSize; }
+
+    void DoomGamePool::setMaxSize(unsigned int maxSize) {
+        std::lock_guard<std::mutex> lock(this->mutex);
+        this->maxSize = maxSize;
+        this->trim();
+    }
+
+    DoomController *DoomGamePool::acquire(std::string const &launchKey) {
+        std::lock_guard<std::mutex> lock(this->mutex);
+        for (auto it = this->engines.begin(); it != this->engines.end(); ++it) {
+            if ((*it)->getLaunchKey() == launchKey) {
+                DoomController *controller = *it;
+                this->engines.erase(it);
+                return controller;
+            }
+        }
+        return nullptr;
+    }
+
+    bool DoomGamePool::release(DoomController *controller) {
+        // Engines of multiplayer games are connected to other instances, so they can't be reused
+        if (!controller->isDoomRunning() || controller->isMultiplayerGame()) return false;
+
+        try {
+            controller->finishTics();
+        }
+        catch (ViZDoomUnexpectedExitException &) {
+            return false;
+        }
+
+        std::lock_guard<std::mutex> lock(this->mutex);
+        if (this->maxSize && this->engines.size() >= this->maxSize) return false;
+
+        this->engines.push_back(controller);
+        return true;
+    }
+
+    void DoomGamePool::trim() {
+        // The oldest engines are closed first
+        while (this->maxSize && this->engines.size() > this->maxSize) {
+            delete this->engines.front();
+            this->engines.erase(this->engines.begin());
+        }
+    }
+}
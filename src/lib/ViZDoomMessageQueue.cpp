@@ -89,4 +89,19 @@ namespace vizdoom {
         return msg;
     }
 
+    bool MessageQueue::tryReceive(Message *msg) {
+        unsigned int priority;
+        size_t size;
+
+        try {
+            return this->mq->try_receive(msg, sizeof(Message), size, priority);
+        }
+        catch(bip::interprocess_exception& ex) {
+            throw MessageQueueException(std::string("Failed to receive message: ") + std::string(ex.what()));
+        }
+        catch (...) {
+            throw MessageQueueException("Failed to receive message for unknown reason.");
+        }
+    }
+
 }
\ No newline at end of file
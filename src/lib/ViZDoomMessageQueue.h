@@ -54,9 +54,9 @@ namespace vizdoom {
 
         void send(uint8_t code, const char *command = nullptr);
         Message receive();
+        bool tryReceive(Message *msg);
 
         //void receive(Message  *msg);
-        //bool tryReceive(Message  *msg);
 
     private:
         bip::message_queue *mq;
@@ -23,9 +23,20 @@
 #include "ViZDoomSharedMemory.h"
 #include "ViZDoomExceptions.h"
 
+#include <boost/chrono.hpp>
+#include <boost/thread.hpp>
+
+#ifdef __linux__
+    #include <linux/futex.h>
+    #include <sys/syscall.h>
+    #include <unistd.h>
+    #include <climits>
+    #include <ctime>
+#endif
+
 namespace vizdoom {
 
-    SharedMemory::SharedMemory(std::string name) : name(name) {
+    SharedMemory::SharedMemory(std::string name, std::string snapshotName) : name(name), snapshotName(snapshotName) {
         this->init();
     }
 
@@ -36,6 +47,7 @@ namespace vizdoom {
     void SharedMemory::init() {
         try {
             this->sm = bip::shared_memory_object(bip::open_only, this->name.c_str(), bip::read_write);
+            this->smSnapshot = bip::shared_memory_object(bip::open_only, this->snapshotName.c_str(), bip::read_write);
         }
         catch(bip::interprocess_exception& ex) {
             throw SharedMemoryException(std::string("Failed to open shared memory: ") + std::string(ex.what()));
@@ -45,6 +57,7 @@ namespace vizdoom {
         }
 
         this->update();
+        this->mapSnapshot(0);
     }
 
     void SharedMemory::update() {
@@ -89,9 +102,9 @@ namespace vizdoom {
 
     void SharedMemory::mapRegion(SMRegion *regionPtr) {
         if (regionPtr->size) {
-            regionPtr->region = new bip::mapped_region(this->sm,
-                                                       regionPtr->writeable ? bip::read_write : bip::read_only,
-                                                       regionPtr->offset, regionPtr->size);
+            regionPtr->region = std::make_shared<bip::mapped_region>(this->sm,
+                                                                     regionPtr->writeable ? bip::read_write : bip::read_only,
+                                                                     regionPtr->offset, regionPtr->size);
 
             regionPtr->address = regionPtr->region->get_address();
         }
@@ -99,8 +112,8 @@ namespace vizdoom {
 
     void SharedMemory::deleteRegion(SMRegion *regionPtr) {
         if (regionPtr->region) {
-            delete regionPtr->region;
-            regionPtr->region = nullptr;
+            // Mapping stays alive as long as someone else (e.g. zero-copy view) holds a reference to it
+            regionPtr->region.reset();
             regionPtr->address = nullptr;
             regionPtr->size = 0;
         }
@@ -108,7 +121,9 @@ namespace vizdoom {
 
     void SharedMemory::close() {
         for (int i = 0; i < SM_REGION_COUNT; ++i) this->deleteRegion(&this->region[i]);
+        this->deleteRegion(&this->snapshotRegion);
         bip::shared_memory_object::remove(this->name.c_str());
+        bip::shared_memory_object::remove(this->snapshotName.c_str());
     }
 
     SMGameState *SharedMemory::getGameState() {
@@ -134,4 +149,84 @@ namespace vizdoom {
     uint8_t *SharedMemory::getAutomapBuffer() {
         return static_cast<uint8_t *>(this->region[5].address);
     }
+
+    uint8_t *SharedMemory::getObservationBuffer() {
+        return static_cast<uint8_t *>(this->region[6].address);
+    }
+
+    SMRegion *SharedMemory::getRegion(unsigned int number) {
+        if (number >= SM_REGION_COUNT) return nullptr;
+        return &this->region[number];
+    }
+
+    /* SM snapshot */
+    /*----------------------------------------------------------------------------------------------------------------*/
+
+    // Maps the whole snapshot shared memory after growing it (it never shrinks) to at least the given size
+    void SharedMemory::mapSnapshot(size_t size) {
+        try {
+            bip::offset_t smSize;
+            this->smSnapshot.get_size(smSize);
+            if (static_cast<size_t>(smSize) < size) this->smSnapshot.truncate(size);
+            else size = static_cast<size_t>(smSize);
+
+            SMRegion *regionPtr = &this->snapshotRegion;
+            this->deleteRegion(regionPtr);
+            regionPtr->offset = 0;
+            regionPtr->size = size;
+            regionPtr->writeable = true;
+            regionPtr->region = std::make_shared<bip::mapped_region>(this->smSnapshot, bip::read_write, 0, size);
+            regionPtr->address = regionPtr->region->get_address();
+        }
+        catch(bip::interprocess_exception& ex) {
+            throw SharedMemoryException(std::string("Failed to map snapshot shared memory: ") + std::string(ex.what()));
+        }
+        catch (...) {
+            throw SharedMemoryException("Failed to map snapshot shared memory for unknown reason.");
+        }
+    }
+
+    SMSnapshotHeader *SharedMemory::getSnapshotHeader() {
+        return static_cast<SMSnapshotHeader *>(this->snapshotRegion.address);
+    }
+
+    uint8_t *SharedMemory::getSnapshotBuffer() {
+        return static_cast<uint8_t *>(this->snapshotRegion.address) + sizeof(SMSnapshotHeader);
+    }
+
+    // Makes sure that the snapshot of the given size fits into the mapped memory
+    void SharedMemory::reserveSnapshot(size_t size) {
+        if (sizeof(SMSnapshotHeader) + size > this->snapshotRegion.size)
+            this->mapSnapshot(sizeof(SMSnapshotHeader) + size);
+    }
+
+    // Remaps the snapshot memory if the engine has grown it to fit the saved snapshot
+    void SharedMemory::updateSnapshot() {
+        this->reserveSnapshot(this->getSnapshotHeader()->SNAPSHOT_SIZE);
+    }
+
+    /* SM sync */
+    /*----------------------------------------------------------------------------------------------------------------*/
+
+    // Waits (spin, then sleep) until the value of seq is different from the given value or timeout (in microseconds) passes
+    void smSyncWait(std::atomic<uint32_t> *seq, uint32_t value, unsigned int timeout) {
+        for (int i = 0; i < SM_SYNC_SPIN_COUNT; ++i) {
+            if (seq->load(std::memory_order_acquire) != value) return;
+        }
+
+        #ifdef __linux__
+            struct timespec timeoutSpec;
+            timeoutSpec.tv_sec = timeout / 1000000;
+            timeoutSpec.tv_nsec = (timeout % 1000000) * 1000;
+            syscall(SYS_futex, reinterpret_cast<uint32_t *>(seq), FUTEX_WAIT, value, &timeoutSpec, nullptr, 0);
+        #else
+            b::this_thread::sleep_for(b::chrono::microseconds(SM_SYNC_SLEEP_TIME));
+        #endif
+    }
+
+    void smSyncWake(std::atomic<uint32_t> *seq) {
+        #ifdef __linux__
+            syscall(SYS_futex, reinterpret_cast<uint32_t *>(seq), FUTEX_WAKE, INT_MAX, nullptr, nullptr, 0);
+        #endif
+    }
 }
\ No newline at end of file
@@ -28,15 +28,24 @@
 
 #include <boost/interprocess/mapped_region.hpp>
 #include <boost/interprocess/shared_memory_object.hpp>
+#include <atomic>
 #include <cstdint>
+#include <memory>
 
-#define SM_REGION_COUNT 6
+#define SM_REGION_COUNT 7
+#define SM_STATS_STAGE_COUNT 5
 
 #define MAX_LABELS 256
 #define MAX_OBJECTS 4096
 #define MAX_SECTORS 2048
 #define MAX_LINES 8192
 
+#define SM_SYNC_SPIN_COUNT 4096
+#define SM_SYNC_SLEEP_TIME 50       // In microseconds, used if futex is not available
+#define SM_SYNC_TIMEOUT 10000       // In microseconds
+
+#define SM_SNAPSHOT_INIT_SIZE 1048576
+
 namespace vizdoom {
 
     namespace b         = boost;
@@ -46,7 +55,7 @@ namespace vizdoom {
     /*----------------------------------------------------------------------------------------------------------------*/
 
     struct SMRegion {
-        bip::mapped_region *region;
+        std::shared_ptr<bip::mapped_region> region;
         void *address;
         size_t offset;
         size_t size;
@@ -122,6 +131,18 @@ namespace vizdoom {
         size_t SCREEN_SIZE;
         int SCREEN_FORMAT;
 
+        // OBSERVATION
+        unsigned int OBSERVATION_WIDTH;
+        unsigned int OBSERVATION_HEIGHT;
+        unsigned int OBSERVATION_CHANNELS;
+        size_t OBSERVATION_SIZE;
+        bool OBSERVATION_FLOAT;
+
+        unsigned int STATS_COUNT[SM_STATS_STAGE_COUNT];
+        double STATS_TOTAL[SM_STATS_STAGE_COUNT];
+        double STATS_LAST[SM_STATS_STAGE_COUNT];
+
+        bool SCREEN_BUFFER;
         bool DEPTH_BUFFER;
         bool LABELS;
         bool AUTOMAP;
@@ -132,6 +153,7 @@ namespace vizdoom {
         unsigned int MAP_START_TIC;
         unsigned int MAP_TIC;
         unsigned int MAP_TICLIMIT;
+        char MAP_NAME[MAX_NAME_LENGTH];
 
         int MAP_REWARD;
         int MAP_USER_VARS[USER_VARIABLE_COUNT];
@@ -190,6 +212,7 @@ namespace vizdoom {
         SMObject OBJECT[MAX_OBJECTS];
 
         // SECTORS
+        unsigned int MAP_GEOMETRY_VERSION;  // Changes only when lines or lines of sectors change
         unsigned int SECTOR_COUNT;
         SMSector SECTOR[MAX_SECTORS];
 
@@ -209,15 +232,32 @@ namespace vizdoom {
         bool BT_AVAILABLE[BUTTON_COUNT];
         double BT_MAX_VALUE[DELTA_BUTTON_COUNT];
         double CMD_BT[BUTTON_COUNT];
+
+        // SYNC (step requests and replies used instead of message queues if SM sync is enabled)
+        std::atomic<uint32_t> SYNC_REQUEST_SEQ;
+        std::atomic<uint32_t> SYNC_DONE_SEQ;
+        uint8_t SYNC_REQUEST_CODE;
+        unsigned int SYNC_REQUEST_TICS;
+    };
+
+    // Snapshot shared memory starts with the header followed by the serialized state
+    struct SMSnapshotHeader {
+        size_t SNAPSHOT_SIZE;
     };
 
+    /* SM sync */
+    /*----------------------------------------------------------------------------------------------------------------*/
+
+    void smSyncWait(std::atomic<uint32_t> *seq, uint32_t value, unsigned int timeout);
+    void smSyncWake(std::atomic<uint32_t> *seq);
+
     /* SM class */
     /*----------------------------------------------------------------------------------------------------------------*/
 
     class SharedMemory {
 
     public:
-        SharedMemory(std::string name);
+        SharedMemory(std::string name, std::string snapshotName);
         ~SharedMemory();
 
         void init();
@@ -230,18 +270,33 @@ namespace vizdoom {
         uint8_t *getDepthBuffer();
         uint8_t *getLabelsBuffer();
         uint8_t *getAutomapBuffer();
+        uint8_t *getObservationBuffer();
+
+        SMRegion *getRegion(unsigned int number);
+
+        SMSnapshotHeader *getSnapshotHeader();
+        uint8_t *getSnapshotBuffer();
+        void reserveSnapshot(size_t size);
+        void updateSnapshot();
 
     private:
         bip::shared_memory_object sm;
         bip::offset_t size;
         std::string name;
 
+        bip::shared_memory_object smSnapshot;
+        std::string snapshotName;
+
         void mapRegion(SMRegion *regionPtr);
+        void mapSnapshot(size_t size);
 
         void deleteRegion(SMRegion *regionPtr);
 
         //0 - GameState, 1 - InputState, 2 - ScreenBuffer, 3 - DepthBuffer, 4 - LabelsBuffer, 5 - AutomapBuffer
-        SMRegion region[6];
+        SMRegion region[SM_REGION_COUNT];
+
+        // Separate shared memory object, so it can grow without remapping the regions
+        SMRegion snapshotRegion;
     };
 }
 
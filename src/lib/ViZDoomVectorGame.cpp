@@ -0,0 +1,220 @@
+/*
+ Copyright (C) 2016 by Wojciech Jaśkowski, Michał Kempka, Grzegorz Runc, Jakub Toczek, Marek Wydmuch
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ THE SOFTWARE.
+*/
+
+#include "ViZDoomVectorGame.h"
+
+#include "ViZDoomExceptions.h"
+
+#include <boost/thread.hpp>
+
+#include <exception>
+#include <string>
+
+
+namespace vizdoom {
+
+    VectorDoomGame::VectorDoomGame() {
+        this->autoReset = true;
+    }
+
+    VectorDoomGame::VectorDoomGame(unsigned int size) : VectorDoomGame() {
+        for (unsigned int i = 0; i < size; ++i) this->games.push_back(std::make_shared<DoomGame>());
+        this->resizeResults();
+    }
+
+    VectorDoomGame::~VectorDoomGame() {
+        this->close();
+    }
+
+    bool VectorDoomGame::loadConfig(std::string filePath) {
+        bool success = true;
+        for (auto &game : this->games) success = game->loadConfig(filePath) && success;
+        return success;
+    }
+
+    bool VectorDoomGame::init() {
+        this->resizeResults();
+
+        // Instances are started one by one, instance ids are generated from the clock
+        try {
+            for (auto &game : this->games) game->init();
+        }
+        catch (...) {
+            this->close();
+            throw;
+        }
+
+        return this->isRunning();
+    }
+
+    void VectorDoomGame::close() {
+        for (auto &game : this->games) game->close();
+    }
+
+    void VectorDoomGame::newEpisodes() {
+        std::vector<size_t> indices(this->games.size());
+        for (size_t i = 0; i < indices.size(); ++i) indices[i] = i;
+        this->restartGames(indices);
+        this->resizeResults();
+    }
+
+    void VectorDoomGame::restartGames(std::vector<size_t> const &indices) {
+        if (indices.empty()) return;
+        if (indices.size() == 1) {
+            this->games[indices[0]]->newEpisode();
+            return;
+        }
+
+        // Restart of the map takes many round trips to the engine, every game is restarted in its own thread,
+        // so the engines reload their maps concurrently
+        std::vector<std::exception_ptr> errors(indices.size());
+        boost::thread_group threads;
+        for (size_t i = 0; i < indices.size(); ++i) {
+            DoomGame *game = this->games[indices[i]].get();
+            std::exception_ptr *error = &errors[i];
+            threads.create_thread([game, error]() {
+                try {
+                    game->newEpisode();
+                }
+                catch (...) {
+                    *error = std::current_exception();
+                }
+            });
+        }
+        threads.join_all();
+
+        for (auto &error : errors) {
+            if (error) std::rethrow_exception(error);
+        }
+    }
+
+    bool VectorDoomGame::isRunning() {
+        if (this->games.empty()) return false;
+        for (auto &game : this->games) {
+            if (!game->isRunning()) return false;
+        }
+        return true;
+    }
+
+    std::vector<double> VectorDoomGame::makeActions(std::vector<std::vector<double>> const &actions, unsigned int tics) {
+        if (actions.size() != this->games.size())
+            throw ViZDoomErrorException(std::string("Number of actions (") + std::to_string(actions.size()) +
+                                        ") does not match the number of games (" +
+                                        std::to_string(this->games.size()) + ").");
+
+        // Actions are sent to all engines first, so they are processed concurrently
+        for (size_t i = 0; i < this->games.size(); ++i) {
+            this->games[i]->setAction(actions[i]);
+            this->games[i]->startAdvanceAction(tics);
+        }
+
+        return this->finishActions();
+    }
+
+    std::vector<double> VectorDoomGame::makeActionsIndex(std::vector<unsigned int> const &indices, unsigned int tics) {
+        if (indices.size() != this->games.size())
+            throw ViZDoomErrorException(std::string("Number of actions (") + std::to_string(indices.size()) +
+                                        ") does not match the number of games (" +
+                                        std::to_string(this->games.size()) + ").");
+
+        // Indices are checked before any action is started, so an invalid one leaves all games untouched
+        for (size_t i = 0; i < this->games.size(); ++i) {
+            if (indices[i] >= this->games[i]->getActionTableSize())
+                throw ViZDoomErrorException(std::string("Action index (") + std::to_string(indices[i]) +
+                                            ") is out of range of the action table of game " + std::to_string(i) + ".");
+            if (this->games[i]->actionTable[indices[i]].size() != this->games[i]->getAvailableButtonsSize())
+                throw ViZDoomErrorException(std::string("Action table of game ") + std::to_string(i) +
+                                            " does not match its available buttons.");
+        }
+
+        for (size_t i = 0; i < this->games.size(); ++i) {
+            this->games[i]->setActionIndex(indices[i]);
+            this->games[i]->startAdvanceAction(tics);
+        }
+
+        return this->finishActions();
+    }
+
+    std::vector<double> VectorDoomGame::finishActions() {
+        std::vector<size_t> finished;
+        for (size_t i = 0; i < this->games.size(); ++i) {
+            auto &game = this->games[i];
+            game->finishAdvanceAction();
+
+            this->lastRewards[i] = game->getLastReward();
+            this->episodesFinished[i] = game->isEpisodeFinished();
+            this->finishedTotalRewards[i] = 0;
+
+            if (this->episodesFinished[i]) {
+                this->finishedTotalRewards[i] = game->getTotalReward();
+                finished.push_back(i);
+            }
+        }
+
+        // Results of all games are collected first, then all finished games are restarted together
+        if (this->autoReset) this->restartGames(finished);
+
+        return this->lastRewards;
+    }
+
+    std::vector<bool> VectorDoomGame::getEpisodesFinished() { return this->episodesFinished; }
+
+    std::vector<double> VectorDoomGame::getLastRewards() { return this->lastRewards; }
+
+    std::vector<double> VectorDoomGame::getFinishedTotalRewards() { return this->finishedTotalRewards; }
+
+    size_t VectorDoomGame::getSize() { return this->games.size(); }
+
+    DoomGame *VectorDoomGame::getGame(unsigned int index) {
+        if (index >= this->games.size())
+            throw ViZDoomErrorException(std::string("Game index (") + std::to_string(index) + ") is out of range.");
+        return this->games[index].get();
+    }
+
+    void VectorDoomGame::setActionTable(std::vector<std::vector<double>> const &actions) {
+        // All games are checked first, so a mismatch leaves all tables untouched
+        for (size_t i = 0; i < this->games.size(); ++i) {
+            if (!actions.empty() && actions[0].size() != this->games[i]->getAvailableButtonsSize())
+                throw ViZDoomErrorException(std::string("Actions of the action table have ") +
+                                            std::to_string(actions[0].size()) + " values, but game " +
+                                            std::to_string(i) + " has " +
+                                            std::to_string(this->games[i]->getAvailableButtonsSize()) +
+                                            " available buttons.");
+        }
+        for (auto &game : this->games) game->setActionTable(actions);
+    }
+
+    void VectorDoomGame::setPool(DoomGamePool *pool) {
+        for (auto &game : this->games) game->setPool(pool);
+    }
+
+    bool VectorDoomGame::isAutoResetEnabled() { return this->autoReset; }
+
+    void VectorDoomGame::setAutoResetEnabled(bool autoReset) { this->autoReset = autoReset; }
+
+    void VectorDoomGame::resizeResults() {
+        this->lastRewards.assign(this->games.size(), 0);
+        this->episodesFinished.assign(this->games.size(), false);
+        this->finishedTotalRewards.assign(this->games.size(), 0);
+    }
+
+}
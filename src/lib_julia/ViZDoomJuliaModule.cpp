@@ -423,6 +423,8 @@ mod.add_type<DoomGame>("DoomGame")
     .method("set_sound_enabled", &DoomGame::setSoundEnabled)
     .method("set_screen_resolution", &DoomGame::setScreenResolution)
     .method("set_screen_format", &DoomGame::setScreenFormat)
+    .method("is_screen_buffer_enabled", &DoomGame::isScreenBufferEnabled)
+    .method("set_screen_buffer_enabled", &DoomGame::setScreenBufferEnabled)
     .method("is_depth_buffer_enabled", &DoomGame::isDepthBufferEnabled)
     .method("set_depth_buffer_enabled", &DoomGame::setDepthBufferEnabled)
     .method("is_labels_buffer_enabled", &DoomGame::isLabelsBufferEnabled)
@@ -22,7 +22,9 @@
 
 #include "ViZDoomGamePython.h"
 #include "ViZDoomController.h"
+#include "ViZDoomExceptions.h"
 
+#include <algorithm>
 #include <cstddef>
 #include <cstring>
 
@@ -39,24 +41,110 @@ namespace vizdoom {
         }
     #endif
 
+    // Row of the sectors array in array state mode
+    struct SectorArrayRow {
+        double floorHeight;
+        double ceilingHeight;
+        unsigned int linesOffset;
+        unsigned int linesCount;
+    };
+
     DoomGamePython::DoomGamePython() {
         init_numpy();
+        this->sectorsLinesVersion = 0;
+        this->arrayState = false;
+        this->linesArrayVersion = 0;
+        this->initArrayDtypes();
+        this->frameStackSize = 0;
+        this->frameStackPos = 0;
+        this->frameStackFrameSize = 0;
+        this->float32Arrays = false;
+    }
+
+    void DoomGamePython::setAction(pyb::object const &pyAction) {
+        this->pyActionToVector(pyAction);
+        ReleaseGIL gil = ReleaseGIL();
+        DoomGame::setAction(this->actionVector);
+    }
+
+    double DoomGamePython::makeAction(pyb::object const &pyAction, unsigned int tics) {
+        this->pyActionToVector(pyAction);
+        ReleaseGIL gil = ReleaseGIL();
+        return DoomGame::makeAction(this->actionVector, tics);
+    }
+
+    void DoomGamePython::makeActionAsync(pyb::object const &pyAction, unsigned int tics) {
+        this->pyActionToVector(pyAction);
+        ReleaseGIL gil = ReleaseGIL();
+        DoomGame::makeActionAsync(this->actionVector, tics);
     }
 
-    void DoomGamePython::setAction(pyb::list const &pyAction) {
-        auto action = DoomGamePython::pyListToVector<double>(pyAction);
+    void DoomGamePython::setActionIndex(unsigned int index) {
         ReleaseGIL gil = ReleaseGIL();
-        DoomGame::setAction(action);
+        DoomGame::setActionIndex(index);
     }
 
-    double DoomGamePython::makeAction(pyb::list const &pyAction, unsigned int tics) {
-        auto action = DoomGamePython::pyListToVector<double>(pyAction);
+    double DoomGamePython::makeActionIndex(unsigned int index, unsigned int tics) {
         ReleaseGIL gil = ReleaseGIL();
-        return DoomGame::makeAction(action, tics);
+        return DoomGame::makeActionIndex(index, tics);
+    }
+
+    pyb::object DoomGamePython::getActionTable() {
+        npy_intp shape[2] = {static_cast<npy_intp>(this->actionTable.size()),
+                             static_cast<npy_intp>(this->actionTable.empty() ? 0 : this->actionTable[0].size())};
+        PyObject *pyArray = PyArray_SimpleNew(2, shape, NPY_DOUBLE);
+        if (pyArray == nullptr) throw pyb::error_already_set();
+        double *data = static_cast<double *>(PyArray_DATA(reinterpret_cast<PyArrayObject *>(pyArray)));
+        for (auto &action : this->actionTable) data = std::copy(action.begin(), action.end(), data);
+        return pyb::reinterpret_steal<pyb::object>(pyb::handle(pyArray));
+    }
+
+    void DoomGamePython::setActionTable(pyb::object const &pyActions) {
+        DoomGame::setActionTable(DoomGamePython::pyActionsToTable(pyActions));
+    }
+
+    std::vector<std::vector<double>> DoomGamePython::pyActionsToTable(pyb::object const &pyActions) {
+        PyObject *pyArray = PyArray_FROM_OTF(pyActions.ptr(), NPY_DOUBLE, NPY_ARRAY_IN_ARRAY | NPY_ARRAY_FORCECAST);
+        if (pyArray == nullptr) throw pyb::error_already_set();
+        pyb::object actionsArray = pyb::reinterpret_steal<pyb::object>(pyb::handle(pyArray));
+        PyArrayObject *array = reinterpret_cast<PyArrayObject *>(pyArray);
+
+        if (PyArray_NDIM(array) != 2)
+            throw pyb::value_error("actions has wrong shape, expected (number of actions, number of available buttons).");
+
+        size_t buttons = static_cast<size_t>(PyArray_DIM(array, 1));
+        const double *data = static_cast<double *>(PyArray_DATA(array));
+        std::vector<std::vector<double>> table(static_cast<size_t>(PyArray_DIM(array, 0)));
+        for (size_t i = 0; i < table.size(); ++i) table[i].assign(data + i * buttons, data + (i + 1) * buttons);
+        return table;
+    }
+
+    void DoomGamePython::pyActionToVector(pyb::object const &pyAction) {
+        /* Lists are converted element by element, everything else (NumPy arrays of any numeric dtype, tuples)
+         * is read as an array, which for C-contiguous float64 arrays is done without any copy */
+        if (PyList_Check(pyAction.ptr())) {
+            size_t size = static_cast<size_t>(PyList_GET_SIZE(pyAction.ptr()));
+            this->actionVector.resize(size);
+            for (size_t i = 0; i < size; ++i)
+                this->actionVector[i] = pyb::cast<double>(PyList_GET_ITEM(pyAction.ptr(), i));
+            return;
+        }
+
+        PyObject *pyArray = PyArray_FROM_OTF(pyAction.ptr(), NPY_DOUBLE, NPY_ARRAY_IN_ARRAY | NPY_ARRAY_FORCECAST);
+        if (pyArray == nullptr) throw pyb::error_already_set();
+        pyb::object actionArray = pyb::reinterpret_steal<pyb::object>(pyb::handle(pyArray));
+        PyArrayObject *array = reinterpret_cast<PyArrayObject *>(pyArray);
+
+        if (PyArray_NDIM(array) != 1) throw pyb::value_error("action has to be a 1-D array.");
+
+        const double *data = static_cast<double *>(PyArray_DATA(array));
+        this->actionVector.assign(data, data + PyArray_DIM(array, 0));
     }
 
     GameStatePython* DoomGamePython::getState() {
+        if (this->actionPending) this->wait();
         if (this->state == nullptr) return nullptr;
+        auto statsStart = this->doomController->statsClock();
 
         // TODO: the following line causes:
         // Fatal Python error: PyEval_SaveThread: NULL tstate
@@ -73,31 +161,52 @@ namespace vizdoom {
 
         if (this->state->screenBuffer != nullptr)
             this->pyState->screenBuffer = this->dataToNumpyArray(colorDims, this->colorShape, NPY_UBYTE, this->state->screenBuffer->data());
+        else if (!this->copyBuffers && this->isScreenBufferEnabled())
+            this->pyState->screenBuffer = this->getBufferView(this->screenBufferView, 2, colorDims, this->colorShape);
         else this->pyState->screenBuffer = pyb::none();
 
         if (this->state->depthBuffer != nullptr)
             this->pyState->depthBuffer = this->dataToNumpyArray(2, this->grayShape, NPY_UBYTE, this->state->depthBuffer->data());
+        else if (!this->copyBuffers && this->isDepthBufferEnabled())
+            this->pyState->depthBuffer = this->getBufferView(this->depthBufferView, 3, 2, this->grayShape);
         else this->pyState->depthBuffer = pyb::none();
 
-        if (this->state->labelsBuffer != nullptr) {
-            this->pyState->labelsBuffer = this->dataToNumpyArray(2, this->grayShape, NPY_UBYTE, this->state->labelsBuffer->data());
+        if (this->isLabelsBufferEnabled()) {
+            if (this->state->labelsBuffer != nullptr)
+                this->pyState->labelsBuffer = this->dataToNumpyArray(2, this->grayShape, NPY_UBYTE, this->state->labelsBuffer->data());
+            else if (!this->copyBuffers)
+                this->pyState->labelsBuffer = this->getBufferView(this->labelsBufferView, 4, 2, this->grayShape);
+            else this->pyState->labelsBuffer = pyb::none();
 
             /* Update labels */
-            this->pyState->labels = DoomGamePython::vectorToPyList<Label>(this->state->labels);
+            if (this->arrayState) this->pyState->labels = this->labelsToArray();
+            else this->pyState->labels = DoomGamePython::vectorToPyList<Label>(this->state->labels);
         }  else {
             this->pyState->labelsBuffer = pyb::none();
-            this->pyState->labels = pyb::list();
+            if (this->arrayState) this->pyState->labels = DoomGamePython::newArray(this->labelDtype, 0);
+            else this->pyState->labels = pyb::list();
         }
 
         if (this->state->automapBuffer != nullptr)
             this->pyState->automapBuffer = this->dataToNumpyArray(colorDims, this->colorShape, NPY_UBYTE, this->state->automapBuffer->data());
+        else if (!this->copyBuffers && this->isAutomapBufferEnabled())
+            this->pyState->automapBuffer = this->getBufferView(this->automapBufferView, 5, colorDims, this->colorShape);
         else this->pyState->automapBuffer = pyb::none();
 
+        if (this->state->observationBuffer != nullptr)
+            this->pyState->observationBuffer = this->dataToNumpyArray(this->observationDims, this->observationShape,
+                                                                      this->observationType, this->state->observationBuffer->data());
+        else if (!this->copyBuffers && this->isObservationEnabled())
+            this->pyState->observationBuffer = this->getBufferView(this->observationBufferView, 6, this->observationDims,
+                                                                   this->observationShape, this->observationType);
+        else this->pyState->observationBuffer = pyb::none();
+
         /* Updates vars */
         if (this->state->gameVariables.size() > 0) {
-            // Numpy array version
-            npy_intp shape = this->state->gameVariables.size();
-            this->pyState->gameVariables = dataToNumpyArray(1, &shape, NPY_DOUBLE, this->state->gameVariables.data());
+            // Numpy array version, in zero-copy mode the same array is refreshed in place
+            if (this->copyBuffers) this->pyState->gameVariables = this->vectorToArray(this->state->gameVariables);
+            else this->pyState->gameVariables = this->vectorToReusableArray(this->gameVariablesArray,
+                                                                            this->state->gameVariables);
 
             // Python list version
             //this->pyState->gameVariables = DoomGamePython::vectorToPyList<double>(this->state->gameVariables);
@@ -105,27 +214,103 @@ namespace vizdoom {
         else this->pyState->gameVariables = pyb::none();
 
         /* Update objects */
-        if (this->isObjectsInfoEnabled()) {
+        if (this->arrayState) {
+            if (this->isObjectsInfoEnabled()) this->pyState->objects = this->objectsToArray();
+            else this->pyState->objects = DoomGamePython::newArray(this->objectDtype, 0);
+        }
+        else if (this->isObjectsInfoEnabled()) {
             this->pyState->objects = DoomGamePython::vectorToPyList<Object>(this->state->objects);
         } else this->pyState->objects = pyb::list();
 
         /* Update sectors */
-        if (this->isSectorsInfoEnabled()) {
+        this->pyState->lines = pyb::none();
+        if (this->arrayState) {
+            if (this->isSectorsInfoEnabled()) {
+                this->pyState->sectors = this->sectorsToArray();
+                this->pyState->lines = this->linesArray;
+            }
+            else this->pyState->sectors = DoomGamePython::newArray(this->sectorDtype, 0);
+        }
+        else if (this->isSectorsInfoEnabled()) {
+            if (this->sectorsLinesVersion != this->mapGeometryVersion
+                || this->sectorsLines.size() != this->state->sectors.size()) {
+                this->sectorsLines.clear();
+                for (auto& sector : this->state->sectors)
+                    this->sectorsLines.push_back(pyb::tuple(DoomGamePython::vectorToPyList<Line>(*sector.lines)));
+                this->sectorsLinesVersion = this->mapGeometryVersion;
+            }
+
             pyb::list pySectors;
-            for (auto& sector : this->state->sectors){
+            for (size_t i = 0; i < this->state->sectors.size(); ++i){
                 SectorPython pySector;
-                pySector.floorHeight = sector.floorHeight;
-                pySector.ceilingHeight = sector.ceilingHeight;
-                pySector.lines = DoomGamePython::vectorToPyList<Line>(sector.lines);
+                pySector.floorHeight = this->state->sectors[i].floorHeight;
+                pySector.ceilingHeight = this->state->sectors[i].ceilingHeight;
+                pySector.lines = this->sectorsLines[i];
                 pySectors.append(pySector);
             }
             this->pyState->sectors = pySectors;
             //this->pyState->sectors = DoomGamePython::vectorToPyList<Sectors>(this->state->objects);
         } else this->pyState->sectors = pyb::list();
 
+        this->doomController->statsUnclock(DoomController::STATS_GET_STATE, statsStart);
         return this->pyState;
     }
 
+    bool DoomGamePython::getStateInto(pyb::object const &screen, pyb::object const &depth, pyb::object const &labels,
+                                      pyb::object const &automap, pyb::object const &gameVariables,
+                                      pyb::object const &observation) {
+        if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+        if (this->actionPending) this->wait();
+        if (this->state == nullptr) return false;
+
+        /* Copy buffers directly from SM into the arrays */
+        this->updateBuffersShapes();
+        int colorDims = 3;
+        if (this->getScreenChannels() == 1) colorDims = 2;
+
+        if (!screen.is_none()) {
+            if (!this->isScreenBufferEnabled()) throw pyb::value_error("Screen buffer is not enabled.");
+            DoomGamePython::dataToNumpyArrayInto(screen, "screen", colorDims, this->colorShape, NPY_UBYTE,
+                                                 this->doomController->getScreenBuffer());
+        }
+
+        if (!depth.is_none()) {
+            if (!this->isDepthBufferEnabled()) throw pyb::value_error("Depth buffer is not enabled.");
+            DoomGamePython::dataToNumpyArrayInto(depth, "depth", 2, this->grayShape, NPY_UBYTE,
+                                                 this->doomController->getDepthBuffer());
+        }
+
+        if (!labels.is_none()) {
+            if (!this->isLabelsBufferEnabled()) throw pyb::value_error("Labels buffer is not enabled.");
+            DoomGamePython::dataToNumpyArrayInto(labels, "labels", 2, this->grayShape, NPY_UBYTE,
+                                                 this->doomController->getLabelsBuffer());
+        }
+
+        if (!automap.is_none()) {
+            if (!this->isAutomapBufferEnabled()) throw pyb::value_error("Automap buffer is not enabled.");
+            DoomGamePython::dataToNumpyArrayInto(automap, "automap", colorDims, this->colorShape, NPY_UBYTE,
+                                                 this->doomController->getAutomapBuffer());
+        }
+
+        if (!gameVariables.is_none()) {
+            npy_intp shape = this->state->gameVariables.size();
+            void *data = this->state->gameVariables.data();
+            if (this->float32Arrays) {
+                this->gameVariablesFloat.assign(this->state->gameVariables.begin(), this->state->gameVariables.end());
+                data = this->gameVariablesFloat.data();
+            }
+            DoomGamePython::dataToNumpyArrayInto(gameVariables, "game_variables", 1, &shape, this->arraysType(), data);
+        }
+
+        if (!observation.is_none()) {
+            if (!this->isObservationEnabled()) throw pyb::value_error("Observation is not enabled.");
+            DoomGamePython::dataToNumpyArrayInto(observation, "observation", this->observationDims, this->observationShape,
+                                                 this->observationType, this->doomController->getObservationBuffer());
+        }
+
+        return true;
+    }
+
     ServerStatePython* DoomGamePython::getServerState() {
         ServerStatePython* pyServerState = new ServerStatePython();
 
@@ -157,6 +342,11 @@ namespace vizdoom {
         return DoomGamePython::vectorToPyList(this->lastAction);
     }
 
+    pyb::object DoomGamePython::getLastActionArray() {
+        if (this->actionPending) this->wait();
+        return this->vectorToReusableArray(this->lastActionArray, this->lastAction);
+    }
+
     pyb::list DoomGamePython::getAvailableButtons(){
         return DoomGamePython::vectorToPyList(this->availableButtons);
     }
@@ -173,22 +363,226 @@ namespace vizdoom {
         DoomGame::setAvailableGameVariables(DoomGamePython::pyListToVector<GameVariable>(pyGameVariables));
     }
 
+    bool DoomGamePython::isZeroCopyStateEnabled(){
+        return !this->copyBuffers;
+    }
+
+    void DoomGamePython::setZeroCopyStateEnabled(bool zeroCopyState){
+        this->copyBuffers = !zeroCopyState;
+        this->clearBuffersViews();
+    }
+
+    bool DoomGamePython::isFloat32ArraysEnabled(){
+        return this->float32Arrays;
+    }
+
+    void DoomGamePython::setFloat32ArraysEnabled(bool float32Arrays){
+        this->float32Arrays = float32Arrays;
+    }
+
+    bool DoomGamePython::isArrayStateEnabled(){
+        return this->arrayState;
+    }
+
+    void DoomGamePython::setArrayStateEnabled(bool arrayState){
+        this->arrayState = arrayState;
+        this->copyInfo = !arrayState;
+    }
+
+    pyb::list DoomGamePython::getNearestObjects(std::string const &name, unsigned int count){
+        if (this->actionPending) this->wait();
+        return DoomGamePython::vectorToPyList<Object>(DoomGame::getNearestObjects(name, count));
+    }
+
+    pyb::list DoomGamePython::getObjectNames(){
+        return pyb::reinterpret_steal<pyb::list>(PySequence_List(this->objectNames.ptr()));
+    }
+
+    pyb::object DoomGamePython::getObservationShape(){
+        if (!this->isObservationEnabled()) return pyb::none();
+        this->updateBuffersShapes();
+        pyb::tuple shape(this->observationDims);
+        for (int i = 0; i < this->observationDims; ++i) shape[i] = pyb::int_(this->observationShape[i]);
+        return shape;
+    }
+
+    pyb::dict DoomGamePython::getPerformanceStats(bool reset){
+        std::vector<PerformanceStat> stats;
+        {
+            ReleaseGIL gil = ReleaseGIL();
+            stats = DoomGame::getPerformanceStats(reset);
+        }
+
+        pyb::dict pyStats;
+        for (auto &stat : stats) pyStats[pyb::str(stat.stage)] = pyb::cast(stat);
+        return pyStats;
+    }
+
+    // Pools are set only from Python, so they are always DoomGamePoolPython
+    DoomGamePoolPython* DoomGamePython::getPool(){
+        return static_cast<DoomGamePoolPython *>(DoomGame::getPool());
+    }
+
+    void DoomGamePython::setPool(DoomGamePoolPython *pool){
+        DoomGame::setPool(pool);
+    }
+
+    void DoomGamePython::setFrameStack(unsigned int size, bool maxPool){
+        this->setObservationMaxPoolEnabled(maxPool);
+        if (size == this->frameStackSize) return;
+
+        this->frameStackSize = size;
+        this->frameStackPos = 0;
+        this->frameStackFrameSize = 0;
+        this->frameStack = nullptr;
+        this->frameStackViews.clear();
+        this->frameStackViews.resize(size);
+
+        /* Fill the stack with the current frame, so it can be read right away */
+        if (size && this->isRunning()) this->pushFrame(true);
+    }
+
+    unsigned int DoomGamePython::getFrameStackSize(){
+        return this->frameStackSize;
+    }
+
+    pyb::object DoomGamePython::getFrameStack(){
+        if (this->actionPending) this->wait();
+        if (!this->frameStackSize || !this->frameStackFrameSize) return pyb::none();
+
+        int dims = 1;
+        npy_intp shape[4] = {static_cast<npy_intp>(this->frameStackSize)};
+        int type = NPY_UBYTE;
+
+        this->updateBuffersShapes();
+        if (this->isObservationEnabled()) {
+            std::copy(this->observationShape, this->observationShape + this->observationDims, shape + 1);
+            dims += this->observationDims;
+            type = this->observationType;
+        }
+        else if (this->getScreenChannels() == 1) {
+            std::copy(this->grayShape, this->grayShape + 2, shape + 1);
+            dims += 2;
+        }
+        else {
+            std::copy(this->colorShape, this->colorShape + 3, shape + 1);
+            dims += 3;
+        }
+
+        /* One view for every position of the ring, views are created once and reused between steps */
+        uint8_t *data = this->frameStack->data() + this->frameStackPos * this->frameStackFrameSize;
+        pyb::object &view = this->frameStackViews[this->frameStackPos];
+        if (view && PyArray_DATA(reinterpret_cast<PyArrayObject *>(view.ptr())) == data) return view;
+
+        PyObject *pyArray = PyArray_SimpleNewFromData(dims, shape, type, data);
+        PyArray_CLEARFLAGS(reinterpret_cast<PyArrayObject *>(pyArray), NPY_ARRAY_WRITEABLE);
+
+        /* Array holds a reference to the ring buffer, so it stays valid after the stack is resized */
+        auto stackRef = new std::shared_ptr<std::vector<uint8_t>>(this->frameStack);
+        PyObject *capsule = PyCapsule_New(stackRef, nullptr, [](PyObject *capsule) {
+            delete static_cast<std::shared_ptr<std::vector<uint8_t>> *>(PyCapsule_GetPointer(capsule, nullptr));
+        });
+        PyArray_SetBaseObject(reinterpret_cast<PyArrayObject *>(pyArray), capsule);
+
+        view = pyb::reinterpret_steal<pyb::object>(pyb::handle(pyArray));
+        return view;
+    }
+
+    pyb::tuple DoomGamePython::makeActionStacked(pyb::object const &pyAction, unsigned int tics){
+        double reward = this->makeAction(pyAction, tics);
+        return pyb::make_tuple(reward, this->getFrameStack());
+    }
+
+    void DoomGamePython::updateState(){
+        DoomGame::updateState();
+        if (this->frameStackSize) this->pushFrame(this->state != nullptr && this->state->number == 1);
+    }
+
+    void DoomGamePython::pushFrame(bool fill){
+        uint8_t *frame = nullptr;
+        size_t frameSize = 0;
+        if (this->isObservationEnabled()) {
+            frame = this->doomController->getObservationBuffer();
+            frameSize = this->doomController->getObservationSize();
+        }
+        else if (this->isScreenBufferEnabled()) {
+            frame = this->doomController->getScreenBuffer();
+            frameSize = this->doomController->getScreenSize();
+        }
+        if (frame == nullptr || !frameSize) return;
+
+        /* Memory is reallocated only when the size of frames changes, old views keep the old buffer alive */
+        if (frameSize != this->frameStackFrameSize) {
+            this->frameStack = std::make_shared<std::vector<uint8_t>>(2 * this->frameStackSize * frameSize);
+            this->frameStackFrameSize = frameSize;
+            this->frameStackPos = 0;
+            fill = true;
+        }
+
+        uint8_t *data = this->frameStack->data();
+        if (fill) {
+            for (unsigned int i = 0; i < 2 * this->frameStackSize; ++i)
+                std::memcpy(data + i * frameSize, frame, frameSize);
+            this->frameStackPos = 0;
+        }
+        else {
+            std::memcpy(data + this->frameStackPos * frameSize, frame, frameSize);
+            std::memcpy(data + (this->frameStackPos + this->frameStackSize) * frameSize, frame, frameSize);
+            this->frameStackPos = (this->frameStackPos + 1) % this->frameStackSize;
+        }
+    }
+
     // These functions are wrapped for manual GIL management
     void DoomGamePython::init(){
+        this->clearBuffersViews();
+        this->sectorsLines.clear();
+        this->linesArray = pyb::object();
         ReleaseGIL gil = ReleaseGIL();
         DoomGame::init();
     }
 
+    void DoomGamePython::close(){
+        this->clearBuffersViews();
+        this->sectorsLines.clear();
+        this->linesArray = pyb::object();
+        DoomGame::close();
+    }
+
     void DoomGamePython::advanceAction(unsigned int tics, bool updateState){
         ReleaseGIL gil = ReleaseGIL();
         DoomGame::advanceAction(tics, updateState);
     }
 
+    double DoomGamePython::wait(){
+        ReleaseGIL gil = ReleaseGIL();
+        return DoomGame::wait();
+    }
+
     void DoomGamePython::respawnPlayer(){
         ReleaseGIL gil = ReleaseGIL();
         DoomGame::respawnPlayer();
     }
 
+    pyb::bytes DoomGamePython::saveState(){
+        std::vector<uint8_t> state;
+        {
+            ReleaseGIL gil = ReleaseGIL();
+            state = DoomGame::saveState();
+        }
+        return pyb::bytes(reinterpret_cast<const char *>(state.data()), state.size());
+    }
+
+    void DoomGamePython::loadState(pyb::bytes const &pyState){
+        char *buffer;
+        ssize_t length;
+        if (PYBIND11_BYTES_AS_STRING_AND_SIZE(pyState.ptr(), &buffer, &length))
+            throw pyb::error_already_set();
+
+        std::vector<uint8_t> state(buffer, buffer + length);
+        ReleaseGIL gil = ReleaseGIL();
+        DoomGame::loadState(state);
+    }
+
 
     void DoomGamePython::updateBuffersShapes(){
         int channels = this->getScreenChannels();
@@ -211,6 +605,195 @@ namespace vizdoom {
 
         this->grayShape[0] = height;
         this->grayShape[1] = width;
+
+        /* Observation has the layout of the screen format */
+        int obsChannels = this->getObservationChannels();
+        int obsWidth = this->getObservationWidth();
+        int obsHeight = this->getObservationHeight();
+
+        this->observationDims = 3;
+        if (obsChannels == 1) {
+            this->observationDims = 2;
+            this->observationShape[0] = obsHeight;
+            this->observationShape[1] = obsWidth;
+        }
+        else if (this->getScreenFormat() == CRCGCB || this->getScreenFormat() == CBCGCR) {
+            this->observationShape[0] = obsChannels;
+            this->observationShape[1] = obsHeight;
+            this->observationShape[2] = obsWidth;
+        }
+        else {
+            this->observationShape[0] = obsHeight;
+            this->observationShape[1] = obsWidth;
+            this->observationShape[2] = obsChannels;
+        }
+        this->observationType = this->doomController->isObservationFloat() ? NPY_FLOAT32 : NPY_UBYTE;
+    }
+
+    // Structured dtype with fields placed at the given offsets
+    static pyb::object structuredDtype(std::vector<std::string> const &names, std::vector<std::string> const &formats,
+                                       std::vector<size_t> const &offsets, size_t itemSize) {
+        pyb::dict spec;
+        spec["names"] = pyb::cast(names);
+        spec["formats"] = pyb::cast(formats);
+        spec["offsets"] = pyb::cast(offsets);
+        spec["itemsize"] = pyb::cast(itemSize);
+
+        PyArray_Descr *descr = NULL;
+        if (!PyArray_DescrConverter(spec.ptr(), &descr)) throw pyb::error_already_set();
+        return pyb::reinterpret_steal<pyb::object>(reinterpret_cast<PyObject *>(descr));
+    }
+
+    void DoomGamePython::initArrayDtypes(){
+        // Fields of labels and objects up to their names are laid out exactly as in SM,
+        // so they are copied with a single memcpy, index of the name is stored right after them.
+        const std::vector<std::string> positionNames = {"position_x", "position_y", "position_z", "angle", "pitch",
+                                                        "roll", "velocity_x", "velocity_y", "velocity_z"};
+        const size_t nameIdSize = sizeof(unsigned int);
+
+        std::vector<std::string> names = {"value", "x", "y", "width", "height", "object_id"};
+        std::vector<std::string> formats = {"u1", "u4", "u4", "u4", "u4", "u4"};
+        std::vector<size_t> offsets = {offsetof(SMLabel, value), offsetof(SMLabel, position),
+                                       offsetof(SMLabel, position) + sizeof(unsigned int), offsetof(SMLabel, size),
+                                       offsetof(SMLabel, size) + sizeof(unsigned int), offsetof(SMLabel, objectId)};
+        for (size_t i = 0; i < positionNames.size(); ++i) {
+            names.push_back("object_" + positionNames[i]);
+            formats.push_back("f8");
+            offsets.push_back(offsetof(SMLabel, objectPosition) + i * sizeof(double));
+        }
+        names.push_back("object_name");
+        formats.push_back("u4");
+        offsets.push_back(offsetof(SMLabel, objectName));
+        size_t itemSize = (offsetof(SMLabel, objectName) + nameIdSize + sizeof(double) - 1) / sizeof(double) * sizeof(double);
+        this->labelDtype = structuredDtype(names, formats, offsets, itemSize);
+
+        names = {"id"};
+        formats = {"u4"};
+        offsets = {offsetof(SMObject, id)};
+        for (size_t i = 0; i < positionNames.size(); ++i) {
+            names.push_back(positionNames[i]);
+            formats.push_back("f8");
+            offsets.push_back(offsetof(SMObject, position) + i * sizeof(double));
+        }
+        names.push_back("name");
+        formats.push_back("u4");
+        offsets.push_back(offsetof(SMObject, name));
+        itemSize = (offsetof(SMObject, name) + nameIdSize + sizeof(double) - 1) / sizeof(double) * sizeof(double);
+        this->objectDtype = structuredDtype(names, formats, offsets, itemSize);
+
+        this->sectorDtype = structuredDtype({"floor_height", "ceiling_height", "lines_offset", "lines_count"},
+                                            {"f8", "f8", "u4", "u4"},
+                                            {offsetof(SectorArrayRow, floorHeight), offsetof(SectorArrayRow, ceilingHeight),
+                                             offsetof(SectorArrayRow, linesOffset), offsetof(SectorArrayRow, linesCount)},
+                                            sizeof(SectorArrayRow));
+    }
+
+    pyb::object DoomGamePython::newArray(pyb::object const &dtype, npy_intp size){
+        PyArray_Descr *descr = reinterpret_cast<PyArray_Descr *>(dtype.ptr());
+        Py_INCREF(descr); // Reference is stolen by PyArray_NewFromDescr
+        PyObject *pyArray = PyArray_NewFromDescr(&PyArray_Type, descr, 1, &size, NULL, NULL, 0, NULL);
+        if (pyArray == NULL) throw pyb::error_already_set();
+        return pyb::reinterpret_steal<pyb::object>(pyArray);
+    }
+
+    unsigned int DoomGamePython::getObjectNameId(const char *name){
+        auto nameId = this->objectNamesIds.find(name);
+        if (nameId != this->objectNamesIds.end()) return nameId->second;
+
+        unsigned int id = static_cast<unsigned int>(this->objectNamesIds.size());
+        this->objectNamesIds.insert({std::string(name), id});
+        this->objectNames.append(pyb::str(name));
+        return id;
+    }
+
+    pyb::object DoomGamePython::labelsToArray(){
+        SMGameState *smState = this->doomController->getGameState();
+        pyb::object array = DoomGamePython::newArray(this->labelDtype, smState->LABEL_COUNT);
+        PyArrayObject *pyArray = reinterpret_cast<PyArrayObject *>(array.ptr());
+        uint8_t *data = static_cast<uint8_t *>(PyArray_DATA(pyArray));
+        size_t itemSize = static_cast<size_t>(PyArray_ITEMSIZE(pyArray));
+
+        for (unsigned int i = 0; i < smState->LABEL_COUNT; ++i) {
+            uint8_t *row = data + i * itemSize;
+            unsigned int nameId = this->getObjectNameId(smState->LABEL[i].objectName);
+            std::memcpy(row, &smState->LABEL[i], offsetof(SMLabel, objectName));
+            std::memcpy(row + offsetof(SMLabel, objectName), &nameId, sizeof(nameId));
+        }
+        return array;
+    }
+
+    pyb::object DoomGamePython::objectsToArray(){
+        SMGameState *smState = this->doomController->getGameState();
+        pyb::object array = DoomGamePython::newArray(this->objectDtype, smState->OBJECT_COUNT);
+        PyArrayObject *pyArray = reinterpret_cast<PyArrayObject *>(array.ptr());
+        uint8_t *data = static_cast<uint8_t *>(PyArray_DATA(pyArray));
+        size_t itemSize = static_cast<size_t>(PyArray_ITEMSIZE(pyArray));
+
+        for (unsigned int i = 0; i < smState->OBJECT_COUNT; ++i) {
+            uint8_t *row = data + i * itemSize;
+            unsigned int nameId = this->getObjectNameId(smState->OBJECT[i].name);
+            std::memcpy(row, &smState->OBJECT[i], offsetof(SMObject, name));
+            std::memcpy(row + offsetof(SMObject, name), &nameId, sizeof(nameId));
+        }
+        return array;
+    }
+
+    pyb::object DoomGamePython::sectorsToArray(){
+        SMGameState *smState = this->doomController->getGameState();
+
+        // Lines of all sectors, one after another, are rebuilt only when the geometry of the map changes
+        if (!this->linesArray || this->linesArrayVersion != smState->MAP_GEOMETRY_VERSION) {
+            npy_intp shape[2] = {0, 5};
+            for (unsigned int i = 0; i < smState->SECTOR_COUNT; ++i) shape[0] += smState->SECTOR[i].lineCount;
+
+            PyObject *pyLines = PyArray_SimpleNew(2, shape, NPY_DOUBLE);
+            if (pyLines == NULL) throw pyb::error_already_set();
+            double *row = static_cast<double *>(PyArray_DATA(reinterpret_cast<PyArrayObject *>(pyLines)));
+            for (unsigned int i = 0; i < smState->SECTOR_COUNT; ++i) {
+                for (unsigned int j = 0; j < smState->SECTOR[i].lineCount; ++j, row += 5) {
+                    SMLine &line = smState->LINE[smState->SECTOR[i].lines[j]];
+                    std::memcpy(row, line.position, sizeof(line.position));
+                    row[4] = line.isBlocking ? 1.0 : 0.0;
+                }
+            }
+
+            // The same array is shared by all states
+            PyArray_CLEARFLAGS(reinterpret_cast<PyArrayObject *>(pyLines), NPY_ARRAY_WRITEABLE);
+            this->linesArray = pyb::reinterpret_steal<pyb::object>(pyLines);
+            this->linesArrayVersion = smState->MAP_GEOMETRY_VERSION;
+        }
+
+        pyb::object array = DoomGamePython::newArray(this->sectorDtype, smState->SECTOR_COUNT);
+        SectorArrayRow *rows = static_cast<SectorArrayRow *>(PyArray_DATA(reinterpret_cast<PyArrayObject *>(array.ptr())));
+        unsigned int linesOffset = 0;
+        for (unsigned int i = 0; i < smState->SECTOR_COUNT; ++i) {
+            rows[i].floorHeight = smState->SECTOR[i].floorHeight;
+            rows[i].ceilingHeight = smState->SECTOR[i].ceilingHeight;
+            rows[i].linesOffset = linesOffset;
+            rows[i].linesCount = smState->SECTOR[i].lineCount;
+            linesOffset += smState->SECTOR[i].lineCount;
+        }
+        return array;
+    }
+
+    void DoomGamePython::clearBuffersViews(){
+        this->screenBufferView = pyb::object();
+        this->depthBufferView = pyb::object();
+        this->labelsBufferView = pyb::object();
+        this->automapBufferView = pyb::object();
+        this->observationBufferView = pyb::object();
+    }
+
+    pyb::object DoomGamePython::getBufferView(pyb::object &view, unsigned int region, int dims, npy_intp *shape,
+                                              int type){
+        SMRegion *smRegion = this->doomController->getSMRegion(region);
+        if (smRegion == nullptr || smRegion->address == nullptr) return pyb::none();
+
+        /* Views are reused between states, engine refreshes their content in place with every update */
+        if (!view || PyArray_DATA(reinterpret_cast<PyArrayObject *>(view.ptr())) != smRegion->address)
+            view = this->regionToNumpyView(dims, shape, type, smRegion);
+
+        return view;
     }
 
 
@@ -239,4 +822,310 @@ namespace vizdoom {
 
         return numpyArray;
     }
+
+    void DoomGamePython::dataToNumpyArrayInto(pyb::object const &pyArray, std::string name, int dims, npy_intp *shape, int type, void *data) {
+        if (!PyArray_Check(pyArray.ptr())) throw pyb::type_error(name + " has to be a numpy.ndarray.");
+        PyArrayObject *array = reinterpret_cast<PyArrayObject *>(pyArray.ptr());
+
+        if (PyArray_TYPE(array) != type) {
+            PyArray_Descr *descr = PyArray_DescrFromType(type);
+            std::string typeName = pyb::str(reinterpret_cast<PyObject *>(descr));
+            Py_DECREF(descr);
+            throw pyb::value_error(name + " has wrong dtype, expected " + typeName + ".");
+        }
+
+        if (PyArray_NDIM(array) != dims || !std::equal(shape, shape + dims, PyArray_DIMS(array))) {
+            std::string shapeStr = "(";
+            for (int i = 0; i < dims; ++i) shapeStr += (i ? ", " : "") + std::to_string(shape[i]);
+            if (dims == 1) shapeStr += ",";
+            throw pyb::value_error(name + " has wrong shape, expected " + shapeStr + ").");
+        }
+
+        if (!PyArray_IS_C_CONTIGUOUS(array)) throw pyb::value_error(name + " has to be C-contiguous.");
+        if (!PyArray_ISWRITEABLE(array)) throw pyb::value_error(name + " has to be writeable.");
+
+        void *arrayData = PyArray_DATA(array);
+        size_t size = PyArray_NBYTES(array);
+        ReleaseGIL gil = ReleaseGIL();
+        std::memcpy(arrayData, data, size);
+    }
+
+    pyb::object DoomGamePython::vectorToArray(std::vector<double> const &vector) {
+        npy_intp size = vector.size();
+        PyObject *pyArray = PyArray_SimpleNew(1, &size, this->arraysType());
+        if (pyArray == nullptr) throw pyb::error_already_set();
+        DoomGamePython::copyVectorInto(PyArray_DATA(reinterpret_cast<PyArrayObject *>(pyArray)), this->arraysType(), vector);
+        return pyb::reinterpret_steal<pyb::object>(pyb::handle(pyArray));
+    }
+
+    pyb::object DoomGamePython::vectorToReusableArray(pyb::object &array, std::vector<double> const &vector) {
+        npy_intp size = vector.size();
+        int type = this->arraysType();
+
+        /* Array is created again only if its size or dtype changed, otherwise it is refreshed in place */
+        PyArrayObject *pyArray = reinterpret_cast<PyArrayObject *>(array.ptr());
+        if (!array || PyArray_TYPE(pyArray) != type || PyArray_DIM(pyArray, 0) != size) {
+            array = this->vectorToArray(vector);
+            PyArray_CLEARFLAGS(reinterpret_cast<PyArrayObject *>(array.ptr()), NPY_ARRAY_WRITEABLE);
+        }
+        else DoomGamePython::copyVectorInto(PyArray_DATA(pyArray), type, vector);
+
+        return array;
+    }
+
+    void DoomGamePython::copyVectorInto(void *data, int type, std::vector<double> const &vector) {
+        if (type == NPY_FLOAT32) std::copy(vector.begin(), vector.end(), static_cast<float *>(data));
+        else std::copy(vector.begin(), vector.end(), static_cast<double *>(data));
+    }
+
+    pyb::object DoomGamePython::regionToNumpyView(int dims, npy_intp *shape, int type, SMRegion *region) {
+        PyObject *pyArray = PyArray_SimpleNewFromData(dims, shape, type, region->address);
+        PyArray_CLEARFLAGS(reinterpret_cast<PyArrayObject *>(pyArray), NPY_ARRAY_WRITEABLE);
+
+        /* Array holds a reference to the mapped region, so the memory stays valid even after SM is closed */
+        auto regionRef = new std::shared_ptr<bip::mapped_region>(region->region);
+        PyObject *capsule = PyCapsule_New(regionRef, nullptr, [](PyObject *capsule) {
+            delete static_cast<std::shared_ptr<bip::mapped_region> *>(PyCapsule_GetPointer(capsule, nullptr));
+        });
+        PyArray_SetBaseObject(reinterpret_cast<PyArrayObject *>(pyArray), capsule);
+
+        pyb::handle numpyArrayHandle = pyb::handle(pyArray);
+        pyb::object numpyArray = pyb::reinterpret_steal<pyb::object>(numpyArrayHandle);
+
+        return numpyArray;
+    }
+
+
+    VectorDoomGamePython::VectorDoomGamePython(unsigned int size) {
+        for (unsigned int i = 0; i < size; ++i) {
+            auto game = std::make_shared<DoomGamePython>();
+            // Buffers are copied directly from SM into stacked arrays, so there is no need to copy them to states
+            game->setZeroCopyStateEnabled(true);
+            this->games.push_back(game);
+        }
+        this->resizeResults();
+    }
+
+    pyb::object VectorDoomGamePython::makeActions(pyb::object const &pyActions, unsigned int tics) {
+        PyObject *pyArray = PyArray_FROM_OTF(pyActions.ptr(), NPY_DOUBLE, NPY_ARRAY_IN_ARRAY | NPY_ARRAY_FORCECAST);
+        if (pyArray == nullptr) throw pyb::error_already_set();
+        pyb::object actionsArray = pyb::reinterpret_steal<pyb::object>(pyb::handle(pyArray));
+        PyArrayObject *array = reinterpret_cast<PyArrayObject *>(pyArray);
+
+        if (PyArray_NDIM(array) != 2 || static_cast<size_t>(PyArray_DIM(array, 0)) != this->games.size())
+            throw pyb::value_error("actions has wrong shape, expected (" + std::to_string(this->games.size()) +
+                                   ", number of available buttons).");
+
+        size_t buttons = static_cast<size_t>(PyArray_DIM(array, 1));
+        const double *data = static_cast<double *>(PyArray_DATA(array));
+        std::vector<std::vector<double>> actions(this->games.size());
+        for (size_t i = 0; i < actions.size(); ++i) actions[i].assign(data + i * buttons, data + (i + 1) * buttons);
+
+        {
+            ReleaseGIL gil = ReleaseGIL();
+            VectorDoomGame::makeActions(actions, tics);
+        }
+
+        return this->getLastRewards();
+    }
+
+    pyb::tuple VectorDoomGamePython::step(pyb::object const &pyActions, unsigned int tics) {
+        pyb::object rewards = this->makeActions(pyActions, tics);
+        return pyb::make_tuple(this->getScreenBuffers(), rewards, this->getEpisodesFinished(), this->getGameVariables());
+    }
+
+    pyb::object VectorDoomGamePython::makeActionsIndex(pyb::object const &pyIndices, unsigned int tics) {
+        PyObject *pyArray = PyArray_FROM_OTF(pyIndices.ptr(), NPY_INT64, NPY_ARRAY_IN_ARRAY | NPY_ARRAY_FORCECAST);
+        if (pyArray == nullptr) throw pyb::error_already_set();
+        pyb::object indicesArray = pyb::reinterpret_steal<pyb::object>(pyb::handle(pyArray));
+        PyArrayObject *array = reinterpret_cast<PyArrayObject *>(pyArray);
+
+        if (PyArray_NDIM(array) != 1 || static_cast<size_t>(PyArray_DIM(array, 0)) != this->games.size())
+            throw pyb::value_error("indices has wrong shape, expected (" + std::to_string(this->games.size()) + ",).");
+
+        const int64_t *data = static_cast<int64_t *>(PyArray_DATA(array));
+        this->actionIndices.resize(this->games.size());
+        for (size_t i = 0; i < this->actionIndices.size(); ++i) {
+            if (data[i] < 0) throw pyb::value_error("indices have to be non-negative.");
+            this->actionIndices[i] = static_cast<unsigned int>(data[i]);
+        }
+
+        {
+            ReleaseGIL gil = ReleaseGIL();
+            VectorDoomGame::makeActionsIndex(this->actionIndices, tics);
+        }
+
+        return this->getLastRewards();
+    }
+
+    pyb::tuple VectorDoomGamePython::stepIndex(pyb::object const &pyIndices, unsigned int tics) {
+        pyb::object rewards = this->makeActionsIndex(pyIndices, tics);
+        return pyb::make_tuple(this->getScreenBuffers(), rewards, this->getEpisodesFinished(), this->getGameVariables());
+    }
+
+    void VectorDoomGamePython::setActionTable(pyb::object const &pyActions) {
+        VectorDoomGame::setActionTable(DoomGamePython::pyActionsToTable(pyActions));
+    }
+
+    pyb::object VectorDoomGamePython::getEpisodesFinished() {
+        return VectorDoomGamePython::vectorToNumpyArray<bool, npy_bool>(this->episodesFinished, NPY_BOOL);
+    }
+
+    pyb::object VectorDoomGamePython::getLastRewards() {
+        return VectorDoomGamePython::vectorToNumpyArray<double, double>(this->lastRewards, NPY_DOUBLE);
+    }
+
+    pyb::object VectorDoomGamePython::getFinishedTotalRewards() {
+        return VectorDoomGamePython::vectorToNumpyArray<double, double>(this->finishedTotalRewards, NPY_DOUBLE);
+    }
+
+    pyb::object VectorDoomGamePython::getScreenBuffers() {
+        if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+        if (!this->getGamePython(0)->isScreenBufferEnabled()) return pyb::none();
+        return this->stackBuffers(2, true);
+    }
+
+    pyb::object VectorDoomGamePython::getDepthBuffers() {
+        if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+        if (!this->getGamePython(0)->isDepthBufferEnabled()) return pyb::none();
+        return this->stackBuffers(3, false);
+    }
+
+    pyb::object VectorDoomGamePython::getLabelsBuffers() {
+        if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+        if (!this->getGamePython(0)->isLabelsBufferEnabled()) return pyb::none();
+        return this->stackBuffers(4, false);
+    }
+
+    pyb::object VectorDoomGamePython::getAutomapBuffers() {
+        if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+        if (!this->getGamePython(0)->isAutomapBufferEnabled()) return pyb::none();
+        return this->stackBuffers(5, true);
+    }
+
+    pyb::object VectorDoomGamePython::getObservationBuffers() {
+        if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+        DoomGamePython *firstGame = this->getGamePython(0);
+        if (!firstGame->isObservationEnabled()) return pyb::none();
+        firstGame->updateBuffersShapes();
+        return this->stackBuffers(6, firstGame->observationDims, firstGame->observationShape, firstGame->observationType);
+    }
+
+    pyb::object VectorDoomGamePython::getGameVariables() {
+        if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+
+        npy_intp shape[2];
+        shape[0] = this->games.size();
+        shape[1] = this->getGamePython(0)->getAvailableGameVariablesSize();
+        int type = this->getGamePython(0)->arraysType();
+        PyObject *pyArray = PyArray_ZEROS(2, shape, type, 0);
+        pyb::object numpyArray = pyb::reinterpret_steal<pyb::object>(pyb::handle(pyArray));
+        uint8_t *data = static_cast<uint8_t *>(PyArray_DATA(reinterpret_cast<PyArrayObject *>(pyArray)));
+        size_t rowSize = PyArray_STRIDE(reinterpret_cast<PyArrayObject *>(pyArray), 0);
+
+        // Games with finished episodes (if auto reset is disabled) have no state, their variables are left zeroed
+        for (size_t i = 0; i < this->games.size(); ++i) {
+            GameStatePtr state = this->getGamePython(i)->state;
+            if (state == nullptr) continue;
+            if (state->gameVariables.size() != static_cast<size_t>(shape[1]))
+                throw pyb::value_error("All games have to use the same number of game variables.");
+            DoomGamePython::copyVectorInto(data + i * rowSize, type, state->gameVariables);
+        }
+
+        return numpyArray;
+    }
+
+    DoomGamePython* VectorDoomGamePython::getGame(unsigned int index) {
+        return static_cast<DoomGamePython *>(VectorDoomGame::getGame(index));
+    }
+
+    // These functions are wrapped for manual GIL management
+    bool VectorDoomGamePython::init() {
+        ReleaseGIL gil = ReleaseGIL();
+        return VectorDoomGame::init();
+    }
+
+    void VectorDoomGamePython::newEpisodes() {
+        ReleaseGIL gil = ReleaseGIL();
+        VectorDoomGame::newEpisodes();
+    }
+
+    void VectorDoomGamePython::setPool(DoomGamePoolPython *pool) {
+        VectorDoomGame::setPool(pool);
+    }
+
+
+    DoomGamePython* VectorDoomGamePython::getGamePython(size_t index) {
+        return static_cast<DoomGamePython *>(this->games[index].get());
+    }
+
+    pyb::object VectorDoomGamePython::stackBuffers(unsigned int region, bool color) {
+        if (!this->isRunning()) throw ViZDoomIsNotRunningException();
+
+        DoomGamePython *firstGame = this->getGamePython(0);
+        firstGame->updateBuffersShapes();
+        int dims = 2;
+        npy_intp *bufferShape = firstGame->grayShape;
+        if (color) {
+            bufferShape = firstGame->colorShape;
+            if (firstGame->getScreenChannels() != 1) dims = 3;
+        }
+
+        for (size_t i = 0; i < this->games.size(); ++i) {
+            DoomGamePython *game = this->getGamePython(i);
+            if (game->getScreenSize() != firstGame->getScreenSize()
+                || game->getScreenFormat() != firstGame->getScreenFormat())
+                throw pyb::value_error("All games have to use the same screen resolution and format.");
+        }
+
+        return this->stackBuffers(region, dims, bufferShape, NPY_UBYTE);
+    }
+
+    pyb::object VectorDoomGamePython::stackBuffers(unsigned int region, int dims, npy_intp *bufferShape, int type) {
+        npy_intp shape[4];
+        shape[0] = this->games.size();
+        std::copy(bufferShape, bufferShape + dims, shape + 1);
+
+        PyObject *pyArray = PyArray_SimpleNew(dims + 1, shape, type);
+        pyb::object numpyArray = pyb::reinterpret_steal<pyb::object>(pyb::handle(pyArray));
+        uint8_t *data = static_cast<uint8_t *>(PyArray_DATA(reinterpret_cast<PyArrayObject *>(pyArray)));
+        size_t size = PyArray_NBYTES(reinterpret_cast<PyArrayObject *>(pyArray)) / this->games.size();
+
+        std::vector<const void *> sources(this->games.size());
+        for (size_t i = 0; i < this->games.size(); ++i) {
+            SMRegion *smRegion = this->getGamePython(i)->doomController->getSMRegion(region);
+            if (smRegion == nullptr || smRegion->address == nullptr) return pyb::none();
+            if (smRegion->size != size) throw pyb::value_error("All games have to use buffers of the same shape.");
+            sources[i] = smRegion->address;
+        }
+
+        {
+            ReleaseGIL gil = ReleaseGIL();
+            for (size_t i = 0; i < sources.size(); ++i) std::memcpy(data + i * size, sources[i], size);
+        }
+
+        return numpyArray;
+    }
+
+    template<class T, class U> pyb::object VectorDoomGamePython::vectorToNumpyArray(const std::vector<T>& vector, int type) {
+        npy_intp shape = vector.size();
+        PyObject *pyArray = PyArray_SimpleNew(1, &shape, type);
+        U *data = static_cast<U *>(PyArray_DATA(reinterpret_cast<PyArrayObject *>(pyArray)));
+        for (size_t i = 0; i < vector.size(); ++i) data[i] = static_cast<U>(vector[i]);
+
+        return pyb::reinterpret_steal<pyb::object>(pyb::handle(pyArray));
+    }
+
+
+    DoomGamePoolPython::DoomGamePoolPython(unsigned int maxSize) : DoomGamePool(maxSize) {}
+
+    unsigned int DoomGamePoolPython::launch(DoomGamePython &game, unsigned int count) {
+        ReleaseGIL gil = ReleaseGIL();
+        return DoomGamePool::launch(game, count);
+    }
+
+    void DoomGamePoolPython::clear() {
+        ReleaseGIL gil = ReleaseGIL();
+        DoomGamePool::clear();
+    }
 }
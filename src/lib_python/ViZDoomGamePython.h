@@ -26,6 +26,8 @@
 #define NPY_NO_DEPRECATED_API NPY_1_8_API_VERSION
 
 #include "ViZDoomGame.h"
+#include "ViZDoomGamePool.h"
+#include "ViZDoomVectorGame.h"
 
 #include <iostream>
 #include <Python.h>
@@ -34,12 +36,15 @@
 #include <pybind11/stl.h>
 #include <numpy/ndarrayobject.h>
 #include <numpy/npy_math.h>
+#include <unordered_map>
 #include <vector>
 
 namespace vizdoom {
 
     namespace pyb = pybind11;
 
+    struct SMRegion;
+
     class ReleaseGIL {
     public:
         inline ReleaseGIL(){
@@ -69,7 +74,7 @@ namespace vizdoom {
     struct SectorPython {
         double floorHeight;
         double ceilingHeight;
-        pyb::list lines;
+        pyb::tuple lines;
     };
 
     struct GameStatePython {
@@ -83,10 +88,13 @@ namespace vizdoom {
         pyb::object depthBuffer;
         pyb::object labelsBuffer;
         pyb::object automapBuffer;
+        pyb::object observationBuffer;
 
-        pyb::list labels;
-        pyb::list objects;
-        pyb::list sectors;
+        // Lists of objects or NumPy structured arrays in array state mode
+        pyb::object labels;
+        pyb::object objects;
+        pyb::object sectors;
+        pyb::object lines;
     };
 
     struct ServerStatePython {
@@ -100,17 +108,32 @@ namespace vizdoom {
         pyb::list playersLastKillTic;
     };
 
+    class DoomGamePoolPython;
+
     class DoomGamePython : public DoomGame {
 
     public:
         DoomGamePython();
 
-        void setAction(pyb::list const &pyAction);
-        double makeAction(pyb::list const &pyAction, unsigned int tics = 1);
+        void setAction(pyb::object const &pyAction);
+        double makeAction(pyb::object const &pyAction, unsigned int tics = 1);
+        void makeActionAsync(pyb::object const &pyAction, unsigned int tics = 1);
+
+        void setActionIndex(unsigned int index);
+        double makeActionIndex(unsigned int index, unsigned int tics = 1);
+        pyb::object getActionTable();
+        void setActionTable(pyb::object const &pyActions);
 
         GameStatePython* getState();
+        bool getStateInto(pyb::object const &screen, pyb::object const &depth, pyb::object const &labels,
+                          pyb::object const &automap, pyb::object const &gameVariables,
+                          pyb::object const &observation);
         ServerStatePython* getServerState();
         pyb::list getLastAction();
+        pyb::object getLastActionArray();
+
+        pyb::bytes saveState();
+        void loadState(pyb::bytes const &pyState);
 
         pyb::list getAvailableButtons();
         void setAvailableButtons(pyb::list const &pyButtons);
@@ -118,9 +141,34 @@ namespace vizdoom {
         pyb::list getAvailableGameVariables();
         void setAvailableGameVariables(pyb::list const &pyGameVariables);
 
+        bool isZeroCopyStateEnabled();
+        void setZeroCopyStateEnabled(bool zeroCopyState);
+
+        bool isFloat32ArraysEnabled();
+        void setFloat32ArraysEnabled(bool float32Arrays);
+
+        bool isArrayStateEnabled();
+        void setArrayStateEnabled(bool arrayState);
+        pyb::list getObjectNames();
+        pyb::list getNearestObjects(std::string const &name, unsigned int count = 1);
+
+        pyb::object getObservationShape();
+
+        pyb::dict getPerformanceStats(bool reset = false);
+
+        DoomGamePoolPython* getPool();
+        void setPool(DoomGamePoolPython *pool);
+
+        void setFrameStack(unsigned int size, bool maxPool = false);
+        unsigned int getFrameStackSize();
+        pyb::object getFrameStack();
+        pyb::tuple makeActionStacked(pyb::object const &pyAction, unsigned int tics = 1);
+
         // These functions are wrapped for manual GIL management
         void init();
+        void close();
         void advanceAction(unsigned int tics = 1, bool updateState = true);
+        double wait();
         void respawnPlayer();
 
         // Overloaded functions instead of default arguments for pybind11
@@ -128,9 +176,6 @@ namespace vizdoom {
         void newEpisode_() { this->newEpisode(); };
         void newEpisode_str(std::string _str) { this->newEpisode(_str); };
 
-        double makeAction_list(pyb::list const &_list){ return this->makeAction(_list); }
-        double makeAction_list_int(pyb::list const &_list, unsigned int _int){ return this->makeAction(_list, _int); }
-
         void advanceAction_() { this->advanceAction(); }
         void advanceAction_int(unsigned int _int) { this->advanceAction(_int); }
         void advanceAction_int_bool(unsigned int _int, bool _bool) { this->advanceAction(_int, _bool); }
@@ -146,13 +191,133 @@ namespace vizdoom {
 
         npy_intp colorShape[3];
         npy_intp grayShape[2];
+        npy_intp observationShape[3];
+        int observationDims;
+        int observationType;
 
         void updateBuffersShapes();
 
+        /* Zero-copy views of buffers in SM */
+        pyb::object screenBufferView;
+        pyb::object depthBufferView;
+        pyb::object labelsBufferView;
+        pyb::object automapBufferView;
+        pyb::object observationBufferView;
+
+        void clearBuffersViews();
+        pyb::object getBufferView(pyb::object &view, unsigned int region, int dims, npy_intp *shape,
+                                  int type = NPY_UBYTE);
+
+        /* Actions are converted into this vector, so no memory is allocated per step */
+        std::vector<double> actionVector;
+        void pyActionToVector(pyb::object const &pyAction);
+        static std::vector<std::vector<double>> pyActionsToTable(pyb::object const &pyActions);
+
+        /* Game variables and the last action as float32 instead of float64 arrays */
+        bool float32Arrays;
+        int arraysType() { return this->float32Arrays ? NPY_FLOAT32 : NPY_DOUBLE; }
+        std::vector<float> gameVariablesFloat;
+        pyb::object gameVariablesArray;
+        pyb::object lastActionArray;
+
+        pyb::object vectorToArray(std::vector<double> const &vector);
+        pyb::object vectorToReusableArray(pyb::object &array, std::vector<double> const &vector);
+        static void copyVectorInto(void *data, int type, std::vector<double> const &vector);
+
+        /* Frame stack, ring buffer of 2 * size frames, every frame is written twice (at pos and pos + size),
+         * so the last size frames are always contiguous and can be returned as a view without copying */
+        unsigned int frameStackSize;
+        unsigned int frameStackPos;
+        size_t frameStackFrameSize;
+        std::shared_ptr<std::vector<uint8_t>> frameStack;
+        std::vector<pyb::object> frameStackViews;
+
+        void updateState() override;
+        void pushFrame(bool fill);
+
+        /* Lines of sectors shared by all states until the geometry of the map changes */
+        std::vector<pyb::tuple> sectorsLines;
+        unsigned int sectorsLinesVersion;
+
+        /* Array state mode, labels, objects and sectors are read from SM into NumPy structured arrays */
+        bool arrayState;
+        pyb::object labelDtype;
+        pyb::object objectDtype;
+        pyb::object sectorDtype;
+        pyb::object linesArray;
+        unsigned int linesArrayVersion;
+
+        // Names of objects are stored in arrays as indices into this list
+        pyb::list objectNames;
+        std::unordered_map<std::string, unsigned int> objectNamesIds;
+        unsigned int getObjectNameId(const char *name);
+
+        void initArrayDtypes();
+        pyb::object labelsToArray();
+        pyb::object objectsToArray();
+        pyb::object sectorsToArray();
+        static pyb::object newArray(pyb::object const &dtype, npy_intp size);
+
         template<class T> static pyb::list vectorToPyList(const std::vector<T>& vector);
         template<class T> static std::vector<T> pyListToVector(pyb::list const &pyList);
 
         pyb::object dataToNumpyArray(int dims, npy_intp *shape, int type, void *data);
+        static void dataToNumpyArrayInto(pyb::object const &pyArray, std::string name, int dims, npy_intp *shape, int type, void *data);
+        pyb::object regionToNumpyView(int dims, npy_intp *shape, int type, SMRegion *region);
+
+        friend class VectorDoomGamePython;
+
+    };
+
+    class VectorDoomGamePython : public VectorDoomGame {
+
+    public:
+        VectorDoomGamePython(unsigned int size);
+
+        pyb::object makeActions(pyb::object const &pyActions, unsigned int tics = 1);
+        pyb::tuple step(pyb::object const &pyActions, unsigned int tics = 1);
+        pyb::object makeActionsIndex(pyb::object const &pyIndices, unsigned int tics = 1);
+        pyb::tuple stepIndex(pyb::object const &pyIndices, unsigned int tics = 1);
+        void setActionTable(pyb::object const &pyActions);
+        void setPool(DoomGamePoolPython *pool);
+
+        pyb::object getEpisodesFinished();
+        pyb::object getLastRewards();
+        pyb::object getFinishedTotalRewards();
+
+        pyb::object getScreenBuffers();
+        pyb::object getDepthBuffers();
+        pyb::object getLabelsBuffers();
+        pyb::object getAutomapBuffers();
+        pyb::object getObservationBuffers();
+        pyb::object getGameVariables();
+
+        DoomGamePython* getGame(unsigned int index);
+
+        // These functions are wrapped for manual GIL management
+        bool init();
+        void newEpisodes();
+
+    private:
+        DoomGamePython* getGamePython(size_t index);
+
+        pyb::object stackBuffers(unsigned int region, bool color);
+        pyb::object stackBuffers(unsigned int region, int dims, npy_intp *bufferShape, int type);
+        template<class T, class U> static pyb::object vectorToNumpyArray(const std::vector<T>& vector, int type);
+
+        // Indices of actions are converted into this vector, so no memory is allocated per step
+        std::vector<unsigned int> actionIndices;
+
+    };
+
+    class DoomGamePoolPython : public DoomGamePool {
+
+    public:
+        DoomGamePoolPython(unsigned int maxSize = 0);
+
+        // These functions are wrapped for manual GIL management
+        unsigned int launch(DoomGamePython &game, unsigned int count = 1);
+        void clear();
 
     };
 
@@ -421,6 +421,13 @@ PYBIND11_MODULE(vizdoom, vz){
         .def_readonly("ceiling_height", &SECTOR_CLASS::ceilingHeight)
         .def_readonly("lines", &SECTOR_CLASS::lines);
 
+    #define PERFORMANCE_STAT_CLASS PerformanceStat
+    class_<PERFORMANCE_STAT_CLASS>(vz, "PerformanceStat")
+        .def_readonly("stage", &PERFORMANCE_STAT_CLASS::stage)
+        .def_readonly("count", &PERFORMANCE_STAT_CLASS::count)
+        .def_readonly("total", &PERFORMANCE_STAT_CLASS::total)
+        .def_readonly("last", &PERFORMANCE_STAT_CLASS::last);
+
     class_<GameStatePython>(vz, "GameState")
         .def_readonly("number", &GameStatePython::number)
         .def_readonly("tic", &GameStatePython::tic)
@@ -430,10 +437,12 @@ PYBIND11_MODULE(vizdoom, vz){
         .def_readonly("depth_buffer", &GameStatePython::depthBuffer)
         .def_readonly("labels_buffer", &GameStatePython::labelsBuffer)
         .def_readonly("automap_buffer", &GameStatePython::automapBuffer)
+        .def_readonly("observation_buffer", &GameStatePython::observationBuffer)
 
         .def_readonly("labels", &GameStatePython::labels)
         .def_readonly("objects", &GameStatePython::objects)
-        .def_readonly("sectors", &GameStatePython::sectors);
+        .def_readonly("sectors", &GameStatePython::sectors)
+        .def_readonly("lines", &GameStatePython::lines);
 
     class_<ServerStatePython>(vz, "ServerState")
         .def_readonly("tic", &ServerStatePython::tic)
@@ -466,20 +475,38 @@ PYBIND11_MODULE(vizdoom, vz){
         .def("is_new_episode", &DoomGamePython::isNewEpisode)
         .def("is_player_dead", &DoomGamePython::isPlayerDead)
         .def("respawn_player", &DoomGamePython::respawnPlayer)
-        .def("set_action", &DoomGamePython::setAction)
-        .def("make_action", &DoomGamePython::makeAction_list)
-        .def("make_action", &DoomGamePython::makeAction_list_int)
+        .def("set_action", &DoomGamePython::setAction, arg("action"))
+        .def("make_action", &DoomGamePython::makeAction, arg("action"), arg("tics") = 1)
+        .def("make_action_stacked", &DoomGamePython::makeActionStacked, arg("action"), arg("tics") = 1)
+        .def("make_action_async", &DoomGamePython::makeActionAsync, arg("action"), arg("tics") = 1)
+        .def("set_action_index", &DoomGamePython::setActionIndex, arg("index"))
+        .def("make_action_index", &DoomGamePython::makeActionIndex, arg("index"), arg("tics") = 1)
+        .def("poll", &DoomGamePython::poll)
+        .def("wait", &DoomGamePython::wait)
         .def("advance_action", &DoomGamePython::advanceAction_)
         .def("advance_action", &DoomGamePython::advanceAction_int)
         .def("advance_action", &DoomGamePython::advanceAction_int_bool)
-        //.def("save_state", &DoomGamePython::saveState)
-        //.def("load_state", &DoomGamePython::loadState)
+        .def("save_state", &DoomGamePython::saveState)
+        .def("load_state", &DoomGamePython::loadState)
 
         .def("get_state", &DoomGamePython::getState, return_value_policy::take_ownership)
+        .def("get_state_into", &DoomGamePython::getStateInto, arg("screen") = none(), arg("depth") = none(),
+             arg("labels") = none(), arg("automap") = none(), arg("game_variables") = none(),
+             arg("observation") = none())
+        .def("is_zero_copy_state_enabled", &DoomGamePython::isZeroCopyStateEnabled)
+        .def("set_zero_copy_state_enabled", &DoomGamePython::setZeroCopyStateEnabled)
+        .def("is_float32_arrays_enabled", &DoomGamePython::isFloat32ArraysEnabled)
+        .def("set_float32_arrays_enabled", &DoomGamePython::setFloat32ArraysEnabled)
+        .def("is_array_state_enabled", &DoomGamePython::isArrayStateEnabled)
+        .def("set_array_state_enabled", &DoomGamePython::setArrayStateEnabled)
+        .def("get_object_names", &DoomGamePython::getObjectNames)
         .def("get_server_state", &DoomGamePython::getServerState, return_value_policy::take_ownership)
 
         .def("get_game_variable", &DoomGamePython::getGameVariable)
         .def("get_button", &DoomGamePython::getButton)
+        .def("get_action_table", &DoomGamePython::getActionTable)
+        .def("set_action_table", &DoomGamePython::setActionTable, arg("actions"))
+        .def("get_action_table_size", &DoomGamePython::getActionTableSize)
 
         .def("get_living_reward", &DoomGamePython::getLivingReward)
         .def("set_living_reward", &DoomGamePython::setLivingReward)
@@ -491,6 +518,7 @@ PYBIND11_MODULE(vizdoom, vz){
         .def("get_total_reward", &DoomGamePython::getTotalReward)
 
         .def("get_last_action", &DoomGamePython::getLastAction)
+        .def("get_last_action_array", &DoomGamePython::getLastActionArray)
 
         .def("get_available_game_variables", &DoomGamePython::getAvailableGameVariables)
         .def("set_available_game_variables", &DoomGamePython::setAvailableGameVariables)
@@ -517,6 +545,21 @@ PYBIND11_MODULE(vizdoom, vz){
 
         .def("get_ticrate", &DoomGamePython::getTicrate)
         .def("set_ticrate", &DoomGamePython::setTicrate)
+        .def("is_shared_memory_sync_enabled", &DoomGamePython::isSharedMemorySyncEnabled)
+        .def("set_shared_memory_sync_enabled", &DoomGamePython::setSharedMemorySyncEnabled)
+        .def("is_action_notification_enabled", &DoomGamePython::isActionNotificationEnabled)
+        .def("set_action_notification_enabled", &DoomGamePython::setActionNotificationEnabled)
+        .def("get_action_notification_fd", &DoomGamePython::getActionNotificationFd)
+        .def("is_fork_server_enabled", &DoomGamePython::isForkServerEnabled)
+        .def("set_fork_server_enabled", &DoomGamePython::setForkServerEnabled)
+        .def("is_shared_resources_enabled", &DoomGamePython::isSharedResourcesEnabled)
+        .def("set_shared_resources_enabled", &DoomGamePython::setSharedResourcesEnabled)
+        .def("is_performance_stats_enabled", &DoomGamePython::isPerformanceStatsEnabled)
+        .def("set_performance_stats_enabled", &DoomGamePython::setPerformanceStatsEnabled)
+        .def("get_performance_stats", &DoomGamePython::getPerformanceStats, arg("reset") = false)
+        .def("reset_performance_stats", &DoomGamePython::resetPerformanceStats)
+        .def("get_pool", &DoomGamePython::getPool, return_value_policy::reference)
+        .def("set_pool", &DoomGamePython::setPool, arg("pool"), keep_alive<1, 2>())
 
         .def("set_vizdoom_path", &DoomGamePython::setViZDoomPath)
         .def("set_doom_game_path", &DoomGamePython::setDoomGamePath)
@@ -532,6 +575,8 @@ PYBIND11_MODULE(vizdoom, vz){
         .def("set_episode_start_time", &DoomGamePython::setEpisodeStartTime)
         .def("get_episode_timeout", &DoomGamePython::getEpisodeTimeout)
         .def("set_episode_timeout", &DoomGamePython::setEpisodeTimeout)
+        .def("is_fast_reset_enabled", &DoomGamePython::isFastResetEnabled)
+        .def("set_fast_reset_enabled", &DoomGamePython::setFastResetEnabled)
         .def("get_episode_time", &DoomGamePython::getEpisodeTime)
 
         .def("set_console_enabled",&DoomGamePython::setConsoleEnabled)
@@ -540,6 +585,20 @@ PYBIND11_MODULE(vizdoom, vz){
         .def("set_screen_resolution", &DoomGamePython::setScreenResolution)
         .def("set_screen_format", &DoomGamePython::setScreenFormat)
 
+        .def("is_screen_buffer_enabled", &DoomGamePython::isScreenBufferEnabled)
+        .def("set_screen_buffer_enabled", &DoomGamePython::setScreenBufferEnabled)
+        .def("is_observation_enabled", &DoomGamePython::isObservationEnabled)
+        .def("set_observation_shape", &DoomGamePython::setObservationShape, arg("height"), arg("width"),
+             arg("grayscale") = false, arg("nearest_resampling") = false, arg("float_values") = false)
+        .def("get_observation_shape", &DoomGamePython::getObservationShape)
+        .def("get_observation_width", &DoomGamePython::getObservationWidth)
+        .def("get_observation_height", &DoomGamePython::getObservationHeight)
+        .def("get_observation_channels", &DoomGamePython::getObservationChannels)
+        .def("is_observation_max_pool_enabled", &DoomGamePython::isObservationMaxPoolEnabled)
+        .def("set_observation_max_pool_enabled", &DoomGamePython::setObservationMaxPoolEnabled)
+        .def("get_frame_stack_size", &DoomGamePython::getFrameStackSize)
+        .def("set_frame_stack", &DoomGamePython::setFrameStack, arg("size"), arg("max_pool") = false)
+        .def("get_frame_stack", &DoomGamePython::getFrameStack)
         .def("is_depth_buffer_enabled", &DoomGamePython::isDepthBufferEnabled)
         .def("set_depth_buffer_enabled", &DoomGamePython::setDepthBufferEnabled)
         .def("is_labels_buffer_enabled", &DoomGamePython::isLabelsBufferEnabled)
@@ -553,6 +612,9 @@ PYBIND11_MODULE(vizdoom, vz){
         .def("set_objects_info_enabled", &DoomGamePython::setObjectsInfoEnabled)
         .def("is_sectors_info_enabled", &DoomGamePython::isSectorsInfoEnabled)
         .def("set_sectors_info_enabled", &DoomGamePython::setSectorsInfoEnabled)
+        .def("set_objects_filter", &DoomGamePython::setObjectsFilter, arg("radius"), arg("max_count") = 0,
+             arg("names") = std::vector<std::string>(), arg("exclude_names") = false)
+        .def("get_nearest_objects", &DoomGamePython::getNearestObjects, arg("name"), arg("count") = 1)
 
         .def("set_render_hud", &DoomGamePython::setRenderHud)
         .def("set_render_minimal_hud", &DoomGamePython::setRenderMinimalHud)
@@ -574,6 +636,52 @@ PYBIND11_MODULE(vizdoom, vz){
         .def("get_screen_format", &DoomGamePython::getScreenFormat);
 
 
+    /* VectorDoomGame */
+    /*----------------------------------------------------------------------------------------------------------------*/
+
+    class_<VectorDoomGamePython>(vz, "VectorDoomGame")
+        .def(init<unsigned int>(), arg("size"))
+        .def("init", &VectorDoomGamePython::init)
+        .def("load_config", &VectorDoomGamePython::loadConfig)
+        .def("close", &VectorDoomGamePython::close)
+        .def("is_running", &VectorDoomGamePython::isRunning)
+        .def("new_episodes", &VectorDoomGamePython::newEpisodes)
+        .def("make_actions", &VectorDoomGamePython::makeActions, arg("actions"), arg("tics") = 1)
+        .def("make_actions_index", &VectorDoomGamePython::makeActionsIndex, arg("indices"), arg("tics") = 1)
+        .def("step", &VectorDoomGamePython::step, arg("actions"), arg("tics") = 1)
+        .def("step_index", &VectorDoomGamePython::stepIndex, arg("indices"), arg("tics") = 1)
+
+        .def("get_episodes_finished", &VectorDoomGamePython::getEpisodesFinished)
+        .def("get_last_rewards", &VectorDoomGamePython::getLastRewards)
+        .def("get_finished_total_rewards", &VectorDoomGamePython::getFinishedTotalRewards)
+
+        .def("get_screen_buffers", &VectorDoomGamePython::getScreenBuffers)
+        .def("get_depth_buffers", &VectorDoomGamePython::getDepthBuffers)
+        .def("get_labels_buffers", &VectorDoomGamePython::getLabelsBuffers)
+        .def("get_automap_buffers", &VectorDoomGamePython::getAutomapBuffers)
+        .def("get_observation_buffers", &VectorDoomGamePython::getObservationBuffers)
+        .def("get_game_variables", &VectorDoomGamePython::getGameVariables)
+
+        .def("get_size", &VectorDoomGamePython::getSize)
+        .def("get_game", &VectorDoomGamePython::getGame, return_value_policy::reference_internal)
+        .def("set_action_table", &VectorDoomGamePython::setActionTable, arg("actions"))
+        .def("set_pool", &VectorDoomGamePython::setPool, arg("pool"), keep_alive<1, 2>())
+        .def("is_auto_reset_enabled", &VectorDoomGamePython::isAutoResetEnabled)
+        .def("set_auto_reset_enabled", &VectorDoomGamePython::setAutoResetEnabled);
+
+
+    /* DoomGamePool */
+    /*----------------------------------------------------------------------------------------------------------------*/
+
+    class_<DoomGamePoolPython>(vz, "DoomGamePool")
+        .def(init<unsigned int>(), arg("max_size") = 0)
+        .def("launch", &DoomGamePoolPython::launch, arg("game"), arg("count") = 1)
+        .def("clear", &DoomGamePoolPython::clear)
+        .def("get_size", &DoomGamePoolPython::getSize)
+        .def("get_max_size", &DoomGamePoolPython::getMaxSize)
+        .def("set_max_size", &DoomGamePoolPython::setMaxSize, arg("max_size"));
+
+
     /* Utilities */
     /*----------------------------------------------------------------------------------------------------------------*/
 
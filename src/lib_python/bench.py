@@ -0,0 +1,339 @@
+"""
+Throughput benchmark of ViZDoom.
+
+Runs a sweep over scenarios, screen resolutions, screen formats, enabled buffers, frame skips and numbers
+of instances, and reports steps per second, p50/p99 step latency, memory usage and CPU usage of every
+combination. Results can be written to a JSON file and compared with results of another build:
+
+    python -m vizdoom.bench --output new.json --compare old.json
+
+psutil is used to measure memory and CPU usage of the engine processes if it is installed,
+otherwise only the Python process is measured.
+"""
+
+from __future__ import print_function
+
+import itertools as _itertools
+import json as _json
+import os as _os
+import platform as _platform
+import sys as _sys
+import time as _time
+from argparse import ArgumentParser as _ArgumentParser
+
+import numpy as _np
+
+import vizdoom as _vzd
+
+try:
+    import psutil as _psutil
+except ImportError:
+    _psutil = None
+
+try:
+    import resource as _resource
+except ImportError:
+    _resource = None
+
+
+DEFAULT_SCENARIOS = ["basic", "deadly_corridor", "defend_the_center", "health_gathering", "deathmatch", "my_way_home"]
+DEFAULT_RESOLUTIONS = ["RES_160X120", "RES_320X240"]
+DEFAULT_FORMATS = ["CRCGCB"]
+DEFAULT_FEATURES = ["none", "all"]
+DEFAULT_FRAME_SKIPS = [1, 4]
+DEFAULT_INSTANCES = [1]
+DEFAULT_STEPS = 1000
+DEFAULT_WARMUP = 100
+DEFAULT_SEED = 1
+DEFAULT_THRESHOLD = 5.0
+
+FEATURES = ["depth", "labels", "automap", "objects", "sectors"]
+
+_FEATURE_SETTERS = {
+    "depth": "set_depth_buffer_enabled",
+    "labels": "set_labels_buffer_enabled",
+    "automap": "set_automap_buffer_enabled",
+    "objects": "set_objects_info_enabled",
+    "sectors": "set_sectors_info_enabled",
+}
+
+
+def parse_features(features):
+    """
+    Parses comma separated list of features (see FEATURES), "none" and "all" are also accepted.
+    """
+    if features == "none":
+        return []
+    if features == "all":
+        return list(FEATURES)
+    parsed = [f.strip() for f in features.split(",") if f.strip()]
+    for f in parsed:
+        if f not in FEATURES:
+            raise ValueError("Unknown feature: '{}', available features: {}".format(f, ", ".join(FEATURES)))
+    return parsed
+
+
+def _config_path(scenario):
+    if _os.path.isfile(scenario):
+        return scenario
+    return _os.path.join(_vzd.scenarios_path, scenario + ".cfg")
+
+
+def _configure(game, config, resolution, screen_format, features, seed):
+    game.load_config(config)
+    game.set_window_visible(False)
+    game.set_mode(_vzd.Mode.PLAYER)
+    game.set_screen_resolution(getattr(_vzd.ScreenResolution, resolution))
+    game.set_screen_format(getattr(_vzd.ScreenFormat, screen_format))
+    for f in FEATURES:
+        getattr(game, _FEATURE_SETTERS[f])(f in features)
+    game.set_seed(seed)
+
+
+class _UsageMeter(object):
+    """
+    Measures CPU time and memory of the Python process and the engines (its child processes).
+    """
+
+    def __init__(self):
+        self.process = _psutil.Process() if _psutil is not None else None
+
+    def _processes(self):
+        processes = [self.process]
+        try:
+            processes.extend(self.process.children(recursive=True))
+        except _psutil.Error:
+            pass
+        return processes
+
+    def cpu_time(self):
+        if self.process is None:
+            times = _os.times()
+            return times[0] + times[1]
+        total = 0.0
+        for p in self._processes():
+            try:
+                times = p.cpu_times()
+                total += times.user + times.system
+            except _psutil.Error:
+                pass
+        return total
+
+    def rss(self):
+        """
+        Returns resident set size in MB or None if it can't be measured.
+        """
+        if self.process is None:
+            if _resource is None:
+                return None
+            # Peak of the Python process only, ru_maxrss is in bytes on macOS and in KB elsewhere
+            max_rss = _resource.getrusage(_resource.RUSAGE_SELF).ru_maxrss
+            return max_rss / (1024.0 * 1024.0) if _sys.platform == "darwin" else max_rss / 1024.0
+        total = 0
+        for p in self._processes():
+            try:
+                total += p.memory_info().rss
+            except _psutil.Error:
+                pass
+        return total / (1024.0 * 1024.0)
+
+
+def run(scenario, resolution="RES_160X120", screen_format="CRCGCB", features=(), frame_skip=1, instances=1,
+        steps=DEFAULT_STEPS, warmup=DEFAULT_WARMUP, seed=DEFAULT_SEED, get_state=True):
+    """
+    Runs a single benchmark and returns its result as a dictionary.
+    Steps of all instances are made with VectorDoomGame if more than one instance is used,
+    then steps per second are counted for all instances together.
+    """
+    config = _config_path(scenario)
+    features = list(features)
+    rng = _np.random.RandomState(seed)
+
+    if instances > 1:
+        game = _vzd.VectorDoomGame(instances)
+        games = [game.get_game(i) for i in range(instances)]
+        for i, g in enumerate(games):
+            _configure(g, config, resolution, screen_format, features, seed + i)
+    else:
+        game = _vzd.DoomGame()
+        games = [game]
+        _configure(game, config, resolution, screen_format, features, seed)
+
+    game.init()
+    buttons = games[0].get_available_buttons_size()
+    actions = _np.eye(buttons)
+
+    if instances > 1:
+        def step():
+            game.step(actions[rng.randint(buttons, size=instances)], frame_skip)
+    else:
+        def step():
+            if game.is_episode_finished():
+                game.new_episode()
+            if get_state:
+                game.get_state()
+            game.make_action(actions[rng.randint(buttons)], frame_skip)
+
+    meter = _UsageMeter()
+    try:
+        for _ in range(warmup):
+            step()
+
+        latencies = _np.empty(steps)
+        cpu_start = meter.cpu_time()
+        start = _time.perf_counter()
+        for i in range(steps):
+            step_start = _time.perf_counter()
+            step()
+            latencies[i] = _time.perf_counter() - step_start
+        wall = _time.perf_counter() - start
+        cpu = meter.cpu_time() - cpu_start
+        rss = meter.rss()
+    finally:
+        game.close()
+
+    return {
+        "scenario": scenario,
+        "resolution": resolution,
+        "format": screen_format,
+        "features": features,
+        "frame_skip": frame_skip,
+        "instances": instances,
+        "steps": steps,
+        "steps_per_sec": steps * instances / wall,
+        "tics_per_sec": steps * instances * frame_skip / wall,
+        "latency_p50_ms": float(_np.percentile(latencies, 50)) * 1000,
+        "latency_p99_ms": float(_np.percentile(latencies, 99)) * 1000,
+        "rss_mb": rss,
+        "cpu_percent": 100 * cpu / wall,
+    }
+
+
+def result_key(result):
+    """
+    Returns a key identifying the benchmark cell of the result.
+    """
+    return (result["scenario"], result["resolution"], result["format"], ",".join(result["features"]) or "none",
+            result["frame_skip"], result["instances"])
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares steps per second of results with a baseline (list of results or results file),
+    returns a list of (key, baseline steps/s, steps/s, change in %) and a list of keys of regressions
+    (cells slower by more than threshold %).
+    """
+    if isinstance(baseline, str):
+        with open(baseline) as f:
+            baseline = _json.load(f)["results"]
+
+    baseline = {result_key(r): r for r in baseline}
+    changes, regressions = [], []
+    for r in results:
+        key = result_key(r)
+        if key not in baseline:
+            continue
+        old, new = baseline[key]["steps_per_sec"], r["steps_per_sec"]
+        change = 100 * (new - old) / old
+        changes.append((key, old, new, change))
+        if change < -threshold:
+            regressions.append(key)
+    return changes, regressions
+
+
+def system_info():
+    return {
+        "vizdoom_version": _vzd.__version__,
+        "python_version": _platform.python_version(),
+        "platform": _platform.platform(),
+        "machine": _platform.machine(),
+        "cpu_count": _os.cpu_count(),
+        "psutil": _psutil is not None,
+        "time": _time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def _format_key(key):
+    return "{:<20} {:<12} {:<8} {:<34} skip {:<2} x{:<3}".format(*key)
+
+
+def main(argv=None):
+    parser = _ArgumentParser("python -m vizdoom.bench",
+                             description="ViZDoom throughput benchmark. Every combination of the given options is run.")
+    parser.add_argument("-s", "--scenarios", nargs="+", default=DEFAULT_SCENARIOS,
+                        help="Names of shipped scenarios or paths to configuration files")
+    parser.add_argument("-r", "--resolutions", nargs="+", default=DEFAULT_RESOLUTIONS,
+                        help="Screen resolutions, e.g. RES_160X120")
+    parser.add_argument("-f", "--formats", nargs="+", default=DEFAULT_FORMATS,
+                        help="Screen formats, e.g. CRCGCB")
+    parser.add_argument("-b", "--features", nargs="+", default=DEFAULT_FEATURES,
+                        help="Sets of enabled buffers and information, each comma separated list of: {}, "
+                             "or 'none' or 'all'".format(", ".join(FEATURES)))
+    parser.add_argument("-k", "--frame-skips", nargs="+", type=int, default=DEFAULT_FRAME_SKIPS,
+                        help="Numbers of tics per action")
+    parser.add_argument("-n", "--instances", nargs="+", type=int, default=DEFAULT_INSTANCES,
+                        help="Numbers of instances stepped together with VectorDoomGame")
+    parser.add_argument("-i", "--steps", type=int, default=DEFAULT_STEPS,
+                        help="Number of measured steps of every benchmark")
+    parser.add_argument("-w", "--warmup", type=int, default=DEFAULT_WARMUP,
+                        help="Number of steps made before the measurement")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                        help="Seed of the games and random actions")
+    parser.add_argument("--no-state", action="store_true",
+                        help="Don't get the state in every step (single instance only)")
+    parser.add_argument("-o", "--output",
+                        help="Path of the JSON file the results are written to")
+    parser.add_argument("-c", "--compare",
+                        help="Path of the JSON file with results of another build to compare with")
+    parser.add_argument("-t", "--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Slowdown in percents reported as a regression")
+    args = parser.parse_args(argv)
+
+    for r in args.resolutions:
+        if not hasattr(_vzd.ScreenResolution, r):
+            parser.error("Unknown screen resolution: '{}'".format(r))
+    for f in args.formats:
+        if not hasattr(_vzd.ScreenFormat, f):
+            parser.error("Unknown screen format: '{}'".format(f))
+    try:
+        features = [parse_features(f) for f in args.features]
+    except ValueError as e:
+        parser.error(str(e))
+
+    cells = list(_itertools.product(args.scenarios, args.resolutions, args.formats, features,
+                                    args.frame_skips, args.instances))
+    if _psutil is None:
+        print("psutil is not installed, only memory and CPU usage of the Python process is measured.")
+    print("Running {} benchmarks, {} steps each.".format(len(cells), args.steps))
+
+    results = []
+    for scenario, resolution, screen_format, cell_features, frame_skip, instances in cells:
+        result = run(scenario, resolution, screen_format, cell_features, frame_skip, instances,
+                     steps=args.steps, warmup=args.warmup, seed=args.seed, get_state=not args.no_state)
+        results.append(result)
+        print("{} {:10.2f} steps/s, p50 {:7.3f} ms, p99 {:7.3f} ms, RSS {} MB, CPU {:6.1f} %".format(
+            _format_key(result_key(result)), result["steps_per_sec"], result["latency_p50_ms"],
+            result["latency_p99_ms"], "-" if result["rss_mb"] is None else round(result["rss_mb"], 1),
+            result["cpu_percent"]))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            _json.dump({"system": system_info(), "args": vars(args), "results": results}, f, indent=2)
+        print("Results written to {}".format(args.output))
+
+    if args.compare:
+        changes, regressions = compare(results, args.compare, args.threshold)
+        print("Comparison with {}:".format(args.compare))
+        for key, old, new, change in changes:
+            print("{} {:10.2f} -> {:10.2f} steps/s ({:+.1f} %){}".format(
+                _format_key(key), old, new, change, " REGRESSION" if key in regressions else ""))
+        if regressions:
+            print("{} of {} compared benchmarks are slower by more than {} %.".format(
+                len(regressions), len(changes), args.threshold))
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    _sys.exit(main())
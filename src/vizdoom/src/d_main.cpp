@@ -119,7 +119,6 @@ EXTERN_CVAR (Bool, viz_controlled)
 EXTERN_CVAR (Bool, viz_async)
 EXTERN_CVAR (Bool, viz_allow_input)
 EXTERN_CVAR (Bool, viz_nosound)
-EXTERN_CVAR (Bool, viz_render_all)
 
 EXTERN_CVAR(Bool, hud_althud)
 void DrawHUD();
@@ -1254,6 +1253,7 @@ void D_DoomLoop ()
 			}
 
 			// process one or more tics
+			VIZ_StatsClock(VIZ_STATS_TIC);
 			if (singletics) {
 				I_StartTic ();
 				D_ProcessEvents ();
@@ -1272,10 +1272,12 @@ void D_DoomLoop ()
 			else {
 				TryRunTics (); // will run at least one tic
 			}
+			VIZ_StatsUnclock(VIZ_STATS_TIC);
 
 			// Update display, next frame, with current state.
 			I_StartTic ();
-			if(!*viz_controlled || *viz_render_all) D_Display();
+			// Frames of controlled game are rendered by VIZ_Tic, intermediate tics only if viz_render_all is set
+			if(!*viz_controlled) D_Display();
 			if(!*viz_controlled || !*viz_nosound) S_UpdateMusic(); // OpenAL needs this to keep the music running, thanks to a complete lack of a sane streaming implementation using callbacks. :(
 
             VIZ_Tic();
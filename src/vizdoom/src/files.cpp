@@ -44,6 +44,10 @@
 #include "m_misc.h"
 #include "viz_main.h"
 
+#ifndef _WIN32
+#include <sys/mman.h>
+#endif
+
 
 //==========================================================================
 //
@@ -54,18 +58,18 @@
 //==========================================================================
 
 FileReader::FileReader ()
-: File(NULL), Length(0), StartPos(0), FilePos(0), CloseOnDestruct(false)
+: File(NULL), Length(0), StartPos(0), FilePos(0), Mapping(NULL), CloseOnDestruct(false)
 {
 }
 
 FileReader::FileReader (const FileReader &other, long length)
-: File(other.File), Length(length), CloseOnDestruct(false)
+: File(other.File), Length(length), Mapping(NULL), CloseOnDestruct(false)
 {
 	FilePos = StartPos = ftell (other.File);
 }
 
 FileReader::FileReader (const char *filename)
-: File(NULL), Length(0), StartPos(0), FilePos(0), CloseOnDestruct(false)
+: File(NULL), Length(0), StartPos(0), FilePos(0), Mapping(NULL), CloseOnDestruct(false)
 {
 	if (!Open(filename))
 	{
@@ -75,19 +79,26 @@ FileReader::FileReader (const char *filename)
 }
 
 FileReader::FileReader (FILE *file)
-: File(file), Length(0), StartPos(0), FilePos(0), CloseOnDestruct(false)
+: File(file), Length(0), StartPos(0), FilePos(0), Mapping(NULL), CloseOnDestruct(false)
 {
 	Length = CalcFileLen();
 }
 
 FileReader::FileReader (FILE *file, long length)
-: File(file), Length(length), CloseOnDestruct(true)
+: File(file), Length(length), Mapping(NULL), CloseOnDestruct(true)
 {
 	FilePos = StartPos = ftell (file);
 }
 
 FileReader::~FileReader ()
 {
+#ifndef _WIN32
+	if (Mapping != NULL)
+	{
+		munmap (Mapping, Length);
+		Mapping = NULL;
+	}
+#endif
 	if (CloseOnDestruct && File != NULL)
 	{
 		fclose (File);
@@ -112,6 +123,29 @@ void FileReader::ResetFilePtr ()
 	FilePos = ftell (File);
 }
 
+bool FileReader::Map ()
+{
+#ifndef _WIN32
+	// Only whole files can be mapped, not the parts embedded in other files
+	if (Mapping != NULL || File == NULL || StartPos != 0 || Length <= 0)
+	{
+		return Mapping != NULL;
+	}
+
+	// Private writable mapping, so code modifying cached lumps gets its own
+	// copy of the page instead of crashing, unmodified pages stay shared.
+	void *mapping = mmap (NULL, Length, PROT_READ | PROT_WRITE, MAP_PRIVATE, fileno(File), 0);
+	if (mapping == MAP_FAILED)
+	{
+		return false;
+	}
+	Mapping = (char *)mapping;
+	return true;
+#else
+	return false;
+#endif
+}
+
 long FileReader::Tell () const
 {
 	return FilePos - StartPos;
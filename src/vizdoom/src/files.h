@@ -77,7 +77,11 @@ public:
 	void ResetFilePtr ();
 
 	FILE *GetFile () const { return File; }
-	virtual const char *GetBuffer() const { return NULL; }
+	virtual const char *GetBuffer() const { return Mapping; }
+
+	// Maps the whole file read-only (pages are shared with other processes
+	// mapping it), lumps are then taken directly from GetBuffer().
+	bool Map ();
 
 	FileReader &operator>> (BYTE &v)
 	{
@@ -122,6 +126,7 @@ protected:
 	long Length;
 	long StartPos;
 	long FilePos;
+	char *Mapping;
 
 private:
 	long CalcFileLen () const;
@@ -975,6 +975,8 @@ void G_DoLoadLevel (int position, bool autosave)
 
 	level.maptime = 0;
 	P_SetupLevel (level.MapName, position);
+	//VIZDOOM_CODE
+	VIZ_GameStateGeometryChanged();
 
 	AM_LevelInit();
 
@@ -540,6 +540,8 @@ void G_ClearSnapshots (void);
 void P_RemoveDefereds ();
 void G_SnapshotLevel (void);
 void G_UnSnapshotLevel (bool keepPlayers);
+class FArchive;
+void G_SerializeLevel (FArchive &arc, bool hubLoad); //VIZDOOM_CODE
 struct PNGHandle;
 void G_ReadSnapshots (PNGHandle *png);
 void G_WriteSnapshots (FILE *file);
@@ -369,6 +369,33 @@ void FRandom::StaticReadRNGState (PNGHandle *png)
 	}
 }
 
+//VIZDOOM_CODE
+//==========================================================================
+//
+// FRandom :: StaticSerializeRNGState
+//
+// Saves or restores the state of every RNG for in-memory snapshots.
+// Snapshots never leave the process, so the RNGs are stored in the list
+// order, including the unnamed ones, and no CRCs are needed.
+//
+//==========================================================================
+
+void FRandom::StaticSerializeRNGState (FArchive &arc)
+{
+	FRandom *rng;
+
+	arc << rngseed;
+
+	for (rng = FRandom::RNGList; rng != NULL; rng = rng->Next)
+	{
+		arc << rng->idx;
+		for (int i = 0; i < SFMT::N32; ++i)
+		{
+			arc << rng->sfmt.u[i];
+		}
+	}
+}
+
 //==========================================================================
 //
 // FRandom :: StaticFindRNG
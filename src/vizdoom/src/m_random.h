@@ -40,6 +40,7 @@
 #include "sfmt/SFMT.h"
 
 struct PNGHandle;
+class FArchive;
 
 class FRandom
 {
@@ -176,6 +177,7 @@ public:
 	static DWORD StaticSumSeeds ();
 	static void StaticReadRNGState (PNGHandle *png);
 	static void StaticWriteRNGState (FILE *file);
+	static void StaticSerializeRNGState (FArchive &arc); //VIZDOOM_CODE
 	static FRandom *StaticFindRNG(const char *name);
 
 #ifndef NDEBUG
@@ -1076,6 +1076,59 @@ void P_WriteACSVars(FILE *stdfile)
 	GlobalACSStrings.WriteStrings(stdfile, MAKE_ID('a','s','T','r'));
 }
 
+//VIZDOOM_CODE
+//============================================================================
+//
+// P_SerializeACSVars
+//
+// Saves or restores world and global variables and arrays for in-memory
+// snapshots. Unlike savegames, the strings pool is left untouched.
+//
+//============================================================================
+
+static void SerializeArrayVars (FArchive &arc, FWorldGlobalArray *vars, unsigned int count)
+{
+	for (unsigned int i = 0; i < count; ++i)
+	{
+		if (arc.IsStoring())
+		{
+			arc.WriteCount (vars[i].CountUsed());
+
+			FWorldGlobalArray::ConstIterator it(vars[i]);
+			const FWorldGlobalArray::Pair *pair;
+
+			while (it.NextPair (pair))
+			{
+				arc.WriteCount (pair->Key);
+				arc.WriteCount (pair->Value);
+			}
+		}
+		else
+		{
+			DWORD size = arc.ReadCount ();
+
+			vars[i].Clear ();
+			for (DWORD k = 0; k < size; ++k)
+			{
+				SDWORD key, val;
+				key = arc.ReadCount();
+				val = arc.ReadCount();
+				vars[i].Insert (key, val);
+			}
+		}
+	}
+}
+
+void P_SerializeACSVars(FArchive &arc)
+{
+	int i;
+
+	for (i = 0; i < NUM_WORLDVARS; ++i) arc << ACS_WorldVars[i];
+	for (i = 0; i < NUM_GLOBALVARS; ++i) arc << ACS_GlobalVars[i];
+	SerializeArrayVars (arc, ACS_WorldArrays, NUM_WORLDVARS);
+	SerializeArrayVars (arc, ACS_GlobalArrays, NUM_GLOBALVARS);
+}
+
 //---- Inventory functions --------------------------------------//
 //
 
@@ -122,6 +122,7 @@ extern ACSStringPool GlobalACSStrings;
 void P_CollectACSGlobalStrings();
 void P_ReadACSVars(PNGHandle *);
 void P_WriteACSVars(FILE*);
+void P_SerializeACSVars(FArchive &arc); //VIZDOOM_CODE
 void P_ClearACSVars(bool);
 void P_SerializeACSScriptNumber(FArchive &arc, int &scriptnum, bool was2byte);
 
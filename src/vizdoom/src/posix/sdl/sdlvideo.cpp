@@ -18,6 +18,7 @@
 //VIZDOOM_CODE
 #include "viz_depth.h"
 #include "viz_labels.h"
+#include "viz_video.h"
 
 #ifdef __APPLE__
 #include <OpenGL/OpenGL.h>
@@ -262,6 +263,10 @@ DFrameBuffer *SDLVideo::CreateFrameBuffer (int width, int height, bool fullscree
 
 	SDL_Window *oldwin = NULL;
 
+	// Without X server frames are rendered only into memory
+	if(*viz_noxserver)
+		return VIZ_CreateHeadlessFB (width, height, old);
+
 	if (old != NULL)
 	{ // Reuse the old framebuffer if its attributes are the same
 		SDLFB *fb = static_cast<SDLFB *> (old);
@@ -52,6 +52,9 @@
 #include "textures/textures.h"
 #include "r_data/colormaps.h"
 
+//VIZDOOM_CODE
+#include "viz_texture_cache.h"
+
 // On the Alpha, accessing the shorts directly if they aren't aligned on a
 // 4-byte boundary causes unaligned access warnings. Why it does this at
 // all and only while initing the textures is beyond me.
@@ -359,7 +362,7 @@ void FMultiPatchTexture::Unload ()
 {
 	if (Pixels != NULL)
 	{
-		delete[] Pixels;
+		VIZ_TextureCacheFree (Pixels);
 		Pixels = NULL;
 	}
 }
@@ -491,6 +494,13 @@ void FMultiPatchTexture::MakeTexture ()
 	BYTE blendwork[256];
 	bool hasTranslucent = false;
 
+	//VIZDOOM_CODE
+	// Texture composed by another engine using the same files
+	if ((Pixels = VIZ_TextureCacheFind (this, numpix)) != NULL)
+	{
+		return;
+	}
+
 	Pixels = new BYTE[numpix];
 	memset (Pixels, 0, numpix);
 
@@ -542,6 +552,9 @@ void FMultiPatchTexture::MakeTexture ()
 		}
 		delete [] buffer;
 	}
+
+	//VIZDOOM_CODE
+	Pixels = VIZ_TextureCacheStore (this, Pixels, numpix);
 }
 
 //===========================================================================
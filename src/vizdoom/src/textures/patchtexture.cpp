@@ -40,6 +40,9 @@
 #include "v_palette.h"
 #include "textures/textures.h"
 
+//VIZDOOM_CODE
+#include "viz_texture_cache.h"
+
 
 // posts are runs of non masked source pixels
 struct column_t
@@ -181,7 +184,7 @@ void FPatchTexture::Unload ()
 {
 	if (Pixels != NULL)
 	{
-		delete[] Pixels;
+		VIZ_TextureCacheFree (Pixels);
 		Pixels = NULL;
 	}
 }
@@ -249,6 +252,14 @@ void FPatchTexture::MakeTexture ()
 	const column_t *maxcol;
 	int x;
 
+	//VIZDOOM_CODE
+	// Patch decoded by another engine using the same files
+	int cachesize = hackflag ? Width * Height : Width * Height + (1 << HeightBits) - Height;
+	if ((Pixels = VIZ_TextureCacheFind (this, cachesize)) != NULL)
+	{
+		return;
+	}
+
 	FMemLump lump = Wads.ReadLump (SourceLump);
 	const patch_t *patch = (const patch_t *)lump.GetMem();
 
@@ -298,6 +309,7 @@ void FPatchTexture::MakeTexture ()
 				out++, in++;
 			}
 		}
+		Pixels = VIZ_TextureCacheStore (this, Pixels, cachesize);
 		return;
 	}
 
@@ -351,6 +363,8 @@ void FPatchTexture::MakeTexture ()
 			column = (const column_t *)((const BYTE *)column + column->length + 4);
 		}
 	}
+
+	Pixels = VIZ_TextureCacheStore (this, Pixels, cachesize);
 }
 
 
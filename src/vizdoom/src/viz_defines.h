@@ -45,6 +45,8 @@
 #define VIZ_MAX_SECTORS             2048
 #define VIZ_MAX_LINES               8192
 
+#define VIZ_STATS_STAGE_COUNT       5
+
 #ifdef __linux__
     #define VIZ_OS_LINUX
 #elif _WIN32
@@ -0,0 +1,160 @@
+/*
+ Copyright (C) 2016 by Wojciech Jaśkowski, Michał Kempka, Grzegorz Runc, Jakub Toczek, Marek Wydmuch
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ THE SOFTWARE.
+*/
+
+#include "viz_fork.h"
+#include "viz_main.h"
+#include "viz_message_queue.h"
+
+#include "c_cvars.h"
+#include "i_system.h"
+#include "m_random.h"
+#include "w_wad.h"
+
+#include <boost/date_time/posix_time/posix_time_types.hpp>
+#include <string>
+#include <vector>
+
+#ifndef _WIN32
+    #include <signal.h>
+    #include <unistd.h>
+#endif
+
+/*
+ * Fork server keeps a fully initialized engine (WADs parsed, resources loaded) that is forked for every instance
+ * launched by the controller. The forked engine applies its own instance settings and continues like a launched one.
+ */
+
+void VIZ_ForkApply(std::vector<std::string> &cvars, const char *seed){
+
+    for(auto &cvar : cvars){
+        size_t space = cvar.find(' ');
+        std::string name = cvar.substr(0, space);
+        std::string value = space != std::string::npos ? cvar.substr(space + 1) : "";
+
+        FBaseCVar *var = FindCVar(name.c_str(), NULL);
+        if(var == NULL) VIZ_Error(VIZ_FUNC, "Unknown CVAR: %s.", name.c_str());
+
+        // CVARs of the instance are NOSET, so they have to be forced
+        UCVarValue val;
+        val.String = const_cast<char *>(value.c_str());
+        var->ForceSet(val, CVAR_String);
+    }
+
+    // Forked engines inherit the server's RNGs, every instance needs its own seed
+    if(strlen(seed)){
+        rngseed = staticrngseed = atoi(seed);
+        use_staticrng = true;
+    }
+    else{
+        rngseed = I_MakeRNGSeed();
+        use_staticrng = false;
+    }
+    FRandom::StaticClearRandom();
+
+    Wads.ReopenFiles();
+}
+
+void VIZ_ForkServer(const char * id){
+
+    #ifdef _WIN32
+        VIZ_Error(VIZ_FUNC, "Fork server is not supported on this platform.");
+    #else
+        Printf("VIZ_ForkServer: Init fork server %s.\n", id);
+
+        std::string requestName = std::string(VIZ_MQ_NAME_FORK_REQ_BASE) + id;
+        std::string replyName = std::string(VIZ_MQ_NAME_FORK_REP_BASE) + id;
+
+        bip::message_queue *request = nullptr;
+        bip::message_queue *reply = nullptr;
+
+        try{
+            request = new bip::message_queue(bip::open_only, requestName.c_str());
+            reply = new bip::message_queue(bip::open_only, replyName.c_str());
+        }
+        catch(...){ // bip::interprocess_exception
+            VIZ_Error(VIZ_FUNC, "Failed to open fork server message queues.");
+        }
+
+        // Forked engines are reaped automatically, the controller watches them by pid
+        signal(SIGCHLD, SIG_IGN);
+        pid_t parent = getppid();
+
+        VIZMessage msg;
+        msg.code = VIZ_MSG_CODE_DOOM_DONE;
+        reply->send(&msg, sizeof(VIZMessage), 0);
+
+        std::vector<std::string> cvars;
+        size_t size;
+        unsigned int priority;
+
+        while(true){
+            boost::posix_time::ptime timeout = boost::posix_time::microsec_clock::universal_time()
+                                               + boost::posix_time::seconds(1);
+
+            if(!request->timed_receive(&msg, sizeof(VIZMessage), size, priority, timeout)){
+                // Controller was killed without closing the server
+                if(getppid() != parent) exit(0);
+                continue;
+            }
+
+            switch(msg.code){
+                case VIZ_MSG_CODE_FORK_CVAR:
+                    cvars.push_back(msg.command);
+                    break;
+
+                case VIZ_MSG_CODE_FORK: {
+                    pid_t pid = fork();
+
+                    if(pid == 0){
+                        delete request;
+                        delete reply;
+                        signal(SIGCHLD, SIG_DFL);
+
+                        VIZ_ForkApply(cvars, msg.command);
+                        VIZ_DebugMsg(1, VIZ_FUNC, "Forked from fork server %s.", id);
+                        return;
+                    }
+
+                    cvars.clear();
+
+                    VIZMessage forked;
+                    if(pid > 0){
+                        forked.code = VIZ_MSG_CODE_DOOM_FORKED;
+                        snprintf(forked.command, VIZ_MQ_MAX_CMD_LEN, "%d", (int)pid);
+                    }
+                    else{
+                        forked.code = VIZ_MSG_CODE_DOOM_ERROR;
+                        strncpy(forked.command, "Failed to fork the engine.", VIZ_MQ_MAX_CMD_LEN);
+                    }
+                    reply->send(&forked, sizeof(VIZMessage), 0);
+                    break;
+                }
+
+                case VIZ_MSG_CODE_CLOSE:
+                default:
+                    delete request;
+                    delete reply;
+                    exit(0);
+            }
+        }
+    #endif
+}
@@ -36,15 +36,31 @@
 #include "c_dispatch.h"
 #include "p_acs.h"
 #include "p_setup.h"
+#include "p_local.h"
+#include "m_bbox.h"
+
+#include <algorithm>
+#include <sstream>
+#include <string>
+#include <tuple>
+#include <unordered_set>
+#include <utility>
+#include <vector>
 
 EXTERN_CVAR (Int, viz_debug)
 EXTERN_CVAR (Bool, viz_nocheat)
 EXTERN_CVAR (Int, viz_screen_format)
+EXTERN_CVAR (Bool, viz_screen)
+EXTERN_CVAR (Bool, viz_obs_float)
 EXTERN_CVAR (Bool, viz_depth)
 EXTERN_CVAR (Bool, viz_labels)
 EXTERN_CVAR (Bool, viz_automap)
 EXTERN_CVAR (Bool, viz_objects)
 EXTERN_CVAR (Bool, viz_sectors)
+EXTERN_CVAR (Float, viz_objects_radius)
+EXTERN_CVAR (Int, viz_objects_max)
+EXTERN_CVAR (String, viz_objects_names)
+EXTERN_CVAR (Bool, viz_objects_exclude)
 EXTERN_CVAR (Bool, viz_loop_map)
 EXTERN_CVAR (Bool, viz_override_player)
 EXTERN_CVAR (Bool, viz_spectator)
@@ -54,6 +70,14 @@ EXTERN_CVAR (Float, timelimit)
 VIZGameState *vizGameStateSM = NULL;
 VIZPlayerLogger vizPlayerLogger[VIZ_MAX_PLAYERS];
 unsigned int vizUniqueObjectsCount = 0;
+bool vizGeometryChanged = true;
+std::vector<VIZSprite*> vizLabeledSprites;
+
+// Objects filter, names are parsed again only if viz_objects_names changes
+std::string vizObjectsNamesStr;
+std::unordered_set<std::string> vizObjectsNames;
+// Candidates are (squared distance, object id, actor), ties in the distance are broken by the object id
+std::vector<std::tuple<double, unsigned int, AActor*>> vizObjectsCandidates;
 
 /* Logger functions */
 /*--------------------------------------------------------------------------------------------------------------------*/
@@ -269,6 +293,13 @@ void VIZ_GameStateSMUpdate(){
     vizGameStateSM->SCREEN_SIZE = vizScreenSize;
     vizGameStateSM->SCREEN_FORMAT = *viz_screen_format;
 
+    vizGameStateSM->OBSERVATION_WIDTH = vizObsWidth;
+    vizGameStateSM->OBSERVATION_HEIGHT = vizObsHeight;
+    vizGameStateSM->OBSERVATION_CHANNELS = vizObsChannels;
+    vizGameStateSM->OBSERVATION_SIZE = vizObsSize;
+    vizGameStateSM->OBSERVATION_FLOAT = *viz_obs_float;
+
+    vizGameStateSM->SCREEN_BUFFER = *viz_screen;
     vizGameStateSM->DEPTH_BUFFER = *viz_depth && vizDepthMap;
     vizGameStateSM->LABELS = *viz_labels && vizLabels;
     vizGameStateSM->AUTOMAP = *viz_automap;
@@ -303,6 +334,10 @@ void VIZ_GameStateTic(){
     vizGameStateSM->MAP_START_TIC = (unsigned int)level.starttime;
     vizGameStateSM->MAP_TIC = (unsigned int)level.maptime;
     vizGameStateSM->MAP_TICLIMIT = (unsigned int)(timelimit * TICRATE * 60);
+    if(strcmp(vizGameStateSM->MAP_NAME, level.MapName.GetChars())) {
+        strncpy(vizGameStateSM->MAP_NAME, level.MapName.GetChars(), VIZ_MAX_NAME_LEN - 1);
+        vizGameStateSM->MAP_NAME[VIZ_MAX_NAME_LEN - 1] = '\0';
+    }
 
     bool prevDead = vizGameStateSM->PLAYER_DEAD;
 
@@ -320,18 +355,33 @@ void VIZ_GameStateTic(){
     vizGameStateSM->PLAYER_READY_TO_RESPAWN = VIZ_PLAYER.playerstate == PST_REBORN;
 }
 
+bool VIZ_GameStateIsTicPossible(){
+    return !((!vizGameStateSM->GAME_MULTIPLAYER && vizGameStateSM->PLAYER_DEAD)
+             || (vizGameStateSM->MAP_TICLIMIT > 0 && vizGameStateSM->MAP_TICLIMIT <= vizGameStateSM->MAP_TIC)
+             || vizGameStateSM->MAP_END);
+}
+
 void VIZ_GameStateUpdate(){
     if(!vizGameStateSM) return;
 
+    VIZ_StatsClock(VIZ_STATS_STATE);
     VIZ_GameStateUpdateVariables();
+    VIZ_StatsUnclock(VIZ_STATS_STATE);
 
     if (!*viz_nocheat && !vizGameStateSM->MAP_END) {
+        VIZ_StatsClock(VIZ_STATS_INFO);
         if (*viz_labels) VIZ_GameStateUpdateLabels();
         if (*viz_objects) VIZ_GameStateUpdateObjects();
         if (*viz_sectors) VIZ_GameStateUpdateSectors();
+        VIZ_StatsUnclock(VIZ_STATS_INFO);
     }
 }
 
+void VIZ_GameStateUpdateStats(){
+    if(!vizGameStateSM) return;
+    VIZ_StatsWrite(vizGameStateSM->STATS_COUNT, vizGameStateSM->STATS_TOTAL, vizGameStateSM->STATS_LAST);
+}
+
 void VIZ_GameStateUpdateVariables(){
 
     // Reward and ACS vars
@@ -443,80 +493,159 @@ void VIZ_GameStateUpdateLabels(){
 
         VIZ_DebugMsg(4, VIZ_FUNC, "number of sprites: %d", gametic, vizLabels->getSprites().size());
 
-        //TODO sort vizLabels->sprites
-
-        for(auto& sprite : vizLabels->sprites){
-            if(sprite.labeled && sprite.pointCount > 0){
-                VIZLabel *vizLabel = &vizGameStateSM->LABEL[labelCount++];
-
-                vizLabel->objectId = VIZ_GetActorId(sprite.actor);
-                vizLabel->value = sprite.label;
-                VIZ_CopyActorName(sprite.actor, vizLabel->objectName);
-
-                if(sprite.minX >= vizGameStateSM->SCREEN_WIDTH) sprite.minX = vizGameStateSM->SCREEN_WIDTH - 1;
-                if(sprite.minY >= vizGameStateSM->SCREEN_HEIGHT) sprite.minY = vizGameStateSM->SCREEN_HEIGHT - 1;
-                if(sprite.maxX >= vizGameStateSM->SCREEN_WIDTH) sprite.maxX = vizGameStateSM->SCREEN_WIDTH - 1;
-                if(sprite.maxY >= vizGameStateSM->SCREEN_HEIGHT) sprite.maxY = vizGameStateSM->SCREEN_HEIGHT - 1;
-
-                vizLabel->position[0] = sprite.minX;
-                vizLabel->position[1] = sprite.minY;
-                vizLabel->size[0] = sprite.maxX - sprite.minX;
-                vizLabel->size[1] = sprite.maxY - sprite.minY;
-
-                vizLabel->objectPosition[0] = VIZ_FixedToDouble(sprite.actor->__pos.x);
-                vizLabel->objectPosition[1] = VIZ_FixedToDouble(sprite.actor->__pos.y);
-                vizLabel->objectPosition[2] = VIZ_FixedToDouble(sprite.actor->__pos.z);
-                vizLabel->objectPosition[3] = VIZ_AngleToDouble(sprite.actor->angle);
-                vizLabel->objectPosition[4] = VIZ_PitchToDouble(sprite.actor->pitch);
-                vizLabel->objectPosition[5] = VIZ_AngleToDouble(sprite.actor->roll);
-                vizLabel->objectPosition[6] = VIZ_FixedToDouble(sprite.actor->velx);
-                vizLabel->objectPosition[7] = VIZ_FixedToDouble(sprite.actor->vely);
-                vizLabel->objectPosition[8] = VIZ_FixedToDouble(sprite.actor->velz);
-
-                VIZ_DebugMsg(4, VIZ_FUNC, "labelCount: %d, objectId: %d, objectName: %s, value %d",
-                                labelCount, vizLabel->objectId, vizLabel->objectName, vizLabel->value);
-            }
+        // Report labels sorted by value (drawing order), ties by object id, so the order is deterministic
+        vizLabeledSprites.clear();
+        for(auto& sprite : vizLabels->getSprites())
+            if(sprite.labeled && sprite.pointCount > 0) vizLabeledSprites.push_back(&sprite);
+
+        std::sort(vizLabeledSprites.begin(), vizLabeledSprites.end(), [](VIZSprite *a, VIZSprite *b){
+            if(a->label != b->label) return a->label < b->label;
+            return VIZ_GetActorId(a->actor) < VIZ_GetActorId(b->actor);
+        });
+
+        for(auto spritePtr : vizLabeledSprites){
+            VIZSprite &sprite = *spritePtr;
+            VIZLabel *vizLabel = &vizGameStateSM->LABEL[labelCount++];
+
+            vizLabel->objectId = VIZ_GetActorId(sprite.actor);
+            vizLabel->value = sprite.label;
+            VIZ_CopyActorName(sprite.actor, vizLabel->objectName);
+
+            if(sprite.minX >= vizGameStateSM->SCREEN_WIDTH) sprite.minX = vizGameStateSM->SCREEN_WIDTH - 1;
+            if(sprite.minY >= vizGameStateSM->SCREEN_HEIGHT) sprite.minY = vizGameStateSM->SCREEN_HEIGHT - 1;
+            if(sprite.maxX >= vizGameStateSM->SCREEN_WIDTH) sprite.maxX = vizGameStateSM->SCREEN_WIDTH - 1;
+            if(sprite.maxY >= vizGameStateSM->SCREEN_HEIGHT) sprite.maxY = vizGameStateSM->SCREEN_HEIGHT - 1;
+
+            vizLabel->position[0] = sprite.minX;
+            vizLabel->position[1] = sprite.minY;
+            vizLabel->size[0] = sprite.maxX - sprite.minX;
+            vizLabel->size[1] = sprite.maxY - sprite.minY;
+
+            vizLabel->objectPosition[0] = VIZ_FixedToDouble(sprite.actor->__pos.x);
+            vizLabel->objectPosition[1] = VIZ_FixedToDouble(sprite.actor->__pos.y);
+            vizLabel->objectPosition[2] = VIZ_FixedToDouble(sprite.actor->__pos.z);
+            vizLabel->objectPosition[3] = VIZ_AngleToDouble(sprite.actor->angle);
+            vizLabel->objectPosition[4] = VIZ_PitchToDouble(sprite.actor->pitch);
+            vizLabel->objectPosition[5] = VIZ_AngleToDouble(sprite.actor->roll);
+            vizLabel->objectPosition[6] = VIZ_FixedToDouble(sprite.actor->velx);
+            vizLabel->objectPosition[7] = VIZ_FixedToDouble(sprite.actor->vely);
+            vizLabel->objectPosition[8] = VIZ_FixedToDouble(sprite.actor->velz);
+
+            VIZ_DebugMsg(4, VIZ_FUNC, "labelCount: %d, objectId: %d, objectName: %s, value %d",
+                            labelCount, vizLabel->objectId, vizLabel->objectName, vizLabel->value);
             if(labelCount >= VIZ_MAX_LABELS) break;
         }
     }
     vizGameStateSM->LABEL_COUNT = labelCount;
 }
 
-void VIZ_GameStateUpdateObjects(){
-    unsigned int objectCount = 0;
+bool VIZ_ObjectsFilterName(AActor *actor){
+    if(vizObjectsNamesStr != *viz_objects_names){
+        vizObjectsNamesStr = *viz_objects_names;
+        vizObjectsNames.clear();
 
-    // Iterate over sectors
-    for (int i = 0; i < numsectors; ++i) {
-        sector_t *sector = &sectors[i];
+        std::stringstream namesStream(vizObjectsNamesStr);
+        std::string name;
+        while(std::getline(namesStream, name, ',')) if(!name.empty()) vizObjectsNames.insert(name);
+    }
+
+    if(vizObjectsNames.empty()) return true;
+
+    char name[VIZ_MAX_NAME_LEN];
+    VIZ_CopyActorName(actor, name);
+    name[VIZ_MAX_NAME_LEN - 1] = '\0';
+    return (vizObjectsNames.count(name) > 0) != *viz_objects_exclude;
+}
 
-        // Handle all things in sector
-        for (AActor *actor = sector->thinglist; actor != NULL; actor = actor->snext) {
-            VIZObject *vizObject = &vizGameStateSM->OBJECT[objectCount++];
-
-            vizObject->id = VIZ_GetActorId(actor);
-            VIZ_CopyActorName(actor, vizObject->name);
-            vizObject->position[0] = VIZ_FixedToDouble(actor->__pos.x);
-            vizObject->position[1] = VIZ_FixedToDouble(actor->__pos.y);
-            vizObject->position[2] = VIZ_FixedToDouble(actor->__pos.z);
-            vizObject->position[3] = VIZ_AngleToDouble(actor->angle);
-            vizObject->position[4] = VIZ_PitchToDouble(actor->pitch);
-            vizObject->position[5] = VIZ_AngleToDouble(actor->roll);
-            vizObject->position[6] = VIZ_FixedToDouble(actor->velx);
-            vizObject->position[7] = VIZ_FixedToDouble(actor->vely);
-            vizObject->position[8] = VIZ_FixedToDouble(actor->velz);
-
-            VIZ_DebugMsg(4, VIZ_FUNC, "objectCount: %d, id: %d, name: %s", objectCount, vizObject->id, vizObject->name);
-            if(objectCount >= VIZ_MAX_OBJECTS) break;
+void VIZ_GameStateUpdateObjects(){
+    AActor *playerActor = VIZ_PLAYER.mo;
+    // Without the player's actor there is nothing to measure the distance from
+    double radius = playerActor != NULL ? (double)*viz_objects_radius : 0;
+    bool nearest = *viz_objects_max > 0 && playerActor != NULL;
+    double playerX = 0, playerY = 0;
+    if(playerActor != NULL){
+        playerX = VIZ_FixedToDouble(playerActor->__pos.x);
+        playerY = VIZ_FixedToDouble(playerActor->__pos.y);
+    }
+
+    // Collect actors passing the filter with their squared distance to the player
+    vizObjectsCandidates.clear();
+    auto addCandidate = [&](AActor *actor){
+        double dx = VIZ_FixedToDouble(actor->__pos.x) - playerX;
+        double dy = VIZ_FixedToDouble(actor->__pos.y) - playerY;
+        double distance = dx * dx + dy * dy;
+        if(radius > 0 && distance > radius * radius) return;
+        if(!VIZ_ObjectsFilterName(actor)) return;
+        vizObjectsCandidates.emplace_back(distance, VIZ_GetActorId(actor), actor);
+    };
+
+    // With a radius only actors linked into the blockmap are included (e.g. puffs and blood are not),
+    // radius of the blockmap query is limited by the range of the fixed point coordinates
+    if(radius > 0 && radius < 32767){
+        // Only blocks of the blockmap around the player are visited
+        FBoundingBox box(playerActor->__pos.x, playerActor->__pos.y, FLOAT2FIXED(radius));
+        FBlockThingsIterator it(box);
+        for(AActor *actor = it.Next(); actor != NULL; actor = it.Next()) addCandidate(actor);
+    }
+    else {
+        // Iterate over sectors and handle all things in them
+        for (int i = 0; i < numsectors; ++i) {
+            for (AActor *actor = sectors[i].thinglist; actor != NULL; actor = actor->snext) {
+                if(radius > 0 && (actor->flags & MF_NOBLOCKMAP)) continue;
+                addCandidate(actor);
+            }
         }
     }
 
+    size_t objectsMax = VIZ_MAX_OBJECTS;
+    if(nearest) objectsMax = std::min(objectsMax, (size_t)*viz_objects_max);
+    if(nearest && vizObjectsCandidates.size() > objectsMax){
+        std::nth_element(vizObjectsCandidates.begin(), vizObjectsCandidates.begin() + objectsMax, vizObjectsCandidates.end());
+        vizObjectsCandidates.resize(objectsMax);
+    }
+    // Nearest objects are sorted by the distance, ties by the object id, so the result doesn't depend on addresses
+    if(nearest) std::sort(vizObjectsCandidates.begin(), vizObjectsCandidates.end());
+
+    unsigned int objectCount = 0;
+    for(auto &candidate : vizObjectsCandidates){
+        if(objectCount >= VIZ_MAX_OBJECTS) break;
+
+        AActor *actor = std::get<2>(candidate);
+        VIZObject *vizObject = &vizGameStateSM->OBJECT[objectCount++];
+
+        vizObject->id = std::get<1>(candidate);
+        VIZ_CopyActorName(actor, vizObject->name);
+        vizObject->position[0] = VIZ_FixedToDouble(actor->__pos.x);
+        vizObject->position[1] = VIZ_FixedToDouble(actor->__pos.y);
+        vizObject->position[2] = VIZ_FixedToDouble(actor->__pos.z);
+        vizObject->position[3] = VIZ_AngleToDouble(actor->angle);
+        vizObject->position[4] = VIZ_PitchToDouble(actor->pitch);
+        vizObject->position[5] = VIZ_AngleToDouble(actor->roll);
+        vizObject->position[6] = VIZ_FixedToDouble(actor->velx);
+        vizObject->position[7] = VIZ_FixedToDouble(actor->vely);
+        vizObject->position[8] = VIZ_FixedToDouble(actor->velz);
+
+        VIZ_DebugMsg(4, VIZ_FUNC, "objectCount: %d, id: %d, name: %s", objectCount, vizObject->id, vizObject->name);
+    }
+
     vizGameStateSM->OBJECT_COUNT = objectCount;
 }
 
 void VIZ_GameStateUpdateSectors(){
-    //std::unordered_map<sector_t *, int> sectorIds(numsectors);
-    std::unordered_map<line_t *, int> lineIds(numlines);
+    // Lines of polyobjects can move, so geometry of maps with them is published on every update
+    if(vizGeometryChanged || po_NumPolyobjs > 0) VIZ_GameStateUpdateGeometry();
+
+    // Only heights of sectors change within the map
+    for(unsigned int i = 0; i < vizGameStateSM->SECTOR_COUNT; ++i){
+        sector_t *sector = &sectors[i];
+        VIZSector *vizSector = &vizGameStateSM->SECTOR[i];
+
+        vizSector->ceilingHeight = VIZ_FixedToDouble(sector->ceilingplane.d);
+        vizSector->floorHeight = VIZ_FixedToDouble(sector->floorplane.d);
+    }
+}
 
+void VIZ_GameStateUpdateGeometry(){
     unsigned int lineCount = 0;
     for(int i = 0; i < numlines; ++i){
         line_t *line = &lines[i];
@@ -530,7 +659,6 @@ void VIZ_GameStateUpdateSectors(){
         //vizLine->frontSector = sectorIds[line->frontsector];
         //vizLine->backSector = sectorIds[line->backsector];
 
-        lineIds.insert({line, i});
         vizLine->isBlocking = (line->flags & (ML_BLOCKING|ML_BLOCKEVERYTHING|ML_BLOCK_PLAYERS));
 
         VIZ_DebugMsg(4, VIZ_FUNC, "line: %d, position: (%f, %f), (%f, %f), isBlocking: %d",
@@ -549,21 +677,14 @@ void VIZ_GameStateUpdateSectors(){
         sector_t *sector = &sectors[i];
         VIZSector *vizSector = &vizGameStateSM->SECTOR[sectorCount++];
 
-        vizSector->ceilingHeight = VIZ_FixedToDouble(sector->ceilingplane.d);
-        vizSector->floorHeight = VIZ_FixedToDouble(sector->floorplane.d);
-
+        // Lines are stored in one array, so the index of the line is its offset in it
         unsigned int sectorLineCount = 0;
         for(int l = 0; l < sector->linecount; ++l){
-            line_t *line = sector->lines[l];
-            vizSector->lines[sectorLineCount++] = lineIds[line];
-            //auto lineId = lineIds.find(line);
-            //if(lineId != lineIds.end()) vizSector->lines[lineCount++] = lineId->second;
-            //else  = lineIds.insert({line, lineIds.size()}).second;
+            vizSector->lines[sectorLineCount++] = (unsigned int)(sector->lines[l] - lines);
         }
         vizSector->lineCount = sectorLineCount;
         assert(sectorLineCount == sector->linecount);
 
-        //sectorIds.insert({sector, sectorIds.size()});
         if(sectorCount >= VIZ_MAX_SECTORS) break;
     }
 
@@ -571,6 +692,13 @@ void VIZ_GameStateUpdateSectors(){
 
     vizGameStateSM->SECTOR_COUNT = sectorCount;
     assert(sectorCount == numsectors);
+
+    ++vizGameStateSM->MAP_GEOMETRY_VERSION;
+    vizGeometryChanged = false;
+}
+
+void VIZ_GameStateGeometryChanged(){
+    vizGeometryChanged = true;
 }
 
 void VIZ_GameStateInitNew(){
@@ -129,6 +129,19 @@ struct VIZGameState{
     size_t SCREEN_SIZE;
     int SCREEN_FORMAT;
 
+    // OBSERVATION
+    unsigned int OBSERVATION_WIDTH;
+    unsigned int OBSERVATION_HEIGHT;
+    unsigned int OBSERVATION_CHANNELS;
+    size_t OBSERVATION_SIZE;
+    bool OBSERVATION_FLOAT;
+
+    // STATS, time spent by the engine in each stage in milliseconds, published if viz_perf_stats is set
+    unsigned int STATS_COUNT[VIZ_STATS_STAGE_COUNT];
+    double STATS_TOTAL[VIZ_STATS_STAGE_COUNT];
+    double STATS_LAST[VIZ_STATS_STAGE_COUNT];
+
+    bool SCREEN_BUFFER;
     bool DEPTH_BUFFER;
     bool LABELS;
     bool AUTOMAP;
@@ -139,6 +152,7 @@ struct VIZGameState{
     unsigned int MAP_START_TIC;
     unsigned int MAP_TIC;
     unsigned int MAP_TICLIMIT;
+    char MAP_NAME[VIZ_MAX_NAME_LEN];
 
     int MAP_REWARD;
     int MAP_USER_VARS[VIZ_GV_USER_COUNT];
@@ -197,6 +211,7 @@ struct VIZGameState{
     VIZObject OBJECT[VIZ_MAX_OBJECTS];
 
     // SECTORS
+    unsigned int MAP_GEOMETRY_VERSION;  // Changes only when lines or lines of sectors change
     unsigned int SECTOR_COUNT;
     VIZSector SECTOR[VIZ_MAX_SECTORS];
 
@@ -218,6 +233,8 @@ void VIZ_GameStateSMUpdate();
 
 void VIZ_GameStateTic();
 
+bool VIZ_GameStateIsTicPossible();
+
 void VIZ_GameStateUpdate();
 
 void VIZ_GameStateUpdateVariables();
@@ -228,6 +245,12 @@ void VIZ_GameStateUpdateObjects();
 
 void VIZ_GameStateUpdateSectors();
 
+void VIZ_GameStateUpdateStats();
+
+void VIZ_GameStateUpdateGeometry();
+
+void VIZ_GameStateGeometryChanged();
+
 void VIZ_GameStateInitNew();
 
 void VIZ_GameStateClose();
@@ -23,6 +23,7 @@
 #ifndef __VIZ_INPUT_H__
 #define __VIZ_INPUT_H__
 
+#include <atomic>
 #include <cstdint>
 #include "d_ticcmd.h"
 
@@ -88,8 +89,16 @@ struct VIZInputState{
     bool BT_AVAILABLE[VIZ_BT_COUNT];
     double BT_MAX_VALUE[VIZ_BT_AXIS_BT_COUNT];
     double CMD_BT[VIZ_BT_COUNT]; // Parsed cmd->ucmd.buttons
+
+    // Step requests and replies (used instead of message queues if viz_sm_sync is enabled)
+    std::atomic<uint32_t> SYNC_REQUEST_SEQ;
+    std::atomic<uint32_t> SYNC_DONE_SEQ;
+    uint8_t SYNC_REQUEST_CODE;
+    unsigned int SYNC_REQUEST_TICS;
 };
 
+extern VIZInputState *vizInput;
+
 void VIZ_Command(char *cmd);
 
 bool VIZ_CommmandFilter(const char *cmd);
@@ -38,6 +38,8 @@ VIZLabelsBuffer::VIZLabelsBuffer(unsigned int width, unsigned int height):
 
     this->currentLabel = 0;
     this->currentSprite = nullptr;
+    this->labeled = 0;
+    this->pSpriteIndex = (size_t)-1;
 
     // SDL debug stuff
     #ifdef VIZ_LABELS_TEST
@@ -122,8 +124,9 @@ void VIZLabelsBuffer::clearBuffer(BYTE color) {
     memset(buffer, color, bufferSize);
 
     this->sprites.clear();
+    this->spritesIndex.clear();
     this->labeled = 0;
-    this->pSprite = NULL;
+    this->pSpriteIndex = (size_t)-1;
     this->unsetSprite();
 }
 
@@ -164,12 +167,21 @@ void VIZLabelsBuffer::addSprite(AActor *actor, vissprite_t* vis){
     sprite.actor = actor;
     sprite.vissprite = vis;
 
+    // The first sprite added for a vissprite is the one it is labeled as
+    this->spritesIndex.emplace(vis, this->sprites.size());
     this->sprites.push_back(sprite);
 }
 
 void VIZLabelsBuffer::addPSprite(AActor *actor, vissprite_t* vis){
-    if(this->pSprite != NULL){
-        this->pSprite->vissprite = vis;
+    if(this->pSpriteIndex < this->sprites.size()){
+        VIZSprite *pSprite = &this->sprites[this->pSpriteIndex];
+        if(pSprite->vissprite != vis){
+            auto oldIndex = this->spritesIndex.find(pSprite->vissprite);
+            if(oldIndex != this->spritesIndex.end() && oldIndex->second == this->pSpriteIndex)
+                this->spritesIndex.erase(oldIndex);
+            pSprite->vissprite = vis;
+            this->spritesIndex[vis] = this->pSpriteIndex;
+        }
     }
     else {
         VIZSprite sprite;
@@ -177,11 +189,18 @@ void VIZLabelsBuffer::addPSprite(AActor *actor, vissprite_t* vis){
         sprite.psprite = true;
         sprite.vissprite = vis;
 
+        this->pSpriteIndex = this->sprites.size();
+        this->spritesIndex[vis] = this->pSpriteIndex;
         this->sprites.push_back(sprite);
-        this->pSprite = &this->sprites[this->sprites.size() - 1];
     }
 }
 
+VIZSprite* VIZLabelsBuffer::findSprite(vissprite_t* vis){
+    auto index = this->spritesIndex.find(vis);
+    if(index == this->spritesIndex.end()) return NULL;
+    return &this->sprites[index->second];
+}
+
 BYTE VIZLabelsBuffer::getLabel(VIZSprite* sprite){
     if(sprite->label > 0 && sprite->labeled)
         return sprite->label;
@@ -197,15 +216,12 @@ BYTE VIZLabelsBuffer::getLabel(VIZSprite* sprite){
 
 
 BYTE VIZLabelsBuffer::getLabel(vissprite_t* vis){
-    for(auto i = this->sprites.begin(); i != this->sprites.end(); ++i){
-        if(i->vissprite == vis){
-            return this->getLabel(&(*i));
-        }
-    }
+    VIZSprite *sprite = this->findSprite(vis);
+    if(sprite != NULL) return this->getLabel(sprite);
     return 0;
 }
 
-std::vector<VIZSprite> VIZLabelsBuffer::getSprites(){
+std::vector<VIZSprite>& VIZLabelsBuffer::getSprites(){
     return this->sprites;
 }
 
@@ -214,15 +230,8 @@ void VIZLabelsBuffer::setLabel(BYTE label){
 }
 
 void VIZLabelsBuffer::setSprite(vissprite_t* vis){
-    for(auto i = this->sprites.begin(); i != this->sprites.end(); ++i){
-        if(i->vissprite == vis){
-            this->currentLabel = this->getLabel(&(*i));
-            this->currentSprite = &(*i);
-            return;
-        }
-    }
-    this->currentLabel = 0;
-    this->currentSprite = NULL;
+    this->currentSprite = this->findSprite(vis);
+    this->currentLabel = this->currentSprite != NULL ? this->getLabel(this->currentSprite) : 0;
 }
 
 void VIZLabelsBuffer::unsetSprite(){
@@ -104,7 +104,7 @@ public:
     void setSprite(vissprite_t* vis);
     void unsetSprite();
 
-    std::vector<VIZSprite> getSprites();
+    std::vector<VIZSprite>& getSprites();
 
     #ifdef VIZ_LABELS_TEST
         void testUpdate();
@@ -123,7 +123,10 @@ private:
     BYTE labeled;
     BYTE currentLabel;
     VIZSprite *currentSprite;
-    VIZSprite *pSprite;
+    size_t pSpriteIndex;
+
+    VIZSprite *findSprite(vissprite_t* vis);
+    std::unordered_map<vissprite_t*, size_t> spritesIndex;
 
     #ifdef VIZ_LABELS_TEST
         SDL_Window* window;
@@ -26,12 +26,18 @@
 #include "viz_game.h"
 #include "viz_screen.h"
 #include "viz_message_queue.h"
+#include "viz_fork.h"
+#include "viz_texture_cache.h"
+#include "viz_snapshot.h"
 
 #include "d_main.h"
 #include "g_game.h"
 #include "sbar.h"
 #include "c_dispatch.h"
 #include "i_system.h"
+#include "m_random.h"
+#include "stats.h"
+#include "w_wad.h"
 
 
 /* CVARs and CCMDs */
@@ -66,6 +72,8 @@ CVAR (Int, viz_log, 0, CVAR_NOSET)
 // control
 CVAR (Bool, viz_controlled, false, CVAR_NOSET)
 CVAR (String, viz_instance_id, "0", CVAR_NOSET)
+CVAR (String, viz_notify_fifo, "", CVAR_NOSET) // FIFO written to every time message is sent to controller
+CVAR (String, viz_fork_server, "", CVAR_NOSET) // Id of the fork server, engine is forked for every instance
 CVAR (Int, viz_seed, 0, CVAR_NOSET)
 CVAR (Bool, viz_cmd_filter, true, CVAR_NOSET)
 
@@ -73,13 +81,27 @@ CVAR (Bool, viz_cmd_filter, true, CVAR_NOSET)
 CVAR (Bool, viz_async, false, CVAR_NOSET)
 CVAR (Bool, viz_allow_input, false, CVAR_NOSET)
 CVAR (Int, viz_sync_timeout, 1000, CVAR_NOSET | CVAR_SERVERINFO) // In milliseconds
+CVAR (Bool, viz_sm_sync, false, CVAR_NOSET)
 
 // buffers
 CVAR (Int, viz_screen_format, 0, 0)
+CVAR (Bool, viz_screen_lut, true, 0)
+CVAR (Bool, viz_screen, true, 0)
+CVAR (Int, viz_obs_width, 0, 0)       // 0 - observation disabled
+CVAR (Int, viz_obs_height, 0, 0)
+CVAR (Bool, viz_obs_gray, false, 0)
+CVAR (Bool, viz_obs_nearest, false, 0) // Nearest neighbour instead of area averaging
+CVAR (Bool, viz_obs_float, false, 0)   // Float32 values in [0, 1] instead of bytes
+CVAR (Bool, viz_obs_max_pool, false, 0) // Max over the last two tics of multi-tic actions
+CVAR (Bool, viz_perf_stats, false, 0) // Publish time spent in each stage to shared memory
 CVAR (Bool, viz_depth, false, 0)
 CVAR (Bool, viz_labels, false, 0)
 CVAR (Bool, viz_automap, false, 0)
 CVAR (Bool, viz_objects, false, 0)
+CVAR (Float, viz_objects_radius, 0, 0)    // In map units, 0 - no limit
+CVAR (Int, viz_objects_max, 0, 0)         // Number of the nearest objects, 0 - no limit
+CVAR (String, viz_objects_names, "", 0)   // Comma-separated names
+CVAR (Bool, viz_objects_exclude, false, 0)
 CVAR (Bool, viz_sectors, false, 0)
 
 // rendering options (bitset)
@@ -98,6 +120,7 @@ CVAR (Bool, viz_window_hidden, false, CVAR_NOSET)
 CVAR (Bool, viz_noxserver, false, CVAR_NOSET)
 CVAR (Bool, viz_noconsole, false, CVAR_NOSET)
 CVAR (Bool, viz_nosound, false, CVAR_NOSET)
+CVAR (Bool, viz_shared_resources, false, CVAR_NOSET) // Map WADs and share decoded textures with other engines
 
 // multiplayer/recordings
 CVAR (Int, viz_override_player, 0, 0)
@@ -116,6 +139,19 @@ CCMD(viz_set_seed){
     VIZ_DebugMsg(2, VIZ_FUNC, "viz_seed changed to: %d.", rngseed);
 }
 
+// Prints time spent in each stage of the engine's work, "viz_stats reset" resets the counters
+CCMD(viz_stats){
+    if(argv.argc() > 1 && !stricmp(argv[1], "reset")) VIZ_StatsReset();
+    else VIZ_StatsPrint();
+}
+
+// Reseeds all RNGs immediately, unlike viz_set_seed that only applies on the next map load
+CCMD(viz_reseed){
+    rngseed = atoi(argv[1]);
+    FRandom::StaticClearRandom();
+    VIZ_DebugMsg(2, VIZ_FUNC, "RNGs reseeded with: %d.", rngseed);
+}
+
 
 /* Flow */
 /*--------------------------------------------------------------------------------------------------------------------*/
@@ -123,6 +159,7 @@ CCMD(viz_set_seed){
 int vizTime = 0;
 bool vizNextTic = false;
 bool vizUpdate = false;
+int vizTicsLeft = 0;
 unsigned int vizLastUpdate = 0;
 int vizNodesRecv[VIZ_MAX_PLAYERS];
 
@@ -151,12 +188,22 @@ void VIZ_FreezeTime (bool frozen){
 
 void VIZ_Init(){
     if(*viz_controlled) {
-        Printf("VIZ_Init: instance id: %s, async: %d, input: %d\n", *viz_instance_id, *viz_async, *viz_allow_input);
+        // Before forking, so forks share the mappings with the fork server
+        if(*viz_shared_resources){
+            Wads.MapFiles();
+            VIZ_TextureCacheInit();
+        }
+
+        // Returns only in forked engines, with instance CVARs already set
+        if(strlen(*viz_fork_server)) VIZ_ForkServer(*viz_fork_server);
+
+        Printf("VIZ_Init: instance id: %s, async: %d, input: %d, sm sync: %d\n", *viz_instance_id, *viz_async, *viz_allow_input, *viz_sm_sync);
 
         VIZ_CVARsUpdate();
 
         VIZ_MQInit(*viz_instance_id);
         VIZ_SMInit(*viz_instance_id);
+        VIZ_SnapshotInit(*viz_instance_id);
 
         VIZ_GameStateInit();
         VIZ_InputInit();
@@ -187,6 +234,7 @@ void VIZ_Close(){
         VIZ_GameStateClose();
         VIZ_ScreenClose();
 
+        VIZ_SnapshotClose();
         VIZ_SMClose();
         VIZ_MQClose();
     }
@@ -202,6 +250,48 @@ void VIZ_AsyncStartTic(){
     }
 }
 
+/* Stats */
+/*--------------------------------------------------------------------------------------------------------------------*/
+
+cycle_t vizStatsCycles[VIZ_STATS_STAGES];
+unsigned int vizStatsCounts[VIZ_STATS_STAGES] = {0};
+double vizStatsLastWrite[VIZ_STATS_STAGES] = {0}; // Totals at the previous write, the difference is the last step
+
+void VIZ_StatsClock(VIZStatsStage stage){
+    vizStatsCycles[stage].Clock();
+}
+
+void VIZ_StatsUnclock(VIZStatsStage stage){
+    vizStatsCycles[stage].Unclock();
+    ++vizStatsCounts[stage];
+}
+
+void VIZ_StatsReset(){
+    for(int i = 0; i < VIZ_STATS_STAGES; ++i){
+        vizStatsCycles[i].Reset();
+        vizStatsCounts[i] = 0;
+        vizStatsLastWrite[i] = 0;
+    }
+}
+
+void VIZ_StatsPrint(){
+    const char *names[VIZ_STATS_STAGES] = {"tic", "render", "copy", "state", "info"};
+    for(int i = 0; i < VIZ_STATS_STAGES; ++i){
+        Printf("VIZ_Stats: %s: count: %u, total: %.3f ms, avg: %.3f ms\n", names[i], vizStatsCounts[i],
+               vizStatsCycles[i].TimeMS(), vizStatsCounts[i] ? vizStatsCycles[i].TimeMS() / vizStatsCounts[i] : 0.0);
+    }
+}
+
+void VIZ_StatsWrite(unsigned int *counts, double *totals, double *lasts){
+    for(int i = 0; i < VIZ_STATS_STAGES; ++i){
+        double total = vizStatsCycles[i].TimeMS();
+        counts[i] = vizStatsCounts[i];
+        totals[i] = total;
+        lasts[i] = total - vizStatsLastWrite[i];
+        vizStatsLastWrite[i] = total;
+    }
+}
+
 void VIZ_Tic(){
 
     VIZ_DebugMsg(2, VIZ_FUNC, "tic: %d, vizTime: %d", gametic, vizTime);
@@ -210,13 +300,13 @@ void VIZ_Tic(){
     if(*viz_debug >= 5){
         std::string vizCvarsStateMsg = std::string("viz_cvars: ")
             + "viz_controlled: %d, viz_instance_id: %d, viz_seed: %d, viz_async: %d, viz_allow_input: %d, viz_sync_timeout: %d"
-            + ", viz_screen_format: %d, viz_depth: %d, viz_labels: %d, viz_automap: %d, viz_render_mode: %d, viz_automap_mode: %d"
+            + ", viz_screen_format: %d, viz_screen: %d, viz_depth: %d, viz_labels: %d, viz_automap: %d, viz_render_mode: %d, viz_automap_mode: %d"
             + ", viz_render_corpses: %d, viz_render_all: %d, viz_window_hidden: %d, viz_noxserver: %d, viz_noconsole: %d, viz_nosound: %d"
             + ", viz_override_player: %d, viz_loop_map: %d, viz_nocheat: %d, viz_respawn_delay: %d";
 
         VIZ_DebugMsg(5, VIZ_FUNC, vizCvarsStateMsg.c_str(),
                      *viz_controlled, *viz_instance_id, *viz_seed, *viz_async, *viz_allow_input, *viz_sync_timeout,
-                     *viz_screen_format, *viz_depth, *viz_labels, *viz_automap, *viz_render_mode, *viz_automap_mode,
+                     *viz_screen_format, *viz_screen, *viz_depth, *viz_labels, *viz_automap, *viz_render_mode, *viz_automap_mode,
                      *viz_render_corpses, *viz_render_all, *viz_window_hidden, *viz_noxserver, *viz_noconsole, *viz_nosound,
                      *viz_override_player, *viz_loop_map, *viz_nocheat, *viz_respawn_delay);
     }
@@ -224,17 +314,48 @@ void VIZ_Tic(){
     VIZ_InterruptionPoint();
 
     if (*viz_controlled){
+        bool rendered = false;
+
         if(vizNextTic) {
             VIZ_GameStateTic();
-            if(vizUpdate) {
-                VIZ_Update();
+
+            // Multiple tics requested, continue without waiting for the next message,
+            // intermediate tics only run the game logic
+            if(vizTicsLeft > 1 && VIZ_GameStateIsTicPossible()) {
+                // Observation of the tic before the last one is kept for max-pooling with the last one
+                if(vizTicsLeft == 2 && *viz_obs_max_pool && vizObsSize) {
+                    VIZ_StatsClock(VIZ_STATS_RENDER);
+                    VIZ_D_ScreenDisplay();
+                    VIZ_StatsUnclock(VIZ_STATS_RENDER);
+
+                    VIZ_StatsClock(VIZ_STATS_COPY);
+                    VIZ_ObservationPoolUpdate();
+                    VIZ_StatsUnclock(VIZ_STATS_COPY);
+                    rendered = true;
+                }
+                --vizTicsLeft;
+            }
+            else {
+                // Update is always made if episode ended before making all requested tics
+                if(vizUpdate || vizTicsLeft > 1) {
+                    VIZ_Update();
+                    rendered = true;
+                }
+                VIZ_MQSendDone();
+                vizNextTic = false;
+                vizTicsLeft = 0;
             }
-            VIZ_MQSend(VIZ_MSG_CODE_DOOM_DONE);
-            vizNextTic = false;
+        }
+
+        // Frames that are not sent to the library are rendered only for preview in the window
+        if(*viz_render_all && !rendered){
+            VIZ_StatsClock(VIZ_STATS_RENDER);
+            D_Display();
+            VIZ_StatsUnclock(VIZ_STATS_RENDER);
         }
 
         if(!*viz_async){
-            VIZ_MQTic();
+            if(!vizNextTic) VIZ_MQTic();
             VIZ_InputTic();
             ++vizTime;
         }
@@ -250,12 +371,25 @@ void VIZ_Update(){
     VIZ_DebugMsg(3, VIZ_FUNC, "tic: %d, vizTime: %d, lastupdate: %d", gametic, VIZ_TIME, vizLastUpdate);
 
     if(!*viz_nocheat && *viz_automap){
+        VIZ_StatsClock(VIZ_STATS_RENDER);
         VIZ_D_MapDisplay();
+        VIZ_StatsUnclock(VIZ_STATS_RENDER);
+
+        VIZ_StatsClock(VIZ_STATS_COPY);
         VIZ_ScreenLevelMapUpdate();
+        VIZ_StatsUnclock(VIZ_STATS_COPY);
     }
+
+    VIZ_StatsClock(VIZ_STATS_RENDER);
     VIZ_D_ScreenDisplay();
+    VIZ_StatsUnclock(VIZ_STATS_RENDER);
+
+    VIZ_StatsClock(VIZ_STATS_COPY);
     VIZ_ScreenUpdate();
+    VIZ_StatsUnclock(VIZ_STATS_COPY);
+
     VIZ_GameStateUpdate();
+    if(*viz_perf_stats) VIZ_GameStateUpdateStats();
 
     vizLastUpdate = VIZ_TIME;
     vizUpdate = false;
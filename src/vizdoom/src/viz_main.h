@@ -28,9 +28,21 @@
 extern int vizTime;
 extern bool vizNextTic;
 extern bool vizUpdate;
+extern int vizTicsLeft;
 extern unsigned int vizLastUpdate;
 extern int vizNodesRecv[VIZ_MAX_PLAYERS];
 
+enum VIZStatsStage {
+    VIZ_STATS_TIC,      // game logic
+    VIZ_STATS_RENDER,   // rendering of the screen and automap
+    VIZ_STATS_COPY,     // copying of the buffers to shared memory
+    VIZ_STATS_STATE,    // game variables
+    VIZ_STATS_INFO,     // labels, objects and sectors
+    VIZ_STATS_STAGES
+};
+
+static_assert(VIZ_STATS_STAGES == VIZ_STATS_STAGE_COUNT, "VIZ_STATS_STAGE_COUNT has to match VIZStatsStage");
+
 void VIZ_Init();
 
 void VIZ_AsyncStartTic();
@@ -39,6 +51,16 @@ void VIZ_Tic();
 
 void VIZ_Update();
 
+void VIZ_StatsClock(VIZStatsStage stage);
+
+void VIZ_StatsUnclock(VIZStatsStage stage);
+
+void VIZ_StatsReset();
+
+void VIZ_StatsPrint();
+
+void VIZ_StatsWrite(unsigned int *counts, double *totals, double *lasts);
+
 void VIZ_CVARsInit();
 
 void VIZ_CVARsUpdate();
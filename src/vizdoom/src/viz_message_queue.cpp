@@ -24,15 +24,29 @@
 #include "viz_input.h"
 #include "viz_game.h"
 #include "viz_main.h"
+#include "viz_shared_memory.h"
+#include "viz_snapshot.h"
+
+#ifndef _WIN32
+    #include <fcntl.h>
+    #include <unistd.h>
+#endif
 
 EXTERN_CVAR (Int, viz_debug)
 EXTERN_CVAR (Bool, viz_async)
+EXTERN_CVAR (Bool, viz_sm_sync)
+EXTERN_CVAR (String, viz_notify_fifo)
 
 bip::message_queue *vizMQController = nullptr;
 bip::message_queue *vizMQDoom = nullptr;
 char *vizMQControllerName;
 char *vizMQDoomName;
 
+uint32_t vizMQSyncSeq = 0;
+bool vizMQSyncReply = false;
+
+int vizMQNotifyFd = -1;
+
 void VIZ_MQInit(const char * id){
 
     Printf("VIZ_MQInit: Init message queues.\n");
@@ -52,6 +66,21 @@ void VIZ_MQInit(const char * id){
     catch(...){ // bip::interprocess_exception
         VIZ_Error(VIZ_FUNC, "Failed to open message queues.");
     }
+
+    #ifndef _WIN32
+        if(strlen(*viz_notify_fifo)){
+            // Controller keeps the read end open, so non-blocking open doesn't fail
+            vizMQNotifyFd = open(*viz_notify_fifo, O_WRONLY | O_NONBLOCK);
+            if(vizMQNotifyFd < 0) VIZ_Error(VIZ_FUNC, "Failed to open notification FIFO.");
+        }
+    #endif
+}
+
+void VIZ_MQNotify(){
+    #ifndef _WIN32
+        // If FIFO is full, controller has pending notification anyway
+        if(vizMQNotifyFd >= 0 && write(vizMQNotifyFd, "", 1) < 0) {}
+    #endif
 }
 
 
@@ -61,10 +90,22 @@ void VIZ_MQSend(uint8_t code, const char * command){
     if(command) strncpy(msg.command, command, VIZ_MQ_MAX_CMD_LEN);
 
     if(vizMQController) vizMQController->send(&msg, sizeof(VIZMessage), 0);
+    VIZ_MQNotify();
 
     VIZ_DebugMsg(4, VIZ_FUNC, "Sent msg: %d.", code);
 }
 
+void VIZ_MQSendDone(){
+    if(vizMQSyncReply){
+        vizInput->SYNC_DONE_SEQ.store(vizMQSyncSeq, std::memory_order_release);
+        VIZ_SMSyncWake(&vizInput->SYNC_DONE_SEQ);
+        VIZ_MQNotify();
+
+        VIZ_DebugMsg(4, VIZ_FUNC, "Sent done through SM, seq: %u.", vizMQSyncSeq);
+    }
+    else VIZ_MQSend(VIZ_MSG_CODE_DOOM_DONE);
+}
+
 void VIZ_MQReceive(void *msg) {
     size_t size;
     unsigned int priority;
@@ -81,13 +122,42 @@ bool VIZ_MQTryReceive(void *msg){
     return vizMQDoom->try_receive(msg, sizeof(VIZMessage), size, priority);
 }
 
+void VIZ_MQSyncReceive(void *msg){
+    VIZMessage *vizMsg = static_cast<VIZMessage *>(msg);
+
+    while(true){
+        // Messages sent through the queue before the request (e.g. commands) have to be received first
+        uint32_t seq = vizInput->SYNC_REQUEST_SEQ.load(std::memory_order_acquire);
+
+        if(VIZ_MQTryReceive(msg)){
+            vizMQSyncReply = false;
+            break;
+        }
+
+        if(seq != vizMQSyncSeq){
+            vizMQSyncSeq = seq;
+            vizMQSyncReply = true;
+            vizMsg->code = vizInput->SYNC_REQUEST_CODE;
+            snprintf(vizMsg->command, VIZ_MQ_MAX_CMD_LEN, "%u", vizInput->SYNC_REQUEST_TICS);
+            break;
+        }
+
+        VIZ_SMSyncWait(&vizInput->SYNC_REQUEST_SEQ, seq, VIZ_SM_SYNC_TIMEOUT);
+    }
+
+    VIZ_DebugMsg(4, VIZ_FUNC, "Received msg: %d, through SM: %d.", vizMsg->code, vizMQSyncReply);
+}
+
 void VIZ_MQTic(){
 
     VIZMessage msg;
 
     do {
-        if(!*viz_async) VIZ_MQReceive(&msg);
-        else if(!VIZ_MQTryReceive(&msg)) break;
+        if(*viz_async) {
+            if (!VIZ_MQTryReceive(&msg)) break;
+        }
+        else if(*viz_sm_sync) VIZ_MQSyncReceive(&msg);
+        else VIZ_MQReceive(&msg);
 
         switch(msg.code){
             case VIZ_MSG_CODE_TIC :
@@ -97,7 +167,7 @@ void VIZ_MQTic(){
             case VIZ_MSG_CODE_UPDATE:
                 VIZ_Update();
                 VIZ_GameStateTic();
-                VIZ_MQSend(VIZ_MSG_CODE_DOOM_DONE);
+                VIZ_MQSendDone();
                 break;
 
             case VIZ_MSG_CODE_TIC_AND_UPDATE:
@@ -105,6 +175,29 @@ void VIZ_MQTic(){
                 vizNextTic = true;
                 break;
 
+            case VIZ_MSG_CODE_TICS:
+                vizTicsLeft = atoi(msg.command);
+                vizNextTic = true;
+                break;
+
+            case VIZ_MSG_CODE_TICS_AND_UPDATE:
+                vizTicsLeft = atoi(msg.command);
+                vizUpdate = true;
+                vizNextTic = true;
+                break;
+
+            case VIZ_MSG_CODE_SAVE_SNAPSHOT:
+                VIZ_SnapshotSave();
+                VIZ_MQSendDone();
+                break;
+
+            case VIZ_MSG_CODE_LOAD_SNAPSHOT:
+                VIZ_SnapshotLoad();
+                VIZ_Update();
+                VIZ_GameStateTic();
+                VIZ_MQSendDone();
+                break;
+
             case VIZ_MSG_CODE_COMMAND:
                 if(msg.command[0] != '\0') VIZ_Command(strdup(msg.command));
                 VIZ_CVARsUpdate();
@@ -124,6 +217,12 @@ void VIZ_MQClose(){
     //bip::message_queue::remove(vizMQDoomName);
     delete vizMQController;
     delete vizMQDoom;
+
+    #ifndef _WIN32
+        if(vizMQNotifyFd >= 0) close(vizMQNotifyFd);
+        vizMQNotifyFd = -1;
+    #endif
+
 	delete[] vizMQControllerName;
 	delete[] vizMQDoomName;
 }
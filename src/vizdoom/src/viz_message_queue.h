@@ -32,6 +32,8 @@ extern bip::message_queue *vizMQDoom;
 
 #define VIZ_MQ_NAME_CTR_BASE "ViZDoomMQCtr"
 #define VIZ_MQ_NAME_DOOM_BASE "ViZDoomMQDoom"
+#define VIZ_MQ_NAME_FORK_REQ_BASE "ViZDoomMQForkReq"
+#define VIZ_MQ_NAME_FORK_REP_BASE "ViZDoomMQForkRep"
 #define VIZ_MQ_MAX_MSG_NUM 64
 #define VIZ_MQ_MAX_MSG_SIZE sizeof(VIZMessageCommand)
 #define VIZ_MQ_MAX_CMD_LEN 128
@@ -39,6 +41,10 @@ extern bip::message_queue *vizMQDoom;
 #define VIZ_MSG_CODE_DOOM_DONE 11
 #define VIZ_MSG_CODE_DOOM_CLOSE 12
 #define VIZ_MSG_CODE_DOOM_ERROR 13
+#define VIZ_MSG_CODE_DOOM_FORKED 15
+
+#define VIZ_MSG_CODE_FORK_CVAR 17
+#define VIZ_MSG_CODE_FORK 18
 
 #define VIZ_MSG_CODE_TIC 21
 #define VIZ_MSG_CODE_UPDATE 22
@@ -46,6 +52,10 @@ extern bip::message_queue *vizMQDoom;
 #define VIZ_MSG_CODE_COMMAND 24
 #define VIZ_MSG_CODE_CLOSE 25
 #define VIZ_MSG_CODE_ERROR 26
+#define VIZ_MSG_CODE_TICS 27
+#define VIZ_MSG_CODE_TICS_AND_UPDATE 28
+#define VIZ_MSG_CODE_SAVE_SNAPSHOT 29
+#define VIZ_MSG_CODE_LOAD_SNAPSHOT 20
 
 
 struct VIZMessage{
@@ -55,9 +65,12 @@ struct VIZMessage{
 
 void VIZ_MQInit(const char * id);
 
+void VIZ_MQNotify();
 void VIZ_MQSend(uint8_t code, const char * command = nullptr);
+void VIZ_MQSendDone();
 void VIZ_MQReceive(void *msg);
 bool VIZ_MQTryReceive(void *msg);
+void VIZ_MQSyncReceive(void *msg);
 
 void VIZ_MQTic();
 
@@ -25,21 +25,50 @@
 #include "viz_depth.h"
 #include "viz_labels.h"
 #include "viz_main.h"
+#include "viz_video.h"
+
+#include <algorithm>
+#include <vector>
 
 unsigned int vizScreenWidth, vizScreenHeight;
 size_t vizScreenPitch, vizScreenSize, vizScreenChannelSize;
+unsigned int vizObsWidth, vizObsHeight, vizObsChannels;
+size_t vizObsSize;
+
+// Observation of the previous tic, max-pooled with the next observation
+std::vector<BYTE> vizObsPool;
+bool vizObsPoolReady = false;
 
 int posMulti, rPos, gPos, bPos, aPos;
 bool alpha;
 
-BYTE *vizScreenSM = NULL, *vizDepthSM = NULL, *vizLabelsSM = NULL, *vizAutomapSM = NULL;
+BYTE *vizScreenSM = NULL, *vizDepthSM = NULL, *vizLabelsSM = NULL, *vizAutomapSM = NULL, *vizObsSM = NULL;
 
 EXTERN_CVAR (Int, viz_debug)
 EXTERN_CVAR (Int, viz_screen_format)
+EXTERN_CVAR (Bool, viz_screen_lut)
+EXTERN_CVAR (Bool, viz_screen)
+EXTERN_CVAR (Int, viz_obs_width)
+EXTERN_CVAR (Int, viz_obs_height)
+EXTERN_CVAR (Bool, viz_obs_gray)
+EXTERN_CVAR (Bool, viz_obs_nearest)
+EXTERN_CVAR (Bool, viz_obs_float)
+EXTERN_CVAR (Bool, viz_obs_max_pool)
 EXTERN_CVAR (Bool, viz_depth)
 EXTERN_CVAR (Bool, viz_labels)
 EXTERN_CVAR (Bool, viz_automap)
 EXTERN_CVAR (Bool, viz_nocheat)
+EXTERN_CVAR (Bool, viz_async)
+EXTERN_CVAR (Bool, viz_render_all)
+
+// Headless canvas is always accessible, so it doesn't need to be locked
+static void VIZ_ScreenLock(){
+    if(!VIZ_VideoIsHeadless()) screen->Lock(true);
+}
+
+static void VIZ_ScreenUnlock(){
+    if(!VIZ_VideoIsHeadless()) screen->Unlock();
+}
 
 void VIZ_ScreenInit() {
 
@@ -145,6 +174,17 @@ void VIZ_ScreenFormatUpdate(){
             VIZ_Error(VIZ_FUNC, "Unknown screen format.");
     }
 
+    // Observation has the layout of the screen format, GRAY8 and DOOM_256_COLORS8 give grayscale observation
+    vizObsWidth = vizObsHeight = 0;
+    vizObsChannels = 1;
+    if(*viz_obs_width > 0 && *viz_obs_height > 0){
+        vizObsWidth = (unsigned int)*viz_obs_width;
+        vizObsHeight = (unsigned int)*viz_obs_height;
+    }
+    if(!*viz_obs_gray && *viz_screen_format != VIZ_SCREEN_GRAY8 && *viz_screen_format != VIZ_SCREEN_DOOM_256_COLORS8)
+        vizObsChannels = posMulti == 1 ? 3 : posMulti;
+    vizObsSize = (size_t)vizObsWidth * vizObsHeight * vizObsChannels * (*viz_obs_float ? sizeof(float) : sizeof(BYTE));
+
     if (vizDepthMap != NULL){
         delete vizDepthMap;
         vizDepthMap = NULL;
@@ -163,8 +203,12 @@ void VIZ_ScreenFormatUpdate(){
 
 void VIZ_ScreenUpdateSM(){
 
-    size_t SMBufferSize[4] = {vizScreenSize, 0, 0, 0};
-    size_t SMBuffersSize = vizScreenSize;
+    size_t SMBufferSize[5] = {0, 0, 0, 0, 0};
+    size_t SMBuffersSize = 0;
+    if (*viz_screen){
+        SMBuffersSize += vizScreenSize;
+        SMBufferSize[0] = vizScreenSize;
+    }
     if (*viz_depth){
         SMBuffersSize += vizScreenChannelSize;
         SMBufferSize[1] = vizScreenChannelSize;
@@ -177,11 +221,15 @@ void VIZ_ScreenUpdateSM(){
         SMBuffersSize += vizScreenSize;
         SMBufferSize[3] = vizScreenSize;
     }
+    if (vizObsSize){
+        SMBuffersSize += vizObsSize;
+        SMBufferSize[4] = vizObsSize;
+    }
 
     VIZ_SMUpdate(SMBuffersSize);
 
     try {
-        for (int i = 0; i != 4; ++i) {
+        for (int i = 0; i != 5; ++i) {
             VIZSMRegion *bufferRegion = &vizSMRegion[VIZ_SM_SCREEN_NUM + i];
             if (SMBufferSize[i]) {
                 VIZ_SMCreateRegion(bufferRegion, false, VIZ_SMGetRegionOffset(bufferRegion), SMBufferSize[i]);
@@ -201,27 +249,22 @@ void VIZ_ScreenUpdateSM(){
     vizDepthSM = static_cast<BYTE *>(VIZ_SM_DEPTH.address);
     vizLabelsSM = static_cast<BYTE *>(VIZ_SM_LABELS.address);
     vizAutomapSM = static_cast<BYTE *>(VIZ_SM_AUTOMAP.address);
-}
+    vizObsSM = static_cast<BYTE *>(VIZ_SM_OBSERVATION.address);
 
-void VIZ_CopyBuffer(BYTE *vizBuffer){
-
-    if(screen == NULL) return;
-
-    const BYTE *buffer = screen->GetBuffer();
-    PalEntry *palette = screen->GetPalette();
+    // Headless engine renders 256 colors frames straight into the shared memory if rows have no padding.
+    // The region is written only while rendering for the library, so not with frames rendered between its requests.
+    bool renderToSM = *viz_screen && vizScreenSM != NULL && *viz_screen_format == VIZ_SCREEN_DOOM_256_COLORS8
+                      && (size_t)screen->GetPitch() == vizScreenPitch && !*viz_async && !*viz_render_all;
+    VIZ_VideoSetTarget(renderToSM ? vizScreenSM : NULL);
+}
 
-    if(buffer == NULL || palette == NULL) return;
+void VIZ_CopyBufferPerPixel(BYTE *vizBuffer, const BYTE *buffer, const PalEntry *palette){
 
     const unsigned int screenSize = screen->GetWidth() * screen->GetHeight();
     const unsigned int bufferPitch = screen->GetPitch();
     const unsigned int screenWidth = screen->GetWidth();
     const unsigned int bufferPitchWidthDiff = bufferPitch - screenWidth;
 
-    VIZ_DebugMsg(3, VIZ_FUNC, "bufferSize: %d, screenSize: %d", vizScreenSize, screenSize);
-
-    if(vizScreenChannelSize != screenSize || vizScreenWidth != screenWidth)
-        VIZ_Error(VIZ_FUNC, "Buffers size mismatch.");
-
     if(*viz_screen_format == VIZ_SCREEN_DOOM_256_COLORS8){
         for(unsigned int i = 0; i < screenSize; ++i){
             unsigned int b = i + (i / screenWidth) * bufferPitchWidthDiff;
@@ -244,14 +287,221 @@ void VIZ_CopyBuffer(BYTE *vizBuffer){
             if (alpha) vizBuffer[pos + aPos] = 255;
         }
     }
+}
+
+void VIZ_CopyBufferLUT(BYTE *vizBuffer, const BYTE *buffer, const PalEntry *palette){
 
+    const unsigned int screenWidth = screen->GetWidth();
+    const unsigned int screenHeight = screen->GetHeight();
+    const unsigned int bufferPitch = screen->GetPitch();
 
+    if(*viz_screen_format == VIZ_SCREEN_DOOM_256_COLORS8){
+        for(unsigned int y = 0; y < screenHeight; ++y)
+            memcpy(vizBuffer + y * screenWidth, buffer + y * bufferPitch, screenWidth);
+    }
+    else if(*viz_screen_format == VIZ_SCREEN_GRAY8){
+        // Same values as the per pixel formula, truncated to a byte
+        BYTE grayLUT[256];
+        for(int c = 0; c < 256; ++c)
+            grayLUT[c] = (BYTE)(0.21 * palette[c].r + 0.72 * palette[c].g + 0.07 * palette[c].b);
+
+        for(unsigned int y = 0; y < screenHeight; ++y){
+            const BYTE *src = buffer + y * bufferPitch;
+            BYTE *dst = vizBuffer + y * screenWidth;
+            for(unsigned int x = 0; x < screenWidth; ++x) dst[x] = grayLUT[src[x]];
+        }
+    }
+    else if(posMulti == 1){
+        // Planar formats (CRCGCB, CBCGCR), all three planes are filled in one pass
+        BYTE rLUT[256], gLUT[256], bLUT[256];
+        for(int c = 0; c < 256; ++c){
+            rLUT[c] = palette[c].r;
+            gLUT[c] = palette[c].g;
+            bLUT[c] = palette[c].b;
+        }
+
+        for(unsigned int y = 0; y < screenHeight; ++y){
+            const BYTE *src = buffer + y * bufferPitch;
+            BYTE *rDst = vizBuffer + rPos + y * screenWidth;
+            BYTE *gDst = vizBuffer + gPos + y * screenWidth;
+            BYTE *bDst = vizBuffer + bPos + y * screenWidth;
+            for(unsigned int x = 0; x < screenWidth; ++x){
+                const BYTE c = src[x];
+                rDst[x] = rLUT[c];
+                gDst[x] = gLUT[c];
+                bDst[x] = bLUT[c];
+            }
+        }
+    }
+    else {
+        // Packed formats, every palette entry is stored already in the output byte order
+        // and copied with a single memcpy of posMulti bytes per pixel.
+        BYTE pixelLUT[256][4];
+        for(int c = 0; c < 256; ++c){
+            pixelLUT[c][rPos] = palette[c].r;
+            pixelLUT[c][gPos] = palette[c].g;
+            pixelLUT[c][bPos] = palette[c].b;
+            if(alpha) pixelLUT[c][aPos] = 255;
+        }
+
+        const size_t rowSize = (size_t)screenWidth * posMulti;
+        for(unsigned int y = 0; y < screenHeight; ++y){
+            const BYTE *src = buffer + y * bufferPitch;
+            BYTE *dst = vizBuffer + y * rowSize;
+            if(posMulti == 4){
+                for(unsigned int x = 0; x < screenWidth; ++x, dst += 4) memcpy(dst, pixelLUT[src[x]], 4);
+            }
+            else {
+                for(unsigned int x = 0; x < screenWidth; ++x, dst += 3) memcpy(dst, pixelLUT[src[x]], 3);
+            }
+        }
+    }
+}
+
+void VIZ_CopyBuffer(BYTE *vizBuffer){
+
+    if(screen == NULL) return;
+
+    const BYTE *buffer = screen->GetBuffer();
+    PalEntry *palette = screen->GetPalette();
+
+    if(buffer == NULL || palette == NULL) return;
+
+    const unsigned int screenSize = screen->GetWidth() * screen->GetHeight();
+    const unsigned int screenWidth = screen->GetWidth();
+
+    VIZ_DebugMsg(3, VIZ_FUNC, "bufferSize: %d, screenSize: %d", vizScreenSize, screenSize);
+
+    if(vizScreenChannelSize != screenSize || vizScreenWidth != screenWidth)
+        VIZ_Error(VIZ_FUNC, "Buffers size mismatch.");
+
+    if(*viz_screen_lut) VIZ_CopyBufferLUT(vizBuffer, buffer, palette);
+    else VIZ_CopyBufferPerPixel(vizBuffer, buffer, palette);
+}
+
+void VIZ_ObservationUpdate(BYTE *vizBuffer){
+
+    if(screen == NULL) return;
+
+    const BYTE *buffer = screen->GetBuffer();
+    PalEntry *palette = screen->GetPalette();
+
+    if(buffer == NULL || palette == NULL) return;
+
+    const unsigned int srcWidth = screen->GetWidth();
+    const unsigned int srcHeight = screen->GetHeight();
+    const unsigned int srcPitch = screen->GetPitch();
+    const size_t obsPixels = (size_t)vizObsWidth * vizObsHeight;
+    const bool gray = vizObsChannels == 1;
+    const bool floatValues = *viz_obs_float;
+
+    // Offsets of channels (r, g, b, alpha) of the pixel and the distance between pixels
+    size_t channelPos[4] = {0, 0, 0, 0};
+    size_t pixelStride = 1;
+    if(!gray && posMulti == 1){
+        channelPos[0] = (rPos / vizScreenChannelSize) * obsPixels;
+        channelPos[1] = (gPos / vizScreenChannelSize) * obsPixels;
+        channelPos[2] = (bPos / vizScreenChannelSize) * obsPixels;
+    }
+    else if(!gray){
+        channelPos[0] = rPos; channelPos[1] = gPos; channelPos[2] = bPos;
+        if(alpha) channelPos[3] = aPos;
+        pixelStride = posMulti;
+    }
+
+    auto setValue = [&](size_t i, double value){
+        if(floatValues) reinterpret_cast<float *>(vizBuffer)[i] = (float)(value / 255.0);
+        else vizBuffer[i] = (BYTE)(value + 0.5);
+    };
+
+    auto setPixel = [&](size_t pixel, double r, double g, double b){
+        if(gray) setValue(pixel, 0.21 * r + 0.72 * g + 0.07 * b);
+        else {
+            size_t pos = pixel * pixelStride;
+            setValue(pos + channelPos[0], r);
+            setValue(pos + channelPos[1], g);
+            setValue(pos + channelPos[2], b);
+            if(pixelStride == 4) setValue(pos + channelPos[3], 255);
+        }
+    };
+
+    if(*viz_obs_nearest){
+        for(unsigned int oy = 0; oy < vizObsHeight; ++oy){
+            const BYTE *src = buffer + (size_t)((2 * oy + 1) * srcHeight / (2 * vizObsHeight)) * srcPitch;
+            for(unsigned int ox = 0; ox < vizObsWidth; ++ox){
+                const PalEntry &c = palette[src[(2 * ox + 1) * srcWidth / (2 * vizObsWidth)]];
+                setPixel((size_t)oy * vizObsWidth + ox, c.r, c.g, c.b);
+            }
+        }
+        return;
+    }
+
+    // Area averaging, every pixel of the observation is the mean color of the block of the frame it covers
+    static std::vector<unsigned int> columns, sums;
+    columns.resize(vizObsWidth + 1);
+    for(unsigned int ox = 0; ox <= vizObsWidth; ++ox) columns[ox] = ox * srcWidth / vizObsWidth;
+    sums.resize(vizObsWidth * 3);
+
+    for(unsigned int oy = 0; oy < vizObsHeight; ++oy){
+        const unsigned int yBegin = oy * srcHeight / vizObsHeight;
+        const unsigned int yEnd = std::max((oy + 1) * srcHeight / vizObsHeight, yBegin + 1);
+
+        std::fill(sums.begin(), sums.end(), 0);
+        for(unsigned int y = yBegin; y < yEnd; ++y){
+            const BYTE *src = buffer + (size_t)y * srcPitch;
+            for(unsigned int ox = 0; ox < vizObsWidth; ++ox){
+                unsigned int *sum = &sums[ox * 3];
+                const unsigned int xEnd = std::max(columns[ox + 1], columns[ox] + 1);
+                for(unsigned int x = columns[ox]; x < xEnd; ++x){
+                    const PalEntry &c = palette[src[x]];
+                    sum[0] += c.r;
+                    sum[1] += c.g;
+                    sum[2] += c.b;
+                }
+            }
+        }
+
+        for(unsigned int ox = 0; ox < vizObsWidth; ++ox){
+            const unsigned int xCount = std::max(columns[ox + 1], columns[ox] + 1) - columns[ox];
+            const double count = (double)((yEnd - yBegin) * xCount);
+            const unsigned int *sum = &sums[ox * 3];
+            setPixel((size_t)oy * vizObsWidth + ox, sum[0] / count, sum[1] / count, sum[2] / count);
+        }
+    }
+}
+
+void VIZ_ObservationPoolUpdate(){
+    VIZ_ScreenLock();
+
+    vizObsPool.resize(vizObsSize);
+    VIZ_ObservationUpdate(vizObsPool.data());
+    vizObsPoolReady = true;
+
+    VIZ_ScreenUnlock();
 }
 
 void VIZ_ScreenUpdate(){
-    screen->Lock(true);
+    VIZ_ScreenLock();
+
+    // Nothing to copy if the frame was rendered into the shared memory
+    if (*viz_screen && vizScreenSM != NULL && screen->GetBuffer() != vizScreenSM)
+        VIZ_CopyBuffer(vizScreenSM);
 
-    VIZ_CopyBuffer(vizScreenSM);
+    if (vizObsSize && vizObsSM != NULL) {
+        VIZ_ObservationUpdate(vizObsSM);
+
+        if (vizObsPoolReady && *viz_obs_max_pool && vizObsPool.size() == vizObsSize) {
+            if (*viz_obs_float) {
+                float *obs = reinterpret_cast<float *>(vizObsSM);
+                const float *pool = reinterpret_cast<const float *>(vizObsPool.data());
+                for (size_t i = 0; i < vizObsSize / sizeof(float); ++i) obs[i] = std::max(obs[i], pool[i]);
+            }
+            else {
+                for (size_t i = 0; i < vizObsSize; ++i) vizObsSM[i] = std::max(vizObsSM[i], vizObsPool[i]);
+            }
+        }
+    }
+    vizObsPoolReady = false;
 
     if (*viz_depth && vizDepthMap != NULL)
         memcpy(vizDepthSM, vizDepthMap->getBuffer(), vizDepthMap->getBufferSize());
@@ -259,16 +509,19 @@ void VIZ_ScreenUpdate(){
     if (*viz_labels && vizLabels != NULL)
         memcpy(vizLabelsSM, vizLabels->getBuffer(), vizLabels->getBufferSize());
 
-    screen->Unlock();
+    VIZ_ScreenUnlock();
 }
 
 void VIZ_ScreenLevelMapUpdate(){
-    screen->Lock(true);
+    VIZ_ScreenLock();
     if(*viz_automap) VIZ_CopyBuffer(vizAutomapSM);
-    screen->Unlock();
+    VIZ_ScreenUnlock();
 }
 
 void VIZ_ScreenClose(){
+    // Shared memory is unmapped after this
+    VIZ_VideoSetTarget(NULL);
+
     if(vizDepthMap) delete vizDepthMap;
     if(vizLabels) delete vizLabels;
 }
\ No newline at end of file
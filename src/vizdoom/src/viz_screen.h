@@ -30,6 +30,8 @@
 
 extern unsigned int vizScreenWidth, vizScreenHeight;
 extern size_t vizScreenPitch, vizScreenSize, vizScreenChannelSize;
+extern unsigned int vizObsWidth, vizObsHeight, vizObsChannels;
+extern size_t vizObsSize;
 
 enum VIZScreenFormat {
     VIZ_SCREEN_CRCGCB           = 0,
@@ -54,6 +56,10 @@ void VIZ_ScreenSetSize();
 
 void VIZ_CopyBuffer(BYTE* vizBuffer);
 
+void VIZ_ObservationUpdate(BYTE* vizBuffer);
+
+void VIZ_ObservationPoolUpdate();
+
 void VIZ_ScreenUpdate();
 
 void VIZ_ScreenLevelMapUpdate();
@@ -29,6 +29,17 @@
 #include "doomstat.h"
 #include "v_video.h"
 
+#include <chrono>
+#include <climits>
+#include <thread>
+
+#ifdef __linux__
+    #include <linux/futex.h>
+    #include <sys/syscall.h>
+    #include <unistd.h>
+    #include <ctime>
+#endif
+
 bip::shared_memory_object vizSM;
 size_t vizSMSize;
 char * vizSMName;
@@ -96,6 +107,28 @@ size_t VIZ_SMGetRegionOffset(VIZSMRegion* regionPtr){
     return offset;
 }
 
+// Waits (spin, then sleep) until the value of seq is different from the given value or timeout (in microseconds) passes
+void VIZ_SMSyncWait(std::atomic<uint32_t> *seq, uint32_t value, unsigned int timeout){
+    for(int i = 0; i < VIZ_SM_SYNC_SPIN_COUNT; ++i){
+        if(seq->load(std::memory_order_acquire) != value) return;
+    }
+
+    #ifdef __linux__
+        struct timespec timeoutSpec;
+        timeoutSpec.tv_sec = timeout / 1000000;
+        timeoutSpec.tv_nsec = (timeout % 1000000) * 1000;
+        syscall(SYS_futex, reinterpret_cast<uint32_t *>(seq), FUTEX_WAIT, value, &timeoutSpec, NULL, 0);
+    #else
+        std::this_thread::sleep_for(std::chrono::microseconds(VIZ_SM_SYNC_SLEEP_TIME));
+    #endif
+}
+
+void VIZ_SMSyncWake(std::atomic<uint32_t> *seq){
+    #ifdef __linux__
+        syscall(SYS_futex, reinterpret_cast<uint32_t *>(seq), FUTEX_WAKE, INT_MAX, NULL, NULL, 0);
+    #endif
+}
+
 void VIZ_SMClose(){
     for(int i = 0; i < VIZ_SM_REGION_COUNT; ++i) VIZ_SMDeleteRegion(&vizSMRegion[i]);
 	delete[] vizSMName;
@@ -25,9 +25,11 @@
 
 #include <boost/interprocess/shared_memory_object.hpp>
 #include <boost/interprocess/mapped_region.hpp>
+#include <atomic>
+#include <cstdint>
 
 #define VIZ_SM_NAME_BASE "ViZDoomSM"
-#define VIZ_SM_REGION_COUNT 6
+#define VIZ_SM_REGION_COUNT 7
 
 #define VIZ_SM_GAMESTATE_NUM    0
 #define VIZ_SM_INPUTSTATE_NUM   1
@@ -35,6 +37,7 @@
 #define VIZ_SM_DEPTH_NUM        3
 #define VIZ_SM_LABELS_NUM       4
 #define VIZ_SM_AUTOMAP_NUM      5
+#define VIZ_SM_OBSERVATION_NUM  6
 
 #define VIZ_SM_GAMESTATE    vizSMRegion[VIZ_SM_GAMESTATE_NUM]
 #define VIZ_SM_INPUTSTATE   vizSMRegion[VIZ_SM_INPUTSTATE_NUM]
@@ -42,6 +45,11 @@
 #define VIZ_SM_DEPTH        vizSMRegion[VIZ_SM_DEPTH_NUM]
 #define VIZ_SM_LABELS       vizSMRegion[VIZ_SM_LABELS_NUM]
 #define VIZ_SM_AUTOMAP      vizSMRegion[VIZ_SM_AUTOMAP_NUM]
+#define VIZ_SM_OBSERVATION  vizSMRegion[VIZ_SM_OBSERVATION_NUM]
+
+#define VIZ_SM_SYNC_SPIN_COUNT  4096
+#define VIZ_SM_SYNC_SLEEP_TIME  50      // In microseconds, used if futex is not available
+#define VIZ_SM_SYNC_TIMEOUT     10000   // In microseconds
 
 namespace bip = boost::interprocess;
 
@@ -76,6 +84,10 @@ void VIZ_SMDeleteRegion(VIZSMRegion* regionPtr);
 
 size_t VIZ_SMGetRegionOffset(VIZSMRegion* regionPtr);
 
+void VIZ_SMSyncWait(std::atomic<uint32_t> *seq, uint32_t value, unsigned int timeout);
+
+void VIZ_SMSyncWake(std::atomic<uint32_t> *seq);
+
 void VIZ_SMClose();
 
 #endif
@@ -0,0 +1,187 @@
+/*
+ Copyright (C) 2016 by Wojciech Jaśkowski, Michał Kempka, Grzegorz Runc, Jakub Toczek, Marek Wydmuch
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ THE SOFTWARE.
+*/
+
+#include "viz_snapshot.h"
+#include "viz_defines.h"
+#include "viz_game.h"
+#include "viz_main.h"
+
+#include "doomstat.h"
+#include "farchive.h"
+#include "g_level.h"
+#include "m_random.h"
+#include "p_acs.h"
+#include "version.h"
+
+#include <algorithm>
+
+bip::shared_memory_object vizSMSnapshot;
+bip::mapped_region *vizSMSnapshotRegion = NULL;
+size_t vizSMSnapshotSize = 0;
+char * vizSMSnapshotName;
+
+// Maps the whole snapshot shared memory after growing it (it never shrinks) to at least the given size
+void VIZ_SnapshotMap(size_t size){
+    try {
+        bip::offset_t smSize;
+        vizSMSnapshot.get_size(smSize);
+        if((size_t)smSize < size) vizSMSnapshot.truncate(size);
+        else size = (size_t)smSize;
+
+        delete vizSMSnapshotRegion;
+        vizSMSnapshotRegion = new bip::mapped_region(vizSMSnapshot, bip::read_write, 0, size);
+        vizSMSnapshotSize = size;
+
+        VIZ_DebugMsg(3, VIZ_FUNC, "New SMSnapshotSize: %zu", vizSMSnapshotSize);
+    }
+    catch(...){ // bip::interprocess_exception
+        VIZ_Error(VIZ_FUNC, "Failed to map snapshot shared memory.");
+    }
+}
+
+VIZSnapshotHeader *VIZ_SnapshotHeader(){
+    return static_cast<VIZSnapshotHeader *>(vizSMSnapshotRegion->get_address());
+}
+
+BYTE *VIZ_SnapshotData(){
+    return static_cast<BYTE *>(vizSMSnapshotRegion->get_address()) + sizeof(VIZSnapshotHeader);
+}
+
+// Uncompressed file reading and writing directly from/to the snapshot shared memory
+class VIZSnapshotFile : public FFile{
+public:
+    VIZSnapshotFile(EOpenMode mode) : mode(mode), pos(0) {
+        this->size = mode == EReading ? VIZ_SnapshotHeader()->SNAPSHOT_SIZE : 0;
+    }
+
+    bool Open(const char *name, EOpenMode mode){ return false; }
+    void Close(){ this->mode = ENotOpen; }
+    void Flush(){}
+    EOpenMode Mode() const { return this->mode; }
+    bool IsPersistent() const { return true; }
+    bool IsOpen() const { return this->mode != ENotOpen; }
+    unsigned int Tell() const { return this->pos; }
+
+    FFile &Write(const void *mem, unsigned int len){
+        if(sizeof(VIZSnapshotHeader) + this->pos + len > vizSMSnapshotSize)
+            VIZ_SnapshotMap(std::max(2 * vizSMSnapshotSize, sizeof(VIZSnapshotHeader) + this->pos + len));
+
+        memcpy(VIZ_SnapshotData() + this->pos, mem, len);
+        this->pos += len;
+        if(this->pos > this->size) this->size = this->pos;
+        return *this;
+    }
+
+    FFile &Read(void *mem, unsigned int len){
+        if(this->pos + len > this->size) VIZ_Error(VIZ_FUNC, "Attempt to read past the end of the snapshot.");
+
+        memcpy(mem, VIZ_SnapshotData() + this->pos, len);
+        this->pos += len;
+        return *this;
+    }
+
+    FFile &Seek(int pos, ESeekPos ofs){
+        if(ofs == ESeekRelative) pos += this->pos;
+        else if(ofs == ESeekEnd) pos += this->size;
+        this->pos = pos;
+        return *this;
+    }
+
+private:
+    EOpenMode mode;
+    unsigned int pos;
+    unsigned int size;
+};
+
+// Same data as in savegames, but only the current level is stored and the level doesn't have to be reloaded
+void VIZ_SnapshotSerialize(FArchive &arc){
+    SaveVersion = SAVEVER;
+
+    arc << level.time;
+    G_SerializeLevel(arc, false);
+    FRandom::StaticSerializeRNGState(arc);
+    P_SerializeACSVars(arc);
+
+    if(arc.IsStoring()) arc.Write(vizPlayerLogger, sizeof(vizPlayerLogger));
+    else arc.Read(vizPlayerLogger, sizeof(vizPlayerLogger));
+}
+
+void VIZ_SnapshotInit(const char * id){
+
+    Printf("VIZ_SnapshotInit: Init snapshot shared memory.\n");
+
+    vizSMSnapshotName = new char[strlen(VIZ_SM_SNAPSHOT_NAME_BASE) + strlen(id) + 1];
+    strcpy(vizSMSnapshotName, VIZ_SM_SNAPSHOT_NAME_BASE);
+    strcat(vizSMSnapshotName, id);
+
+    try {
+        bip::shared_memory_object::remove(vizSMSnapshotName);
+        vizSMSnapshot = bip::shared_memory_object(bip::open_or_create, vizSMSnapshotName, bip::read_write);
+
+        VIZ_DebugMsg(1, VIZ_FUNC, "SMSnapshotName: %s", vizSMSnapshotName);
+    }
+    catch(...){ // bip::interprocess_exception
+        VIZ_Error(VIZ_FUNC, "Failed to create snapshot shared memory.");
+    }
+
+    VIZ_SnapshotMap(VIZ_SM_SNAPSHOT_INIT_SIZE);
+    VIZ_SnapshotHeader()->SNAPSHOT_SIZE = 0;
+}
+
+void VIZ_SnapshotSave(){
+    VIZ_SnapshotHeader()->SNAPSHOT_SIZE = 0;
+    if(gamestate != GS_LEVEL) return;
+
+    VIZSnapshotFile file(FFile::EWriting);
+    {
+        FArchive arc(file);
+        VIZ_SnapshotSerialize(arc);
+    }
+    VIZ_SnapshotHeader()->SNAPSHOT_SIZE = file.Tell();
+
+    VIZ_DebugMsg(3, VIZ_FUNC, "Saved snapshot, size: %u", file.Tell());
+}
+
+void VIZ_SnapshotLoad(){
+    // Controller might have grown the shared memory to fit the snapshot
+    if(sizeof(VIZSnapshotHeader) + VIZ_SnapshotHeader()->SNAPSHOT_SIZE > vizSMSnapshotSize)
+        VIZ_SnapshotMap(sizeof(VIZSnapshotHeader) + VIZ_SnapshotHeader()->SNAPSHOT_SIZE);
+
+    if(gamestate != GS_LEVEL || !VIZ_SnapshotHeader()->SNAPSHOT_SIZE) return;
+
+    VIZSnapshotFile file(FFile::EReading);
+    {
+        FArchive arc(file);
+        VIZ_SnapshotSerialize(arc);
+    }
+
+    // Polyobjects are restored with the level
+    VIZ_GameStateGeometryChanged();
+
+    VIZ_DebugMsg(3, VIZ_FUNC, "Loaded snapshot, size: %u", file.Tell());
+}
+
+void VIZ_SnapshotClose(){
+    delete vizSMSnapshotRegion;
+    vizSMSnapshotRegion = NULL;
+    delete[] vizSMSnapshotName;
+}
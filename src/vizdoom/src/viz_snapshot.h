@@ -0,0 +1,48 @@
+/*
+ Copyright (C) 2016 by Wojciech Jaśkowski, Michał Kempka, Grzegorz Runc, Jakub Toczek, Marek Wydmuch
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ THE SOFTWARE.
+*/
+
+#ifndef __VIZ_SNAPSHOT_H__
+#define __VIZ_SNAPSHOT_H__
+
+#include <boost/interprocess/shared_memory_object.hpp>
+#include <boost/interprocess/mapped_region.hpp>
+#include <cstddef>
+
+#define VIZ_SM_SNAPSHOT_NAME_BASE "ViZDoomSMSnapshot"
+#define VIZ_SM_SNAPSHOT_INIT_SIZE 1048576
+
+namespace bip = boost::interprocess;
+
+// Snapshot shared memory starts with the header followed by the serialized state
+struct VIZSnapshotHeader{
+    size_t SNAPSHOT_SIZE;
+};
+
+void VIZ_SnapshotInit(const char * id);
+
+void VIZ_SnapshotSave();
+
+void VIZ_SnapshotLoad();
+
+void VIZ_SnapshotClose();
+
+#endif
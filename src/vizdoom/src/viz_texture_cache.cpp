@@ -0,0 +1,191 @@
+/*
+ Copyright (C) 2016 by Wojciech Jaśkowski, Michał Kempka, Grzegorz Runc, Jakub Toczek, Marek Wydmuch
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ THE SOFTWARE.
+*/
+
+#include "viz_texture_cache.h"
+#include "viz_defines.h"
+#include "viz_main.h"
+#include "viz_version.h"
+
+#include "w_wad.h"
+#include "textures/textures.h"
+
+#include <atomic>
+#include <cstdint>
+#include <sys/stat.h>
+
+#include <boost/interprocess/shared_memory_object.hpp>
+#include <boost/interprocess/mapped_region.hpp>
+
+namespace bip = boost::interprocess;
+
+/*
+ * Decoded textures shared by all engines using the same files. The segment is keyed by a hash of the files
+ * (and the engine version), so it persists and is reused by the following runs. It is lock-free, so an engine
+ * killed in the middle of storing a texture leaves only that texture uncached: slots are claimed with CAS
+ * on their key, data is allocated by bumping an offset and marked ready after it is written.
+ * The segment stays mapped until the engine exits, because textures keep pointing to it.
+ */
+
+struct VIZTextureCacheSlot {
+    std::atomic<uint64_t> key;      // 0 - empty
+    std::atomic<uint32_t> ready;
+    uint32_t size;
+    uint64_t offset;
+};
+
+struct VIZTextureCacheHeader {
+    std::atomic<uint64_t> used;
+    VIZTextureCacheSlot slots[VIZ_TEXTURE_CACHE_SLOTS];
+};
+
+bip::shared_memory_object vizTextureCacheSM;
+bip::mapped_region *vizTextureCacheRegion = NULL;
+VIZTextureCacheHeader *vizTextureCache = NULL;
+BYTE *vizTextureCacheData = NULL;
+uint64_t vizTextureCacheDataSize = 0;
+
+static uint64_t VIZ_TextureCacheHash(uint64_t hash, const void *data, size_t size){
+    // FNV-1a
+    const BYTE *bytes = static_cast<const BYTE *>(data);
+    for(size_t i = 0; i < size; ++i){
+        hash ^= bytes[i];
+        hash *= 1099511628211ULL;
+    }
+    return hash;
+}
+
+static uint64_t VIZ_TextureCacheFilesHash(){
+    uint64_t hash = 14695981039346656037ULL;
+    int version = VIZ_VERSION;
+    size_t cacheSize = VIZ_TEXTURE_CACHE_SIZE;
+    hash = VIZ_TextureCacheHash(hash, &version, sizeof(version));
+    hash = VIZ_TextureCacheHash(hash, &cacheSize, sizeof(cacheSize));
+
+    for(int i = 0; i < Wads.GetNumWads(); ++i){
+        const char *name = Wads.GetWadFullName(i);
+        if(name == NULL) continue;
+        hash = VIZ_TextureCacheHash(hash, name, strlen(name) + 1);
+
+        struct stat info;
+        if(stat(name, &info) == 0){
+            int64_t size = info.st_size, mtime = info.st_mtime;
+            hash = VIZ_TextureCacheHash(hash, &size, sizeof(size));
+            hash = VIZ_TextureCacheHash(hash, &mtime, sizeof(mtime));
+        }
+    }
+    return hash;
+}
+
+static uint64_t VIZ_TextureCacheKey(FTexture *texture){
+    // Textures are created in the same order by engines using the same files
+    if(!texture->id.isValid()) return 0;
+
+    int values[] = {texture->id.GetIndex(), texture->UseType, texture->GetWidth(), texture->GetHeight(),
+                    texture->bNoRemap0};
+    uint64_t key = VIZ_TextureCacheHash(14695981039346656037ULL, values, sizeof(values));
+    key = VIZ_TextureCacheHash(key, texture->Name.GetChars(), texture->Name.Len());
+    return key ? key : 1;
+}
+
+void VIZ_TextureCacheInit(){
+    char name[64];
+    snprintf(name, sizeof(name), "%s%016llx", VIZ_TEXTURE_CACHE_NAME_BASE,
+             (unsigned long long)VIZ_TextureCacheFilesHash());
+
+    try {
+        // New segment is filled with zeros, which is a valid empty cache
+        vizTextureCacheSM = bip::shared_memory_object(bip::open_or_create, name, bip::read_write);
+        vizTextureCacheSM.truncate(VIZ_TEXTURE_CACHE_SIZE);
+        vizTextureCacheRegion = new bip::mapped_region(vizTextureCacheSM, bip::read_write, 0, VIZ_TEXTURE_CACHE_SIZE);
+    }
+    catch(...){ // bip::interprocess_exception
+        Printf("VIZ_TextureCacheInit: Failed to open texture cache %s, textures won't be shared.\n", name);
+        delete vizTextureCacheRegion;
+        vizTextureCacheRegion = NULL;
+        return;
+    }
+
+    vizTextureCache = static_cast<VIZTextureCacheHeader *>(vizTextureCacheRegion->get_address());
+    vizTextureCacheData = reinterpret_cast<BYTE *>(vizTextureCache + 1);
+    vizTextureCacheDataSize = VIZ_TEXTURE_CACHE_SIZE - sizeof(VIZTextureCacheHeader);
+
+    VIZ_DebugMsg(1, VIZ_FUNC, "Texture cache: %s, used: %llu", name,
+                 (unsigned long long)vizTextureCache->used.load());
+}
+
+BYTE *VIZ_TextureCacheFind(FTexture *texture, int size){
+    if(vizTextureCache == NULL) return NULL;
+
+    uint64_t key = VIZ_TextureCacheKey(texture);
+    if(!key) return NULL;
+
+    for(unsigned int i = 0; i < VIZ_TEXTURE_CACHE_SLOTS; ++i){
+        VIZTextureCacheSlot &slot = vizTextureCache->slots[(key + i) % VIZ_TEXTURE_CACHE_SLOTS];
+        uint64_t slotKey = slot.key.load(std::memory_order_acquire);
+
+        if(slotKey == 0) return NULL;
+        if(slotKey == key){
+            if(slot.ready.load(std::memory_order_acquire) && slot.size == (uint32_t)size)
+                return vizTextureCacheData + slot.offset;
+            return NULL;
+        }
+    }
+    return NULL;
+}
+
+BYTE *VIZ_TextureCacheStore(FTexture *texture, BYTE *pixels, int size){
+    if(vizTextureCache == NULL || pixels == NULL) return pixels;
+
+    uint64_t key = VIZ_TextureCacheKey(texture);
+    if(!key) return pixels;
+
+    for(unsigned int i = 0; i < VIZ_TEXTURE_CACHE_SLOTS; ++i){
+        VIZTextureCacheSlot &slot = vizTextureCache->slots[(key + i) % VIZ_TEXTURE_CACHE_SLOTS];
+        uint64_t slotKey = 0;
+
+        if(!slot.key.compare_exchange_strong(slotKey, key, std::memory_order_acq_rel)){
+            // Stored (or being stored) by another engine
+            if(slotKey == key) return pixels;
+            continue;
+        }
+
+        uint64_t alignedSize = (static_cast<uint64_t>(size) + 15) & ~static_cast<uint64_t>(15);
+        uint64_t offset = vizTextureCache->used.fetch_add(alignedSize, std::memory_order_relaxed);
+        if(offset + alignedSize > vizTextureCacheDataSize) return pixels; // Full, the slot stays not ready
+
+        BYTE *cached = vizTextureCacheData + offset;
+        memcpy(cached, pixels, size);
+        slot.size = size;
+        slot.offset = offset;
+        slot.ready.store(1, std::memory_order_release);
+
+        delete[] pixels;
+        return cached;
+    }
+    return pixels;
+}
+
+void VIZ_TextureCacheFree(BYTE *pixels){
+    if(vizTextureCache != NULL && pixels >= vizTextureCacheData
+       && pixels < vizTextureCacheData + vizTextureCacheDataSize) return;
+    delete[] pixels;
+}
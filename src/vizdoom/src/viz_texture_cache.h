@@ -0,0 +1,42 @@
+/*
+ Copyright (C) 2016 by Wojciech Jaśkowski, Michał Kempka, Grzegorz Runc, Jakub Toczek, Marek Wydmuch
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files (the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ THE SOFTWARE.
+*/
+
+#ifndef __VIZ_TEXTURE_CACHE_H__
+#define __VIZ_TEXTURE_CACHE_H__
+
+#include "doomtype.h"
+
+class FTexture;
+
+#define VIZ_TEXTURE_CACHE_NAME_BASE "ViZDoomTexCache"
+#define VIZ_TEXTURE_CACHE_SLOTS 16384
+#define VIZ_TEXTURE_CACHE_SIZE (128 * 1024 * 1024)
+
+void VIZ_TextureCacheInit();
+
+BYTE *VIZ_TextureCacheFind(FTexture *texture, int size);
+
+BYTE *VIZ_TextureCacheStore(FTexture *texture, BYTE *pixels, int size);
+
+void VIZ_TextureCacheFree(BYTE *pixels);
+
+#endif
@@ -0,0 +1,138 @@
+/*
+ Copyright(C) 2016 by Wojciech Jaśkowski, Michał Kempka, Grzegorz Runc, Jakub Toczek, Marek Wydmuch
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files(the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ THE SOFTWARE.
+*/
+
+#include "viz_video.h"
+
+#include "v_palette.h"
+
+/*
+ * The canvas is always accessible, so locking only counts the nesting and frames are never presented anywhere.
+ * Palette, gamma and flash are kept only to be reported back, the library converts colors on its own.
+ */
+
+IMPLEMENT_CLASS(VIZHeadlessFB)
+
+VIZHeadlessFB::VIZHeadlessFB(int width, int height)
+    : DFrameBuffer(width, height) {
+    FlashAmount = 0;
+    Gamma = 1.f;
+    OwnBuffer = MemBuffer;
+    Buffer = MemBuffer;
+
+    memcpy(SourcePalette, GPalette.BaseColors, sizeof(PalEntry)*256);
+}
+
+VIZHeadlessFB::~VIZHeadlessFB(){
+    // Only own buffer is deleted by the canvas
+    MemBuffer = OwnBuffer;
+}
+
+bool VIZHeadlessFB::Lock(bool buffered){
+    ++LockCount;
+    return false;
+}
+
+void VIZHeadlessFB::Unlock(){
+    if (LockCount > 0) --LockCount;
+}
+
+bool VIZHeadlessFB::IsLocked(){
+    return LockCount > 0;
+}
+
+void VIZHeadlessFB::Update(){
+    Unlock();
+}
+
+PalEntry *VIZHeadlessFB::GetPalette(){
+    return SourcePalette;
+}
+
+void VIZHeadlessFB::GetFlashedPalette(PalEntry pal[256]){
+    memcpy(pal, SourcePalette, 256*sizeof(PalEntry));
+    if (FlashAmount){
+        DoBlending(pal, pal, 256, Flash.r, Flash.g, Flash.b, FlashAmount);
+    }
+}
+
+void VIZHeadlessFB::UpdatePalette(){
+}
+
+bool VIZHeadlessFB::SetGamma(float gamma){
+    Gamma = gamma;
+    return true;
+}
+
+bool VIZHeadlessFB::SetFlash(PalEntry rgb, int amount){
+    Flash = rgb;
+    FlashAmount = amount;
+    return true;
+}
+
+void VIZHeadlessFB::GetFlash(PalEntry &rgb, int &amount){
+    rgb = Flash;
+    amount = FlashAmount;
+}
+
+int VIZHeadlessFB::GetPageCount(){
+    return 1;
+}
+
+bool VIZHeadlessFB::IsFullscreen(){
+    return false;
+}
+
+void VIZHeadlessFB::SetTarget(BYTE *target){
+    BYTE *buffer = target != NULL ? target : OwnBuffer;
+    if (buffer == MemBuffer) return;
+
+    // Parts of the frame (e.g. the border of the view) are not redrawn every frame
+    memcpy(buffer, MemBuffer, Pitch * Height);
+    MemBuffer = Buffer = buffer;
+}
+
+DFrameBuffer *VIZ_CreateHeadlessFB(int width, int height, DFrameBuffer *old){
+    PalEntry flashColor = 0;
+    int flashAmount = 0;
+
+    if (old != NULL){
+        if (old->IsKindOf(RUNTIME_CLASS(VIZHeadlessFB)) && old->GetWidth() == width && old->GetHeight() == height)
+            return old;
+
+        old->GetFlash(flashColor, flashAmount);
+        old->ObjectFlags |= OF_YesReallyDelete;
+        if (screen == old) screen = NULL;
+        delete old;
+    }
+
+    VIZHeadlessFB *fb = new VIZHeadlessFB(width, height);
+    fb->SetFlash(flashColor, flashAmount);
+    return fb;
+}
+
+bool VIZ_VideoIsHeadless(){
+    return screen != NULL && screen->IsKindOf(RUNTIME_CLASS(VIZHeadlessFB));
+}
+
+void VIZ_VideoSetTarget(BYTE *target){
+    if (VIZ_VideoIsHeadless()) static_cast<VIZHeadlessFB *>(screen)->SetTarget(target);
+}
@@ -0,0 +1,77 @@
+/*
+ Copyright(C) 2016 by Wojciech Jaśkowski, Michał Kempka, Grzegorz Runc, Jakub Toczek, Marek Wydmuch
+
+ Permission is hereby granted, free of charge, to any person obtaining a copy
+ of this software and associated documentation files(the "Software"), to deal
+ in the Software without restriction, including without limitation the rights
+ to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+ copies of the Software, and to permit persons to whom the Software is
+ furnished to do so, subject to the following conditions:
+
+ The above copyright notice and this permission notice shall be included in
+ all copies or substantial portions of the Software.
+
+ THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+ IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+ FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+ AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+ THE SOFTWARE.
+*/
+
+#ifndef __VIZ_VIDEO_H__
+#define __VIZ_VIDEO_H__
+
+#include "v_video.h"
+
+/*
+ * Headless video backend, renders into a memory canvas without any window or video driver.
+ */
+
+class VIZHeadlessFB : public DFrameBuffer
+{
+    DECLARE_CLASS(VIZHeadlessFB, DFrameBuffer)
+public:
+    VIZHeadlessFB(int width, int height);
+    ~VIZHeadlessFB();
+
+    bool Lock(bool buffered);
+    void Unlock();
+    bool IsLocked();
+    void Update();
+    PalEntry *GetPalette();
+    void GetFlashedPalette(PalEntry pal[256]);
+    void UpdatePalette();
+    bool SetGamma(float gamma);
+    bool SetFlash(PalEntry rgb, int amount);
+    void GetFlash(PalEntry &rgb, int &amount);
+    int GetPageCount();
+    bool IsFullscreen();
+
+#ifdef _WIN32
+    void PaletteChanged() {}
+    int QueryNewPalette() { return 0; }
+    bool Is8BitMode() { return true; }
+#endif
+
+    // Renders into the given memory (of pitch * height bytes) or into own buffer if NULL
+    void SetTarget(BYTE *target);
+
+private:
+    PalEntry SourcePalette[256];
+    PalEntry Flash;
+    int FlashAmount;
+    float Gamma;
+    BYTE *OwnBuffer;
+
+    VIZHeadlessFB() {}
+};
+
+DFrameBuffer *VIZ_CreateHeadlessFB(int width, int height, DFrameBuffer *old);
+
+bool VIZ_VideoIsHeadless();
+
+void VIZ_VideoSetTarget(BYTE *target);
+
+#endif
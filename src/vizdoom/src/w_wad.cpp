@@ -41,6 +41,10 @@
 #include <sys/types.h>
 #include <sys/stat.h>
 #include <string.h>
+#ifndef _WIN32
+#include <fcntl.h>
+#include <unistd.h>
+#endif
 
 #include "doomtype.h"
 #include "m_argv.h"
@@ -1338,6 +1342,72 @@ FileReader *FWadCollection::GetFileReader(int wadnum)
 	return Files[wadnum]->GetReader();
 }
 
+//==========================================================================
+//
+// MapFiles
+//
+// Memory-maps all opened files, so lumps are read directly from pages
+// shared by all processes that use the same files.
+//
+//==========================================================================
+
+void FWadCollection::MapFiles ()
+{
+	for (unsigned i = 0; i < Files.Size(); ++i)
+	{
+		FileReader *reader = Files[i]->GetReader();
+		if (reader != NULL && reader->GetFile() != NULL)
+		{
+			reader->Map();
+		}
+	}
+}
+
+//==========================================================================
+//
+// ReopenFiles
+//
+// Gives every opened file a new file descriptor. A forked process
+// shares file offsets with its parent and siblings until this is done.
+//
+//==========================================================================
+
+void FWadCollection::ReopenFiles ()
+{
+#ifndef _WIN32
+	TArray<FILE *> reopened;
+
+	for (unsigned i = 0; i < Files.Size(); ++i)
+	{
+		FileReader *reader = Files[i]->GetReader();
+		FILE *file = reader != NULL ? reader->GetFile() : NULL;
+		if (file == NULL || Files[i]->Filename == NULL)
+		{
+			continue;
+		}
+
+		// Files embedded in another file share its FILE, which is reopened only once
+		unsigned j;
+		for (j = 0; j < reopened.Size() && reopened[j] != file; ++j);
+		if (j < reopened.Size())
+		{
+			continue;
+		}
+
+		int fd = open(Files[i]->Filename, O_RDONLY);
+		if (fd < 0)
+		{
+			continue;
+		}
+		long pos = ftell(file);
+		dup2(fd, fileno(file));
+		close(fd);
+		fseek(file, pos, SEEK_SET);
+		reopened.Push(file);
+	}
+#endif
+}
+
 //==========================================================================
 //
 // W_GetWadName
@@ -189,6 +189,8 @@ public:
 	FWadLump *ReopenLumpNumNewFile (int lump);	// Opens a new, independent FILE
 	
 	FileReader * GetFileReader(int wadnum);	// Gets a FileReader object to the entire WAD
+	void MapFiles ();	// Memory-maps opened files, lumps are then read from shared pages
+	void ReopenFiles ();	// Gives opened files new descriptors, used after fork
 
 	int FindLump (const char *name, int *lastlump, bool anyns=false);		// [RH] Find lumps with duplication
 	int FindLumpMulti (const char **names, int *lastlump, bool anyns = false, int *nameindex = NULL); // same with multiple possible names